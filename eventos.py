@@ -0,0 +1,434 @@
+"""Motor de simulación por eventos discretos y políticas de planificación
+
+El motor salta de evento en evento: llegadas (en orden, con un cursor),
+fin de proceso, fin de quantum y eventos propios de la política (en un
+heap, donde una expropiación invalida el evento pendiente). La
+política sólo decide: qué proceso admitir, cuál ejecutar, por cuánto tiempo
+y si una llegada expropia al que está en CPU. Así FIFO, SJF y Round Robin
+son políticas más, junto con las expropiativas SRTF, prioridades con
+envejecimiento y MLFQ.
+
+Con varios eventos en el mismo instante se procesan primero las llegadas y
+después el fin del proceso en CPU, y recién entonces se elige el siguiente
+(como hacen los algoritmos de PlanificadorProcesos).
+
+Ejemplo:
+    resultado, secuencia = simular(tabla, PoliticaSRTF())
+    resultado, secuencia = simular(tabla, PoliticaMLFQ(quantums=(2, 4, 8), intervalo_impulso=50))
+"""
+import heapq
+from array import array
+from collections import deque
+
+from planificador import ResultadoEjecucion, _columna
+
+# Tipos de evento, en el orden en que se procesan dentro de un mismo instante
+LLEGADA = 0
+FIN = 1
+QUANTUM = 2
+POLITICA = 3
+
+class ColaIndexada:
+    """Cola de prioridad de índices de proceso con actualización y baja en O(log n)
+
+    Sobre heapq: cada índice tiene a lo sumo una entrada vigente, y al
+    actualizar o quitar se marca la anterior como inválida (se descarta al
+    llegar a la cima).
+    """
+    __slots__ = ('_heap', '_entradas')
+
+    def __init__(self):
+        self._heap = []
+        self._entradas = {}
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, indice):
+        return indice in self._entradas
+
+    def insertar(self, indice, clave):
+        """Insertar o cambiar la clave de `indice`"""
+        anterior = self._entradas.get(indice)
+        if anterior is not None:
+            anterior[1] = -1
+        entrada = [clave, indice]
+        self._entradas[indice] = entrada
+        heapq.heappush(self._heap, entrada)
+
+    def quitar(self, indice):
+        self._entradas.pop(indice)[1] = -1
+
+    def clave(self, indice):
+        return self._entradas[indice][0]
+
+    def minimo(self):
+        """Índice con menor clave sin quitarlo, o None si está vacía"""
+        heap = self._heap
+        while heap and heap[0][1] == -1:
+            heapq.heappop(heap)
+        return heap[0][1] if heap else None
+
+    def extraer(self):
+        """Quitar y devolver el índice con menor clave, o None si está vacía"""
+        heap = self._heap
+        while heap:
+            _, indice = heapq.heappop(heap)
+            if indice != -1:
+                del self._entradas[indice]
+                return indice
+        return None
+
+class Politica:
+    """Decisiones de planificación que consulta el motor
+
+    Las subclases implementan al menos admitir, elegir y devolver. `restante`
+    es el array de tiempo restante del motor (sólo lectura para la política).
+    """
+    # Si es True, el motor consulta expropia() en cada llegada
+    expropiativa = False
+
+    def preparar(self, tabla, restante):
+        self.tabla = tabla
+        self.restante = restante
+
+    def __len__(self):
+        """Cantidad de procesos listos"""
+        raise NotImplementedError
+
+    def admitir(self, indice, tiempo):
+        """Llegó el proceso `indice`"""
+        raise NotImplementedError
+
+    def elegir(self, tiempo):
+        """Quitar de la cola y devolver el próximo proceso, o None si no hay"""
+        raise NotImplementedError
+
+    def porcion(self, indice):
+        """Tiempo máximo de CPU antes de un fin de quantum (None: hasta terminar)"""
+        return None
+
+    def devolver(self, indice, tiempo, vencido):
+        """El proceso sale de la CPU sin terminar: por quantum (vencido) o expropiado"""
+        raise NotImplementedError
+
+    def expropia(self, nuevo, actual, tiempo, restante_actual):
+        """¿La llegada de `nuevo` desaloja a `actual`?"""
+        return False
+
+    def proximo_evento(self, tiempo):
+        """Instante del próximo evento propio de la política, o None"""
+        return None
+
+    def evento(self, tiempo, actual):
+        """Atender el evento propio pedido con proximo_evento()"""
+
+class PoliticaFIFO(Politica):
+    def preparar(self, tabla, restante):
+        super().preparar(tabla, restante)
+        self.cola = deque()
+
+    def __len__(self):
+        return len(self.cola)
+
+    def admitir(self, indice, tiempo):
+        self.cola.append(indice)
+
+    def elegir(self, tiempo):
+        return self.cola.popleft() if self.cola else None
+
+class PoliticaSJF(Politica):
+    """No expropiativo; a igual duración gana el admitido en un lote anterior y luego el menor índice"""
+
+    def preparar(self, tabla, restante):
+        super().preparar(tabla, restante)
+        self.cola = ColaIndexada()
+        self.lote = 0
+
+    def __len__(self):
+        return len(self.cola)
+
+    def admitir(self, indice, tiempo):
+        self.cola.insertar(indice, (self.tabla.duraciones[indice], self.lote, indice))
+
+    def elegir(self, tiempo):
+        self.lote += 1
+        return self.cola.extraer()
+
+class PoliticaRoundRobin(PoliticaFIFO):
+    def __init__(self, quantum):
+        if quantum <= 0:
+            raise ValueError("El quantum debe ser positivo")
+        self.quantum = quantum
+
+    def porcion(self, indice):
+        return self.quantum
+
+    def devolver(self, indice, tiempo, vencido):
+        self.cola.append(indice)
+
+class PoliticaSRTF(Politica):
+    """Shortest Remaining Time First: una llegada con menos tiempo restante expropia"""
+    expropiativa = True
+
+    def preparar(self, tabla, restante):
+        super().preparar(tabla, restante)
+        self.cola = ColaIndexada()
+
+    def __len__(self):
+        return len(self.cola)
+
+    def admitir(self, indice, tiempo):
+        # Los eventos de llegada salen en orden (llegada, índice): a igual
+        # restante gana el que llegó primero, también tras una expropiación
+        self.cola.insertar(indice, (self.restante[indice], self.tabla.llegadas[indice], indice))
+
+    def elegir(self, tiempo):
+        return self.cola.extraer()
+
+    def devolver(self, indice, tiempo, vencido):
+        self.admitir(indice, tiempo)
+
+    def expropia(self, nuevo, actual, tiempo, restante_actual):
+        return self.restante[nuevo] < restante_actual
+
+class PoliticaPrioridad(Politica):
+    """Prioridades (menor número = más prioritario) con envejecimiento lineal
+
+    Un proceso que espera gana un nivel cada `envejecimiento` unidades de
+    tiempo: su prioridad efectiva es prioridad - espera / envejecimiento.
+    Como todos envejecen al mismo ritmo, el orden entre los que esperan no
+    cambia con el tiempo y la clave prioridad + listo_desde / envejecimiento
+    es fija; no hace falta recorrer la cola en cada instante. Al volver a la
+    cola la prioridad efectiva se reinicia a la base.
+    """
+
+    def __init__(self, prioridades, envejecimiento=None, expropiativa=True):
+        if envejecimiento is not None and envejecimiento <= 0:
+            raise ValueError("El intervalo de envejecimiento debe ser positivo")
+        self.prioridades = prioridades
+        self.envejecimiento = envejecimiento
+        self.expropiativa = expropiativa
+
+    def preparar(self, tabla, restante):
+        if len(self.prioridades) != len(tabla):
+            raise ValueError("Se necesita una prioridad por proceso")
+        super().preparar(tabla, restante)
+        self.cola = ColaIndexada()
+        self.admisiones = 0
+        self.efectiva_actual = None
+
+    def __len__(self):
+        return len(self.cola)
+
+    def _clave(self, indice, tiempo):
+        if self.envejecimiento is None:
+            return self.prioridades[indice]
+        return self.prioridades[indice] + tiempo / self.envejecimiento
+
+    def admitir(self, indice, tiempo):
+        self.admisiones += 1
+        self.cola.insertar(indice, (self._clave(indice, tiempo), self.admisiones))
+
+    def elegir(self, tiempo):
+        indice = self.cola.minimo()
+        if indice is None:
+            return None
+        # Prioridad efectiva con la que entra a la CPU (deja de envejecer)
+        clave, _ = self.cola.clave(indice)
+        self.efectiva_actual = (clave if self.envejecimiento is None
+                                else clave - tiempo / self.envejecimiento)
+        return self.cola.extraer()
+
+    def devolver(self, indice, tiempo, vencido):
+        self.admitir(indice, tiempo)
+
+    def expropia(self, nuevo, actual, tiempo, restante_actual):
+        return self.prioridades[nuevo] < self.efectiva_actual
+
+class PoliticaMLFQ(Politica):
+    """Multi-Level Feedback Queue
+
+    Los procesos entran al nivel 0. Agotar el quantum del nivel baja uno
+    (el último nivel es Round Robin); un expropiado por una llegada a un
+    nivel superior vuelve al frente de su nivel. Con intervalo_impulso,
+    cada tantas unidades todos vuelven al nivel 0 para evitar inanición.
+    """
+    expropiativa = True
+
+    def __init__(self, quantums=(2, 4, 8), intervalo_impulso=None):
+        if not quantums or any(q <= 0 for q in quantums):
+            raise ValueError("Los quantums deben ser positivos")
+        if intervalo_impulso is not None and intervalo_impulso <= 0:
+            raise ValueError("El intervalo de impulso debe ser positivo")
+        self.quantums = tuple(quantums)
+        self.intervalo_impulso = intervalo_impulso
+
+    def preparar(self, tabla, restante):
+        super().preparar(tabla, restante)
+        self.niveles = [deque() for _ in self.quantums]
+        self.nivel = _columna('q', 0, len(tabla))
+        self.listos = 0
+
+    def __len__(self):
+        return self.listos
+
+    def admitir(self, indice, tiempo):
+        self.nivel[indice] = 0
+        self.niveles[0].append(indice)
+        self.listos += 1
+
+    def elegir(self, tiempo):
+        for cola in self.niveles:
+            if cola:
+                self.listos -= 1
+                return cola.popleft()
+        return None
+
+    def porcion(self, indice):
+        return self.quantums[self.nivel[indice]]
+
+    def devolver(self, indice, tiempo, vencido):
+        nivel = self.nivel[indice]
+        if vencido:
+            nivel = min(nivel + 1, len(self.quantums) - 1)
+            self.nivel[indice] = nivel
+            self.niveles[nivel].append(indice)
+        else:
+            self.niveles[nivel].appendleft(indice)
+        self.listos += 1
+
+    def expropia(self, nuevo, actual, tiempo, restante_actual):
+        return self.nivel[nuevo] < self.nivel[actual]
+
+    def proximo_evento(self, tiempo):
+        if self.intervalo_impulso is None:
+            return None
+        return tiempo + self.intervalo_impulso
+
+    def evento(self, tiempo, actual):
+        # Impulso: todos al nivel 0, conservando el orden entre niveles
+        primero = self.niveles[0]
+        for cola in self.niveles[1:]:
+            for indice in cola:
+                self.nivel[indice] = 0
+            primero.extend(cola)
+            cola.clear()
+        if actual != -1:
+            self.nivel[actual] = 0
+
+def simular(tabla, politica, tipo=None, control=None, instrumentacion=None):
+    """Simular la tabla con una política y devolver (ResultadoEjecucion, secuencia)
+
+    La secuencia tiene un segmento {'proceso', 'inicio', 'fin'} por cada vez
+    que un proceso ocupa la CPU. En el resultado, `inicio` es la primera vez
+    que el proceso entra a la CPU. control e instrumentacion se usan como en
+    PlanificadorProcesos (la ejecución debe haberse iniciado en instrumentacion).
+    """
+    n = len(tabla)
+    tipo = tipo or tabla.tipo
+    llegadas = tabla.llegadas
+    duraciones = tabla.duraciones
+    nombre = tabla.nombre
+    resultado = ResultadoEjecucion(tabla, tipo)
+    inicio = resultado.inicio
+    respuesta = resultado.respuesta
+    completados = resultado.orden
+    restante = array(tipo, duraciones)
+    secuencia = []
+    instr = instrumentacion
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    # Las llegadas ya se conocen todas: en vez de n eventos en el heap se
+    # recorren con un cursor en orden (llegada, índice), y el heap sólo
+    # guarda los eventos de CPU y de la política (unos pocos a la vez)
+    if instr is not None:
+        instr.fase('ordenar')
+    orden_llegada = sorted(range(n), key=llegadas.__getitem__)
+    siguiente = 0
+    proxima_llegada = llegadas[orden_llegada[0]] if n else None
+    eventos = []
+    politica.preparar(tabla, restante)
+    admitir = politica.admitir
+    proximo = politica.proximo_evento(0)
+    if proximo is not None:
+        heappush(eventos, (proximo, POLITICA, -1, 0))
+    if instr is not None:
+        instr.fase('seleccion')
+
+    actual = -1
+    # Los eventos de CPU llevan la versión vigente al programarse; al
+    # expropiar se incrementa y el evento pendiente queda descartado
+    version = 0
+    inicio_segmento = fin_programado = 0
+    ocioso_desde = 0
+
+    while len(completados) < n:
+        if proxima_llegada is not None and (not eventos or proxima_llegada <= eventos[0][0]):
+            tiempo = proxima_llegada
+        else:
+            tiempo = eventos[0][0]
+
+        while proxima_llegada == tiempo:
+            indice = orden_llegada[siguiente]
+            siguiente += 1
+            proxima_llegada = llegadas[orden_llegada[siguiente]] if siguiente < n else None
+            admitir(indice, tiempo)
+            if (actual != -1 and politica.expropiativa and fin_programado > tiempo and
+                    politica.expropia(indice, actual, tiempo,
+                                      restante[actual] - (tiempo - inicio_segmento))):
+                restante[actual] -= tiempo - inicio_segmento
+                secuencia.append({'proceso': nombre(actual), 'inicio': inicio_segmento,
+                                  'fin': tiempo})
+                politica.devolver(actual, tiempo, False)
+                actual = -1
+                version += 1
+
+        while eventos and eventos[0][0] == tiempo:
+            _, tipo_evento, indice, version_evento = heappop(eventos)
+            if tipo_evento == POLITICA:
+                politica.evento(tiempo, actual)
+                proximo = politica.proximo_evento(tiempo)
+                if proximo is not None:
+                    heappush(eventos, (proximo, POLITICA, -1, 0))
+            elif version_evento == version:
+                restante[actual] -= tiempo - inicio_segmento
+                secuencia.append({'proceso': nombre(actual), 'inicio': inicio_segmento,
+                                  'fin': tiempo})
+                if tipo_evento == FIN:
+                    resultado.finalizacion[actual] = tiempo
+                    resultado.espera[actual] = tiempo - llegadas[actual] - duraciones[actual]
+                    completados.append(actual)
+                else:
+                    politica.devolver(actual, tiempo, True)
+                actual = -1
+                version += 1
+
+        if actual != -1:
+            continue
+        indice = politica.elegir(tiempo)
+        if indice is None:
+            continue
+        if instr is not None:
+            if ocioso_desde < tiempo:
+                instr.ocioso(ocioso_desde, tiempo)
+            instr.decision(tiempo, indice, len(politica) + 1)
+        if control is not None:
+            control.reportar(tiempo, len(completados))
+        if respuesta[indice] == -1:
+            inicio[indice] = tiempo
+            respuesta[indice] = tiempo - llegadas[indice]
+
+        actual = indice
+        inicio_segmento = tiempo
+        porcion = politica.porcion(indice)
+        if porcion is None or porcion >= restante[indice]:
+            fin_programado = tiempo + restante[indice]
+            heappush(eventos, (fin_programado, FIN, indice, version))
+        else:
+            fin_programado = tiempo + porcion
+            heappush(eventos, (fin_programado, QUANTUM, indice, version))
+        ocioso_desde = fin_programado
+
+    return resultado, secuencia
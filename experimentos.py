@@ -0,0 +1,128 @@
+"""Corridas de experimentos en paralelo: algoritmo x quantum x carga de trabajo
+
+Todas las cargas se copian una sola vez a dos bloques de memoria compartida
+(llegadas y duraciones, una carga tras otra). Cada tarea que reciben los
+procesos del pool es sólo (carga, algoritmo, quantum); el trabajador arma la
+tabla leyendo su tramo del bloque compartido, sin que la carga se serialice.
+
+Ejemplo:
+    cargas = [TablaProcesos.desde_columnas(llegadas, duraciones) for ...]
+    tabla = ejecutar_experimentos(cargas, quantums=range(1, 21))
+    # [{'carga': 0, 'algoritmo': 'fifo', 'quantum': None, 'espera_promedio': ...}, ...]
+"""
+import os
+from array import array
+from multiprocessing import Pool, shared_memory
+
+from metricas import calcular_metricas
+from planificador import PlanificadorProcesos, TablaProcesos
+
+ALGORITMOS = ('fifo', 'sjf', 'rr')
+
+# Estado de cada proceso trabajador, cargado por _iniciar_trabajador
+_compartido = {}
+
+def _iniciar_trabajador(nombre_llegadas, nombre_duraciones, tipo, limites):
+    llegadas = shared_memory.SharedMemory(name=nombre_llegadas)
+    duraciones = shared_memory.SharedMemory(name=nombre_duraciones)
+    _compartido['bloques'] = (llegadas, duraciones)
+    _compartido['llegadas'] = llegadas.buf.cast(tipo)
+    _compartido['duraciones'] = duraciones.buf.cast(tipo)
+    _compartido['tipo'] = tipo
+    _compartido['limites'] = limites
+
+def metricas_resumen(resultado):
+    """Promedios de un ResultadoEjecucion (metricas.calcular_metricas, sin secuencia ni percentiles)"""
+    return calcular_metricas(resultado, percentiles=False)
+
+def ejecutar_celda(tabla, algoritmo, quantum=None):
+    """Ejecutar un algoritmo sobre una tabla y devolver sus métricas"""
+    planificador = PlanificadorProcesos()
+    planificador.procesos = tabla
+    if algoritmo == 'fifo':
+        resultado, _ = planificador.fifo()
+    elif algoritmo == 'sjf':
+        resultado, _ = planificador.sjf()
+    elif algoritmo == 'rr':
+        planificador.quantum = quantum
+        # La secuencia perezosa no se recorre: sólo interesan las métricas
+        resultado, _ = planificador.round_robin('perezosa')
+    else:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+    return metricas_resumen(resultado)
+
+def _ejecutar_tarea(tarea):
+    carga, algoritmo, quantum = tarea
+    inicio, fin = _compartido['limites'][carga], _compartido['limites'][carga + 1]
+    tabla = TablaProcesos.desde_columnas(
+        array(_compartido['tipo'], _compartido['llegadas'][inicio:fin]),
+        array(_compartido['tipo'], _compartido['duraciones'][inicio:fin]))
+    fila = {'carga': carga, 'algoritmo': algoritmo, 'quantum': quantum}
+    fila.update(ejecutar_celda(tabla, algoritmo, quantum))
+    return fila
+
+def _grilla(n_cargas, algoritmos, quantums):
+    """Tareas (carga, algoritmo, quantum); FIFO y SJF no dependen del quantum"""
+    for carga in range(n_cargas):
+        for algoritmo in algoritmos:
+            if algoritmo == 'rr':
+                for quantum in quantums:
+                    yield carga, algoritmo, quantum
+            else:
+                yield carga, algoritmo, None
+
+def _a_tabla(carga):
+    if isinstance(carga, TablaProcesos):
+        return carga
+    nombres, llegadas, duraciones = zip(*carga) if carga else ((), (), ())
+    return TablaProcesos.desde_columnas(llegadas, duraciones, nombres)
+
+def ejecutar_experimentos(cargas, algoritmos=ALGORITMOS, quantums=(3,), procesos=None):
+    """Ejecutar la grilla algoritmo x quantum x carga en un pool de procesos
+
+    cargas: TablaProcesos o listas de tuplas (nombre, llegada, duracion).
+    procesos: cantidad de procesos del pool (por defecto, uno por núcleo).
+
+    Devuelve una lista de filas ordenada por (carga, algoritmo, quantum) con
+    espera_promedio, respuesta_promedio y tiempo_total de cada celda.
+    """
+    for algoritmo in algoritmos:
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+    if 'rr' in algoritmos and any(q <= 0 for q in quantums):
+        raise ValueError("El quantum debe ser positivo")
+
+    tablas = [_a_tabla(carga) for carga in cargas]
+    tipo = 'q' if all(t.tipo == 'q' for t in tablas) else 'd'
+    limites = [0]
+    for tabla in tablas:
+        limites.append(limites[-1] + len(tabla))
+    tareas = list(_grilla(len(tablas), algoritmos, list(quantums)))
+    if not tareas:
+        return []
+
+    tamano = max(1, limites[-1]) * 8
+    bloques = [shared_memory.SharedMemory(create=True, size=tamano) for _ in range(2)]
+    try:
+        llegadas = bloques[0].buf.cast(tipo)
+        duraciones = bloques[1].buf.cast(tipo)
+        for tabla, inicio, fin in zip(tablas, limites, limites[1:]):
+            llegadas[inicio:fin] = array(tipo, tabla.llegadas)
+            duraciones[inicio:fin] = array(tipo, tabla.duraciones)
+        llegadas.release()
+        duraciones.release()
+
+        procesos = procesos or os.cpu_count() or 1
+        # Varias tareas por envío para no pagar un viaje por celda
+        lote = max(1, len(tareas) // (procesos * 4))
+        with Pool(procesos, initializer=_iniciar_trabajador,
+                  initargs=(bloques[0].name, bloques[1].name, tipo, limites)) as pool:
+            filas = list(pool.imap_unordered(_ejecutar_tarea, tareas, chunksize=lote))
+    finally:
+        for bloque in bloques:
+            bloque.close()
+            bloque.unlink()
+
+    orden_algoritmo = {algoritmo: i for i, algoritmo in enumerate(ALGORITMOS)}
+    filas.sort(key=lambda f: (f['carga'], orden_algoritmo[f['algoritmo']], f['quantum'] or 0))
+    return filas
@@ -0,0 +1,299 @@
+"""Modo consola: planificación en flujo sin interfaz gráfica
+
+Lee procesos desde CSV/JSONL (archivo o stdin), ejecuta FIFO, SJF o Round
+Robin y escribe los segmentos de la secuencia y las métricas por proceso a
+medida que se producen. Todo el recorrido es una cadena de generadores:
+
+    leer_procesos -> planificar (fifo/sjf/round_robin) -> escribir
+
+Round Robin usa el mismo generador de tramos que
+PlanificadorProcesos.round_robin (planificador._tramos_round_robin).
+
+La entrada debe venir ordenada por tiempo de llegada. Así la memoria usada
+depende sólo de los procesos que están en cola en un instante dado, no del
+tamaño de la traza. Con --ordenar se acepta una entrada desordenada, pero se
+carga completa en memoria para ordenarla.
+
+Uso (flujo.py no importa tkinter ni NumPy; simulador.py con argumentos
+delega aquí):
+    python flujo.py --algoritmo rr --quantum 4 procesos.csv
+    cat procesos.jsonl | python simulador.py --algoritmo sjf --formato jsonl -
+"""
+import argparse
+import csv
+import heapq
+import json
+import sys
+
+from planificador import _compactar_tramos, _expandir_tramos, _tramos_round_robin
+
+CAMPOS_CSV = ['tipo', 'proceso', 'inicio', 'fin', 'llegada', 'duracion',
+              'finalizacion', 'espera', 'respuesta']
+
+def _numero(texto):
+    """Convertir a int si es posible, si no a float"""
+    if isinstance(texto, (int, float)) and not isinstance(texto, bool):
+        return texto
+    if not isinstance(texto, str):
+        raise ValueError(f"{texto!r} no es un número")
+    texto = texto.strip()
+    try:
+        return int(texto)
+    except ValueError:
+        pass
+    try:
+        return float(texto)
+    except ValueError:
+        raise ValueError(f"{texto!r} no es un número") from None
+
+def _validar(nombre, llegada, duracion, linea):
+    if not nombre:
+        raise ValueError(f"Línea {linea}: el nombre del proceso es obligatorio")
+    if llegada < 0 or duracion <= 0:
+        raise ValueError(f"Línea {linea}: los tiempos deben ser positivos")
+    return nombre, llegada, duracion
+
+def leer_procesos(archivo, formato):
+    """Generar tuplas (nombre, llegada, duracion) desde un archivo abierto
+
+    CSV: encabezado con las columnas nombre, llegada, duracion.
+    JSONL: un objeto por línea con las claves nombre, llegada, duracion.
+    """
+    if formato == 'csv':
+        lector = csv.DictReader(archivo)
+        # line_num es la última línea leída: un campo entre comillas puede ocupar varias
+        registros = ((lector.line_num, dato) for dato in lector)
+    elif formato == 'jsonl':
+        registros = ((linea, _objeto_json(texto, linea))
+                     for linea, texto in enumerate(archivo, start=1) if texto.strip())
+    else:
+        raise ValueError(f"Formato desconocido: {formato}")
+    for linea, dato in registros:
+        campos = []
+        for campo in ('nombre', 'llegada', 'duracion'):
+            # En CSV, una fila corta deja None en las columnas que faltan
+            if dato.get(campo) is None:
+                raise ValueError(f"Línea {linea}: falta el campo '{campo}'")
+            campos.append(dato[campo])
+        nombre, llegada, duracion = campos
+        try:
+            llegada, duracion = _numero(llegada), _numero(duracion)
+        except ValueError as error:
+            raise ValueError(f"Línea {linea}: {error}") from None
+        yield _validar(str(nombre).strip(), llegada, duracion, linea)
+
+def _objeto_json(texto, linea):
+    try:
+        dato = json.loads(texto)
+    except ValueError as error:
+        raise ValueError(f"Línea {linea}: JSON inválido ({error})") from None
+    if not isinstance(dato, dict):
+        raise ValueError(f"Línea {linea}: se esperaba un objeto JSON")
+    return dato
+
+def _en_orden(procesos):
+    """Reenviar los procesos verificando que vengan ordenados por llegada"""
+    anterior = None
+    for proceso in procesos:
+        if anterior is not None and proceso[1] < anterior[1]:
+            raise ValueError(
+                f"La entrada no está ordenada por llegada ({proceso[0]} llega en "
+                f"{proceso[1]}, después de {anterior[0]} en {anterior[1]}); use --ordenar")
+        yield proceso
+        anterior = proceso
+
+class _Llegadas:
+    """Cursor sobre procesos ordenados por llegada, con vista de la próxima"""
+
+    def __init__(self, procesos):
+        self._procesos = _en_orden(procesos)
+        self._proximo = next(self._procesos, None)
+
+    def proxima(self):
+        """Tiempo de la próxima llegada o None si no quedan procesos"""
+        return None if self._proximo is None else self._proximo[1]
+
+    def admitir(self, tiempo_actual):
+        """Generar los procesos con llegada <= tiempo_actual"""
+        while self._proximo is not None and self._proximo[1] <= tiempo_actual:
+            actual = self._proximo
+            self._proximo = next(self._procesos, None)
+            yield actual
+
+def _evento_segmento(nombre, inicio, fin):
+    return {'tipo': 'segmento', 'proceso': nombre, 'inicio': inicio, 'fin': fin}
+
+def _evento_proceso(nombre, llegada, duracion, finalizacion, espera, respuesta):
+    return {'tipo': 'proceso', 'proceso': nombre, 'llegada': llegada, 'duracion': duracion,
+            'finalizacion': finalizacion, 'espera': espera, 'respuesta': respuesta}
+
+def fifo(procesos):
+    """First In First Out en flujo: memoria constante"""
+    tiempo_actual = 0
+    llegadas = _Llegadas(procesos)
+    while llegadas.proxima() is not None:
+        for nombre, llegada, duracion in llegadas.admitir(llegadas.proxima()):
+            if tiempo_actual < llegada:
+                tiempo_actual = llegada
+            fin = tiempo_actual + duracion
+            yield _evento_segmento(nombre, tiempo_actual, fin)
+            espera = tiempo_actual - llegada
+            yield _evento_proceso(nombre, llegada, duracion, fin, espera, espera)
+            tiempo_actual = fin
+
+def sjf(procesos):
+    """Shortest Job First en flujo: memoria proporcional a la cola de listos"""
+    tiempo_actual = 0
+    llegadas = _Llegadas(procesos)
+    pendientes = []
+    orden = 0
+    lote = 0
+    while True:
+        for nombre, llegada, duracion in llegadas.admitir(tiempo_actual):
+            heapq.heappush(pendientes, (duracion, lote, orden, nombre, llegada))
+            orden += 1
+        lote += 1
+
+        if not pendientes:
+            if llegadas.proxima() is None:
+                return
+            tiempo_actual = llegadas.proxima()
+            continue
+
+        duracion, _, _, nombre, llegada = heapq.heappop(pendientes)
+        fin = tiempo_actual + duracion
+        yield _evento_segmento(nombre, tiempo_actual, fin)
+        espera = tiempo_actual - llegada
+        yield _evento_proceso(nombre, llegada, duracion, fin, espera, espera)
+        tiempo_actual = fin
+
+def round_robin(procesos, quantum, compacta=False):
+    """Round Robin en flujo, con el mismo avance rápido de rondas que
+    PlanificadorProcesos.round_robin
+
+    Las rondas completas en las que nadie termina ni llega se generan de una
+    vez y se expanden en segmentos de un quantum, o con `compacta` se unen
+    los segmentos consecutivos del mismo proceso.
+    """
+    if quantum <= 0:
+        raise ValueError("El quantum debe ser positivo")
+    tramos = _tramos_round_robin(_en_orden(procesos), quantum)
+    convertir = _compactar_tramos if compacta else _expandir_tramos
+    return convertir(tramos, _evento_segmento, _terminado)
+
+def _terminado(nombre, llegada, duracion, finalizacion, respuesta):
+    return _evento_proceso(nombre, llegada, duracion, finalizacion,
+                           finalizacion - llegada - duracion, respuesta)
+
+def con_resumen(eventos):
+    """Reenviar los eventos y agregar al final un evento 'resumen'
+
+    Los promedios se acumulan al paso, sin guardar los procesos.
+    """
+    n = 0
+    total_espera = 0
+    total_respuesta = 0
+    tiempo_total = 0
+    for evento in eventos:
+        if evento['tipo'] == 'proceso':
+            n += 1
+            total_espera += evento['espera']
+            total_respuesta += evento['respuesta']
+            tiempo_total = max(tiempo_total, evento['finalizacion'])
+        yield evento
+    yield {'tipo': 'resumen', 'procesos': n,
+           'espera_promedio': total_espera / n if n else 0,
+           'respuesta_promedio': total_respuesta / n if n else 0,
+           'tiempo_total': tiempo_total}
+
+def escribir_jsonl(eventos, salida):
+    for evento in eventos:
+        salida.write(json.dumps(evento, ensure_ascii=False))
+        salida.write('\n')
+
+def escribir_csv(eventos, salida):
+    escritor = csv.DictWriter(salida, fieldnames=CAMPOS_CSV, extrasaction='ignore')
+    escritor.writeheader()
+    for evento in eventos:
+        if evento['tipo'] != 'resumen':
+            escritor.writerow(evento)
+
+def escribir_texto(eventos, salida):
+    for evento in eventos:
+        if evento['tipo'] == 'segmento':
+            salida.write(f"{evento['proceso']}: {evento['inicio']} -> {evento['fin']}\n")
+        elif evento['tipo'] == 'proceso':
+            salida.write(f"{evento['proceso']:<10} {evento['llegada']:<8} {evento['duracion']:<9} "
+                         f"{evento['finalizacion']:<12} {evento['espera']:<8} {evento['respuesta']:<10}\n")
+        else:
+            salida.write(f"\nRESUMEN:\n"
+                         f"Procesos: {evento['procesos']}\n"
+                         f"Tiempo promedio de espera: {evento['espera_promedio']:.2f}\n"
+                         f"Tiempo promedio de respuesta: {evento['respuesta_promedio']:.2f}\n"
+                         f"Tiempo total de finalización: {evento['tiempo_total']}\n")
+
+ESCRITORES = {'jsonl': escribir_jsonl, 'csv': escribir_csv, 'texto': escribir_texto}
+
+def planificar(procesos, algoritmo, quantum=3, compacta=False):
+    """Cadena completa de eventos para un algoritmo ('fifo', 'sjf' o 'rr')
+
+    FIFO y SJF corren cada proceso de una vez: `compacta` sólo cambia Round Robin.
+    """
+    if algoritmo == 'fifo':
+        return fifo(procesos)
+    if algoritmo == 'sjf':
+        return sjf(procesos)
+    if algoritmo == 'rr':
+        return round_robin(procesos, quantum, compacta)
+    raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+
+def _formato_entrada(ruta, formato):
+    if formato:
+        return formato
+    if ruta.endswith('.jsonl') or ruta.endswith('.json'):
+        return 'jsonl'
+    return 'csv'
+
+def main_consola(argumentos=None):
+    parser = argparse.ArgumentParser(
+        description="Planificador de procesos en modo consola (sin interfaz gráfica)")
+    parser.add_argument('entrada', nargs='?', default='-',
+                        help="archivo CSV/JSONL con nombre, llegada, duracion ('-' para stdin)")
+    parser.add_argument('--algoritmo', '-a', choices=['fifo', 'sjf', 'rr'], default='fifo')
+    parser.add_argument('--quantum', '-q', type=_numero, default=3,
+                        help="quantum para Round Robin (por defecto 3)")
+    parser.add_argument('--formato', choices=['csv', 'jsonl'],
+                        help="formato de entrada (por defecto según la extensión; stdin: csv)")
+    parser.add_argument('--salida', choices=sorted(ESCRITORES), default='jsonl',
+                        help="formato de salida (por defecto jsonl)")
+    parser.add_argument('--compactar', action='store_true',
+                        help="unir segmentos consecutivos del mismo proceso")
+    parser.add_argument('--ordenar', action='store_true',
+                        help="ordenar la entrada por llegada (la carga completa en memoria)")
+    args = parser.parse_args(argumentos)
+
+    formato = _formato_entrada(args.entrada, args.formato)
+    archivo = sys.stdin
+    try:
+        if args.entrada != '-':
+            archivo = open(args.entrada, newline='', encoding='utf-8')
+        procesos = leer_procesos(archivo, formato)
+        if args.ordenar:
+            procesos = sorted(procesos, key=lambda p: p[1])
+        eventos = con_resumen(planificar(procesos, args.algoritmo, args.quantum, args.compactar))
+        ESCRITORES[args.salida](eventos, sys.stdout)
+    except BrokenPipeError:
+        # El consumidor cerró la tubería (por ejemplo `| head`)
+        sys.stderr.close()
+        return 0
+    except (OSError, ValueError) as error:
+        # Archivo inexistente o ilegible, o una línea inválida
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if archivo is not sys.stdin:
+            archivo.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main_consola())
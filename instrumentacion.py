@@ -0,0 +1,229 @@
+"""Instrumentación opcional de los algoritmos de planificación
+
+Se activa asignando una Instrumentacion a `PlanificadorProcesos.instrumentacion`.
+Los algoritmos informan cada decisión (qué proceso se elige, en qué tiempo
+simulado y con cuántos procesos listos), los cambios de contexto, los
+intervalos en que la CPU queda ociosa (desde la primera llegada, como en
+metricas.py) y el tiempo real de cada fase ('ordenar', 'copia', 'seleccion',
+'metricas', 'secuencia'). Desactivada (None) sólo cuesta una comparación por
+iteración.
+
+Para recibir los eventos en vivo basta con heredar y redefinir decision(),
+despachos() u ocioso() llamando a super().
+
+Con ejecución incremental o con un acierto de cache sólo se informa lo que
+realmente se simula: para medir la carga completa, limpiar la cache y los
+puntos de control (o usar un planificador nuevo).
+
+Ejemplo:
+    planificador.instrumentacion = Instrumentacion()
+    planificador.round_robin()
+    planificador.instrumentacion.resumen()
+    planificador.instrumentacion.a_chrome_trace('traza.json')  # chrome://tracing
+"""
+import json
+import time
+from array import array
+
+class RegistroEjecucion:
+    """Contadores y muestras de una ejecución de un algoritmo"""
+    __slots__ = ('algoritmo', 'tabla', 'procesos', 'acierto_cache', 'inicio_ns', 'duracion_ns',
+                 'fases', 'decisiones', 'cambios_contexto', 'cola_maxima', 'huecos', 'tiempo_ocioso',
+                 'primera_llegada', 'ultimo', 'tiempos', 'indices', 'colas', 'huecos_inicio', 'huecos_fin')
+
+    def __init__(self, algoritmo, tabla, inicio_ns):
+        self.algoritmo = algoritmo
+        self.tabla = tabla
+        self.procesos = len(tabla)
+        self.acierto_cache = False
+        self.inicio_ns = inicio_ns
+        self.duracion_ns = 0
+        # (nombre, inicio_ns, duracion_ns) en orden
+        self.fases = []
+        self.decisiones = 0
+        self.cambios_contexto = 0
+        self.cola_maxima = 0
+        self.huecos = 0
+        self.tiempo_ocioso = 0
+        # Se calcula en el primer hueco: sin huecos no hace falta recorrer la tabla
+        self.primera_llegada = None
+        self.ultimo = -1
+        # Una muestra por decisión (sólo si Instrumentacion.muestras)
+        self.tiempos = array('d')
+        self.indices = array('q')
+        self.colas = array('q')
+        self.huecos_inicio = array('d')
+        self.huecos_fin = array('d')
+
+    def resumen(self):
+        fases = {}
+        for nombre, _, duracion in self.fases:
+            fases[nombre] = fases.get(nombre, 0) + duracion / 1e9
+        return {
+            'algoritmo': self.algoritmo,
+            'procesos': self.procesos,
+            'acierto_cache': self.acierto_cache,
+            'segundos': self.duracion_ns / 1e9,
+            'fases': fases,
+            'decisiones': self.decisiones,
+            'cambios_contexto': self.cambios_contexto,
+            'cola_maxima': self.cola_maxima,
+            'cola_promedio': sum(self.colas) / len(self.colas) if self.colas else None,
+            'huecos_ociosos': self.huecos,
+            'tiempo_ocioso': self.tiempo_ocioso,
+        }
+
+class Instrumentacion:
+    """Receptor de los eventos que informan los algoritmos
+
+    muestras: guardar una muestra por decisión (tiempo, proceso, largo de la
+    cola) y cada intervalo ocioso; con False sólo se llevan los contadores.
+    """
+
+    def __init__(self, muestras=True):
+        self.muestras = muestras
+        self.ejecuciones = []
+        self._actual = None
+        self._fase = None
+        self._origen_ns = None
+
+    def iniciar(self, algoritmo, tabla):
+        """Comenzar el registro de una ejecución (lo llama el planificador)"""
+        ahora = time.perf_counter_ns()
+        if self._origen_ns is None:
+            self._origen_ns = ahora
+        self._actual = RegistroEjecucion(algoritmo, tabla, ahora)
+        self._fase = None
+        self.ejecuciones.append(self._actual)
+
+    def fase(self, nombre):
+        """Cerrar la fase en curso y abrir otra"""
+        ahora = time.perf_counter_ns()
+        if self._fase is not None:
+            anterior, inicio = self._fase
+            self._actual.fases.append((anterior, inicio, ahora - inicio))
+        self._fase = (nombre, ahora)
+
+    def terminar(self):
+        ahora = time.perf_counter_ns()
+        if self._fase is not None:
+            nombre, inicio = self._fase
+            self._actual.fases.append((nombre, inicio, ahora - inicio))
+            self._fase = None
+        self._actual.duracion_ns = ahora - self._actual.inicio_ns
+
+    def acierto_cache(self):
+        self._actual.acierto_cache = True
+
+    def decision(self, tiempo, indice, largo_cola):
+        """El proceso `indice` toma la CPU en `tiempo` con `largo_cola` listos (él incluido)"""
+        registro = self._actual
+        registro.decisiones += 1
+        if indice != registro.ultimo:
+            registro.cambios_contexto += 1
+            registro.ultimo = indice
+        if largo_cola > registro.cola_maxima:
+            registro.cola_maxima = largo_cola
+        if self.muestras:
+            registro.tiempos.append(tiempo)
+            registro.indices.append(indice)
+            registro.colas.append(largo_cola)
+
+    def despachos(self, tiempo, cantidad, primero, ultimo, largo_cola):
+        """Round Robin despachó `cantidad` quantums seguidos desde `tiempo`, de
+        `primero` a `ultimo`, recorriendo en ciclo una cola de `largo_cola`"""
+        registro = self._actual
+        registro.decisiones += cantidad
+        if largo_cola > 1:
+            registro.cambios_contexto += cantidad - (primero == registro.ultimo)
+        elif primero != registro.ultimo:
+            registro.cambios_contexto += 1
+        registro.ultimo = ultimo
+        if largo_cola > registro.cola_maxima:
+            registro.cola_maxima = largo_cola
+        if self.muestras:
+            # Una muestra por avance: el primero despachado
+            registro.tiempos.append(tiempo)
+            registro.indices.append(primero)
+            registro.colas.append(largo_cola)
+
+    def ocioso(self, desde, hasta):
+        """La CPU queda libre de `desde` a `hasta`
+
+        Como en metricas.calcular_metricas, el tiempo ocioso se cuenta desde la
+        primera llegada: la espera inicial desde t=0 no es un hueco.
+        """
+        registro = self._actual
+        if registro.primera_llegada is None:
+            registro.primera_llegada = min(registro.tabla.llegadas)
+        if desde < registro.primera_llegada:
+            desde = registro.primera_llegada
+            if desde >= hasta:
+                return
+        registro.huecos += 1
+        registro.tiempo_ocioso += hasta - desde
+        if self.muestras:
+            registro.huecos_inicio.append(desde)
+            registro.huecos_fin.append(hasta)
+
+    def resumen(self):
+        """Una fila de contadores por ejecución registrada"""
+        return [registro.resumen() for registro in self.ejecuciones]
+
+    def limpiar(self):
+        self.ejecuciones.clear()
+        self._actual = None
+        self._fase = None
+        self._origen_ns = None
+
+    def a_json(self, ruta):
+        """Escribir el resumen y las muestras de cada ejecución"""
+        datos = []
+        for registro in self.ejecuciones:
+            fila = registro.resumen()
+            fila['muestras'] = {
+                'tiempo': registro.tiempos.tolist(),
+                'proceso': registro.indices.tolist(),
+                'cola': registro.colas.tolist(),
+            }
+            fila['huecos'] = list(zip(registro.huecos_inicio.tolist(),
+                                      registro.huecos_fin.tolist()))
+            datos.append(fila)
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump({'ejecuciones': datos}, archivo)
+
+    def a_chrome_trace(self, ruta):
+        """Escribir un archivo para chrome://tracing o Perfetto
+
+        pid 1: fases de cada ejecución en tiempo real (µs desde la primera).
+        pid 2: la misma ejecución en tiempo simulado (1 unidad = 1 µs): largo
+        de la cola, decisiones e intervalos ociosos.
+        Cada ejecución es un hilo (tid) distinto en ambos.
+        """
+        eventos = [
+            {'ph': 'M', 'pid': 1, 'name': 'process_name', 'args': {'name': 'Simulador (tiempo real)'}},
+            {'ph': 'M', 'pid': 2, 'name': 'process_name', 'args': {'name': 'Planificación (tiempo simulado)'}},
+        ]
+        for tid, registro in enumerate(self.ejecuciones):
+            nombre = f"{registro.algoritmo} #{tid} ({registro.procesos} procesos)"
+            for pid in (1, 2):
+                eventos.append({'ph': 'M', 'pid': pid, 'tid': tid, 'name': 'thread_name',
+                                'args': {'name': nombre}})
+            eventos.append({'ph': 'X', 'pid': 1, 'tid': tid, 'name': registro.algoritmo,
+                            'ts': (registro.inicio_ns - self._origen_ns) / 1e3,
+                            'dur': registro.duracion_ns / 1e3, 'args': registro.resumen()})
+            for fase, inicio, duracion in registro.fases:
+                eventos.append({'ph': 'X', 'pid': 1, 'tid': tid, 'name': fase,
+                                'ts': (inicio - self._origen_ns) / 1e3, 'dur': duracion / 1e3})
+
+            tabla = registro.tabla
+            for tiempo, indice, cola in zip(registro.tiempos, registro.indices, registro.colas):
+                eventos.append({'ph': 'C', 'pid': 2, 'tid': tid, 'name': 'cola', 'ts': tiempo,
+                                'args': {'listos': cola}})
+                eventos.append({'ph': 'i', 'pid': 2, 'tid': tid, 's': 't', 'name': 'decision',
+                                'ts': tiempo, 'args': {'proceso': tabla.nombre(indice)}})
+            for desde, hasta in zip(registro.huecos_inicio, registro.huecos_fin):
+                eventos.append({'ph': 'X', 'pid': 2, 'tid': tid, 'name': 'ocioso',
+                                'ts': desde, 'dur': hasta - desde})
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, archivo)
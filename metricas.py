@@ -0,0 +1,108 @@
+"""Métricas de una ejecución calculadas con NumPy en una sola pasada
+
+calcular_metricas() toma un ResultadoEjecucion (y opcionalmente su
+secuencia) y devuelve un dict con:
+
+    procesos, tiempo_total (makespan), intervalo (de la primera llegada al
+    último fin), throughput, tiempo_ocupado, tiempo_ocioso, utilizacion,
+    {espera,respuesta,retorno}_{promedio,p50,p95,p99},
+    segmentos y cambios_contexto (None sin secuencia o si es perezosa)
+
+Con percentiles=False sólo se calculan los promedios (sin las claves _pNN):
+cada uno es una media sobre su columna, sin armar la matriz ni ordenar. Es
+el camino de experimentos.py, que corre miles de celdas.
+
+Los arrays del resultado se leen sin copiar (np.frombuffer) y las tres
+métricas por proceso se apilan en una matriz de 3 x n: un solo mean y un
+solo percentile calculan los doce valores, aun con millones de procesos.
+La usan la interfaz gráfica, experimentos.py y multiprocesador.py.
+
+Ejemplo:
+    resultado, secuencia = planificador.round_robin()
+    calcular_metricas(resultado, secuencia)['retorno_p99']
+"""
+from operator import itemgetter
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+METRICAS_POR_PROCESO = ('espera', 'respuesta', 'retorno')
+
+def _columna(valores):
+    return np.frombuffer(valores, dtype=np.int64 if valores.typecode == 'q' else np.float64)
+
+def cambios_contexto(secuencia):
+    """Despachos que cargan en una CPU un proceso distinto del último que corrió en ella
+
+    El primer despacho de cada CPU cuenta, como en Instrumentacion. Los
+    segmentos consecutivos del mismo proceso (Round Robin con un solo
+    proceso listo) no son un cambio. Devuelve None si la secuencia es un
+    generador: no se puede recorrer sin consumirla.
+    """
+    if not hasattr(secuencia, '__len__'):
+        return None
+    if len(secuencia) == 0:
+        return 0
+    columnas = getattr(secuencia, 'columnas', None)
+    if columnas is not None:
+        _, procesos, cpus, _, _ = columnas()
+    else:
+        # Los nombres se comparan como array de objetos: la comparación corre en C
+        procesos = np.array(list(map(itemgetter('proceso'), secuencia)), dtype=object)
+        if 'cpu' not in secuencia[0]:
+            return int(1 + np.count_nonzero(procesos[1:] != procesos[:-1]))
+        cpus = np.fromiter(map(itemgetter('cpu'), secuencia), dtype=np.int64, count=len(secuencia))
+    # Cada CPU recorre sus segmentos en orden; se compara cada uno con el anterior de su CPU
+    orden = np.argsort(cpus, kind='stable')
+    procesos, cpus = procesos[orden], cpus[orden]
+    return int(1 + np.count_nonzero((procesos[1:] != procesos[:-1]) | (cpus[1:] != cpus[:-1])))
+
+def calcular_metricas(resultado, secuencia=None, cpus=1, percentiles=True):
+    """Resumen de un ResultadoEjecucion; cpus divide la capacidad en la utilización"""
+    tabla = resultado.tabla
+    # La tabla puede haber crecido después de la ejecución: sólo cuentan sus filas
+    n = resultado.filas
+    metricas = {'procesos': n}
+    calculados = PERCENTILES if percentiles else ()
+    if n == 0:
+        metricas.update({'tiempo_total': 0, 'intervalo': 0, 'throughput': 0.0, 'tiempo_ocupado': 0,
+                         'tiempo_ocioso': 0, 'utilizacion': 0.0})
+        for nombre in METRICAS_POR_PROCESO:
+            metricas[f'{nombre}_promedio'] = 0
+            for percentil in calculados:
+                metricas[f'{nombre}_p{percentil}'] = 0
+    else:
+        llegadas = _columna(tabla.llegadas)[:n]
+        finalizacion = _columna(resultado.finalizacion)
+        if percentiles:
+            # Filas: espera, respuesta, retorno (en el orden de METRICAS_POR_PROCESO)
+            por_proceso = np.empty((3, n), dtype=np.float64)
+            por_proceso[0] = _columna(resultado.espera)
+            por_proceso[1] = _columna(resultado.respuesta)
+            np.subtract(finalizacion, llegadas, out=por_proceso[2])
+            promedios = por_proceso.mean(axis=1)
+            valores = np.percentile(por_proceso, PERCENTILES, axis=1)
+        else:
+            promedios = (_columna(resultado.espera).mean(dtype=np.float64),
+                         _columna(resultado.respuesta).mean(dtype=np.float64),
+                         (finalizacion - llegadas).mean(dtype=np.float64))
+
+        tiempo_total = finalizacion.max().item()
+        intervalo = tiempo_total - llegadas.min().item()
+        tiempo_ocupado = _columna(tabla.duraciones)[:n].sum().item()
+        capacidad = max(intervalo, 1e-12) * cpus
+        metricas.update({
+            'tiempo_total': tiempo_total,
+            'intervalo': intervalo,
+            'throughput': n / max(intervalo, 1e-12),
+            'tiempo_ocupado': tiempo_ocupado,
+            'tiempo_ocioso': max(intervalo * cpus - tiempo_ocupado, 0),
+            'utilizacion': tiempo_ocupado / capacidad,
+        })
+        for fila, nombre in enumerate(METRICAS_POR_PROCESO):
+            metricas[f'{nombre}_promedio'] = float(promedios[fila])
+            for columna, percentil in enumerate(calculados):
+                metricas[f'{nombre}_p{percentil}'] = float(valores[columna, fila])
+    metricas['segmentos'] = len(secuencia) if hasattr(secuencia, '__len__') else None
+    metricas['cambios_contexto'] = cambios_contexto(secuencia) if secuencia is not None else None
+    return metricas
@@ -0,0 +1,171 @@
+"""Simulación Monte Carlo de cargas de trabajo aleatorias
+
+Genera cargas reproducibles (con semilla) a partir de distribuciones de
+tiempo entre llegadas y de duración, ejecuta cada algoritmo sobre cada carga
+y acumula en una sola pasada la media y la varianza (Welford) del tiempo
+promedio de espera y de respuesta. Ninguna carga se guarda, así que la
+memoria no crece con la cantidad de cargas.
+
+La corrida se detiene antes de max_cargas cuando todos los intervalos de
+confianza tienen un semiancho menor o igual a `precision`.
+
+Distribuciones (tuplas):
+    ('constante', valor)          -> siempre valor (('constante', 0): todos llegan juntos)
+    ('uniforme', minimo, maximo)  -> entero uniforme en [minimo, maximo]
+    ('exponencial', media)        -> exponencial redondeada al entero más cercano
+
+Ejemplo:
+    resultado = simular(semilla=7, procesos_por_carga=20, precision=0.25)
+    resultado['estadisticas']['rr']['espera'].intervalo()
+"""
+import argparse
+import math
+import random
+from statistics import NormalDist
+
+from experimentos import ejecutar_celda
+from planificador import TablaProcesos
+
+ALGORITMOS = ('fifo', 'sjf', 'rr')
+
+class EstadisticaEnLinea:
+    """Media y varianza acumuladas en una pasada (algoritmo de Welford)"""
+    __slots__ = ('n', 'media', '_m2')
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+
+    def agregar(self, valor):
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (valor - self.media)
+
+    @property
+    def varianza(self):
+        """Varianza muestral (n - 1)"""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def semiancho(self, nivel=0.95):
+        """Semiancho del intervalo de confianza normal para la media"""
+        if self.n < 2:
+            return math.inf
+        z = NormalDist().inv_cdf(0.5 + nivel / 2)
+        return z * math.sqrt(self.varianza / self.n)
+
+    def intervalo(self, nivel=0.95):
+        semiancho = self.semiancho(nivel)
+        return self.media - semiancho, self.media + semiancho
+
+def _muestreador(rng, distribucion):
+    tipo, *parametros = distribucion
+    if tipo == 'constante':
+        valor, = parametros
+        return lambda: valor
+    if tipo == 'uniforme':
+        minimo, maximo = parametros
+        if minimo != int(minimo) or maximo != int(maximo):
+            raise ValueError(f"La distribución uniforme necesita extremos enteros: {minimo}, {maximo}")
+        minimo, maximo = int(minimo), int(maximo)
+        return lambda: rng.randint(minimo, maximo)
+    if tipo == 'exponencial':
+        media, = parametros
+        return lambda: int(round(rng.expovariate(1 / media)))
+    raise ValueError(f"Distribución desconocida: {tipo}")
+
+def generar_carga(rng, n, entre_llegadas=('exponencial', 3), duracion=('uniforme', 1, 9)):
+    """Generar una TablaProcesos de n procesos con el generador rng"""
+    siguiente_intervalo = _muestreador(rng, entre_llegadas)
+    siguiente_duracion = _muestreador(rng, duracion)
+    llegadas = []
+    duraciones = []
+    tiempo = 0
+    for _ in range(n):
+        llegadas.append(tiempo)
+        duraciones.append(max(1, siguiente_duracion()))
+        tiempo += max(0, siguiente_intervalo())
+    return TablaProcesos.desde_columnas(llegadas, duraciones)
+
+def simular(semilla=None, max_cargas=1_000_000, procesos_por_carga=10,
+            entre_llegadas=('exponencial', 3), duracion=('uniforme', 1, 9),
+            algoritmos=ALGORITMOS, quantum=3, precision=None, nivel=0.95,
+            min_cargas=30, cada=100):
+    """Ejecutar hasta max_cargas cargas aleatorias y acumular estadísticas
+
+    Cada carga aporta una muestra por algoritmo: su tiempo promedio de espera
+    y de respuesta. Con `precision`, cada `cada` cargas (y a partir de
+    min_cargas) se revisan los intervalos y se detiene si todos alcanzan la
+    precisión pedida.
+
+    Devuelve {'cargas', 'detenido_antes', 'estadisticas'} donde
+    estadisticas[algoritmo]['espera'|'respuesta'] es una EstadisticaEnLinea.
+    """
+    for algoritmo in algoritmos:
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+    rng = random.Random(semilla)
+    estadisticas = {algoritmo: {'espera': EstadisticaEnLinea(), 'respuesta': EstadisticaEnLinea()}
+                    for algoritmo in algoritmos}
+    cargas = 0
+    detenido_antes = False
+
+    while cargas < max_cargas:
+        tabla = generar_carga(rng, procesos_por_carga, entre_llegadas, duracion)
+        for algoritmo in algoritmos:
+            metricas = ejecutar_celda(tabla, algoritmo, quantum)
+            estadisticas[algoritmo]['espera'].agregar(metricas['espera_promedio'])
+            estadisticas[algoritmo]['respuesta'].agregar(metricas['respuesta_promedio'])
+        cargas += 1
+
+        if (precision is not None and cargas >= min_cargas and cargas % cada == 0 and
+                all(e.semiancho(nivel) <= precision
+                    for por_metrica in estadisticas.values() for e in por_metrica.values())):
+            detenido_antes = True
+            break
+
+    return {'cargas': cargas, 'detenido_antes': detenido_antes, 'estadisticas': estadisticas}
+
+def _distribucion(texto):
+    """Leer 'exponencial:3' o 'uniforme:1:9' desde la línea de comandos"""
+    tipo, *parametros = texto.split(':')
+    try:
+        valores = [float(p) if '.' in p else int(p) for p in parametros]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"parámetros no numéricos en '{texto}'") from None
+    if tipo == 'uniforme':
+        if len(valores) != 2 or any(v != int(v) for v in valores):
+            raise argparse.ArgumentTypeError(
+                f"'{texto}': uniforme lleva dos extremos enteros, p. ej. uniforme:1:9")
+        valores = [int(v) for v in valores]
+    return (tipo, *valores)
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Simulación Monte Carlo de planificadores")
+    parser.add_argument('--semilla', type=int, default=None)
+    parser.add_argument('--cargas', type=int, default=1_000_000, help="máximo de cargas")
+    parser.add_argument('--procesos', type=int, default=10, help="procesos por carga")
+    parser.add_argument('--llegadas', type=_distribucion, default=('exponencial', 3),
+                        help="tiempo entre llegadas, p. ej. exponencial:3 o constante:0")
+    parser.add_argument('--duracion', type=_distribucion, default=('uniforme', 1, 9),
+                        help="duración, p. ej. uniforme:1:9 o exponencial:5")
+    parser.add_argument('--quantum', type=int, default=3)
+    parser.add_argument('--precision', type=float, default=None,
+                        help="semiancho máximo de los intervalos para detenerse antes")
+    parser.add_argument('--nivel', type=float, default=0.95, help="nivel de confianza")
+    args = parser.parse_args(argumentos)
+
+    resultado = simular(args.semilla, args.cargas, args.procesos, args.llegadas, args.duracion,
+                        quantum=args.quantum, precision=args.precision, nivel=args.nivel)
+    print(f"Cargas simuladas: {resultado['cargas']}"
+          f"{' (detenido por precisión)' if resultado['detenido_antes'] else ''}")
+    print(f"{'Algoritmo':<10} {'Métrica':<10} {'Media':>10} {'Varianza':>12} {'IC':>24}")
+    for algoritmo, por_metrica in resultado['estadisticas'].items():
+        for metrica, estadistica in por_metrica.items():
+            bajo, alto = estadistica.intervalo(args.nivel)
+            print(f"{algoritmo:<10} {metrica:<10} {estadistica.media:>10.3f} "
+                  f"{estadistica.varianza:>12.3f} {f'[{bajo:.3f}, {alto:.3f}]':>24}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""Simulación multiprocesador (SMP) con N CPUs
+
+Cada CPU ejecuta FIFO (quantum=None) o Round Robin con su quantum. El
+balanceo de carga define dónde esperan los procesos listos:
+
+    'global'    una sola cola compartida; cualquier CPU libre toma el primero
+    'robo'      una cola por CPU; las llegadas van a una CPU libre o, si no
+                hay, a la siguiente en turno, y una CPU sin trabajo roba el
+                último proceso de la cola de otra (work stealing)
+    'afinidad'  una cola por CPU como en 'robo' pero sin robo: cada proceso
+                corre siempre en la CPU asignada al llegar
+
+Como en eventos.py, las llegadas se recorren con un cursor y el heap sólo
+tiene un evento (fin de proceso o de quantum) por CPU ocupada. Las CPU
+libres están en otro heap y las colas con trabajo en un conjunto, así que
+cada evento cuesta O(log cpus) aun con cientos de CPUs.
+
+Ejemplo:
+    resultado, secuencia, resumen = simular_smp(tabla, cpus=8, balanceo='robo', quantum=4)
+    resumen['utilizacion_por_cpu']   # una fracción por CPU
+"""
+import heapq
+from array import array
+from collections import deque
+
+from metricas import calcular_metricas
+from planificador import ResultadoEjecucion, _columna
+
+BALANCEOS = ('global', 'robo', 'afinidad')
+
+# Tipos de evento de CPU (las llegadas se procesan antes, en el mismo instante)
+FIN = 1
+QUANTUM = 2
+
+def simular_smp(tabla, cpus=4, balanceo='global', quantum=None, tipo=None, control=None):
+    """Simular la tabla en `cpus` procesadores
+
+    Devuelve (resultado, secuencia, resumen). La secuencia tiene además la
+    clave 'cpu' en cada segmento; el resumen trae las métricas de
+    resumen_smp() y las migraciones.
+    """
+    if cpus < 1:
+        raise ValueError("Se necesita al menos una CPU")
+    if balanceo not in BALANCEOS:
+        raise ValueError(f"Balanceo desconocido: {balanceo}")
+    if quantum is not None and quantum <= 0:
+        raise ValueError("El quantum debe ser positivo")
+
+    n = len(tabla)
+    tipo = tipo or tabla.tipo
+    llegadas = tabla.llegadas
+    duraciones = tabla.duraciones
+    nombre = tabla.nombre
+    resultado = ResultadoEjecucion(tabla, tipo)
+    inicio = resultado.inicio
+    respuesta = resultado.respuesta
+    completados = resultado.orden
+    restante = array(tipo, duraciones)
+    ultima_cpu = _columna('q', -1, n)
+    secuencia = []
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    orden_llegada = sorted(range(n), key=llegadas.__getitem__)
+    siguiente = 0
+    proxima_llegada = llegadas[orden_llegada[0]] if n else None
+
+    compartida = balanceo == 'global'
+    colas = [deque()] if compartida else [deque() for _ in range(cpus)]
+    # CPUs (de la cola por CPU) que tienen procesos esperando
+    con_trabajo = set()
+    libres = list(range(cpus))
+    en_cpu = _columna('q', -1, cpus)
+    inicio_segmento = [0] * cpus
+    ocupado = [0] * cpus
+    eventos = []
+    turno = 0
+    migraciones = 0
+
+    def encolar(cpu, indice):
+        colas[cpu].append(indice)
+        con_trabajo.add(cpu)
+
+    def despachar(cpu, indice):
+        nonlocal migraciones
+        if control is not None:
+            control.reportar(tiempo, len(completados))
+        if respuesta[indice] == -1:
+            inicio[indice] = tiempo
+            respuesta[indice] = tiempo - llegadas[indice]
+        if ultima_cpu[indice] != cpu:
+            if ultima_cpu[indice] != -1:
+                migraciones += 1
+            ultima_cpu[indice] = cpu
+        en_cpu[cpu] = indice
+        inicio_segmento[cpu] = tiempo
+        if quantum is None or quantum >= restante[indice]:
+            heappush(eventos, (tiempo + restante[indice], FIN, cpu))
+        else:
+            heappush(eventos, (tiempo + quantum, QUANTUM, cpu))
+
+    def desencolar(cpu, final=False):
+        cola = colas[cpu]
+        indice = cola.pop() if final else cola.popleft()
+        if not cola:
+            con_trabajo.discard(cpu)
+        return indice
+
+    while len(completados) < n:
+        if proxima_llegada is not None and (not eventos or proxima_llegada <= eventos[0][0]):
+            tiempo = proxima_llegada
+        else:
+            tiempo = eventos[0][0]
+        # CPUs libres que recibieron trabajo o se liberaron en este instante;
+        # las demás CPUs libres tienen la cola vacía
+        tocadas = []
+
+        while proxima_llegada == tiempo:
+            indice = orden_llegada[siguiente]
+            siguiente += 1
+            proxima_llegada = llegadas[orden_llegada[siguiente]] if siguiente < n else None
+            if compartida:
+                colas[0].append(indice)
+            elif libres:
+                # Hay una CPU libre: el proceso queda asignado a ella
+                cpu = heappop(libres)
+                encolar(cpu, indice)
+                tocadas.append(cpu)
+            else:
+                encolar(turno, indice)
+                turno = (turno + 1) % cpus
+
+        while eventos and eventos[0][0] == tiempo:
+            _, tipo_evento, cpu = heappop(eventos)
+            indice = en_cpu[cpu]
+            restante[indice] -= tiempo - inicio_segmento[cpu]
+            ocupado[cpu] += tiempo - inicio_segmento[cpu]
+            secuencia.append({'proceso': nombre(indice), 'inicio': inicio_segmento[cpu],
+                              'fin': tiempo, 'cpu': cpu})
+            if tipo_evento == FIN:
+                resultado.finalizacion[indice] = tiempo
+                resultado.espera[indice] = tiempo - llegadas[indice] - duraciones[indice]
+                completados.append(indice)
+            elif compartida:
+                colas[0].append(indice)
+            else:
+                encolar(cpu, indice)
+            en_cpu[cpu] = -1
+            tocadas.append(cpu)
+
+        # Asignar trabajo a las CPUs libres, de menor a mayor número
+        if compartida:
+            for cpu in tocadas:
+                heappush(libres, cpu)
+            while libres and colas[0]:
+                despachar(heappop(libres), colas[0].popleft())
+            continue
+        for cpu in sorted(tocadas):
+            if colas[cpu]:
+                despachar(cpu, desencolar(cpu))
+            else:
+                heappush(libres, cpu)
+        if balanceo == 'robo':
+            # Las CPUs que siguen libres roban el último de otra cola
+            while libres and con_trabajo:
+                despachar(heappop(libres), desencolar(next(iter(con_trabajo)), final=True))
+
+    resumen = resumen_smp(resultado, ocupado, secuencia)
+    resumen['migraciones'] = migraciones
+    return resultado, secuencia, resumen
+
+def resumen_smp(resultado, ocupado, secuencia=None):
+    """Métricas de metricas.calcular_metricas con la capacidad de todas las CPUs
+
+    ocupado: tiempo de CPU usado por cada procesador; con él se agrega
+    'utilizacion_por_cpu'.
+    """
+    resumen = calcular_metricas(resultado, secuencia, cpus=len(ocupado))
+    # El intervalo observado va de la primera llegada al último fin
+    intervalo = max(resumen['intervalo'], 1e-12)
+    resumen['cpus'] = len(ocupado)
+    resumen['utilizacion_por_cpu'] = [o / intervalo for o in ocupado]
+    return resumen
@@ -0,0 +1,1166 @@
+"""Núcleo de planificación, sin interfaz gráfica ni gráficos
+
+Carga de trabajo en columnas (TablaProcesos), resultados (ResultadoEjecucion,
+Proceso), cache de resultados, control de ejecución y PlanificadorProcesos
+con sus algoritmos. No importa tkinter, matplotlib ni NumPy: NumPy se carga
+sólo en fifo_vectorizado y los algoritmos de eventos.py y multiprocesador.py
+al usarlos, así que los procesos de corta vida (trabajos por lotes,
+workers) arrancan rápido y no necesitan pantalla. `python rendimiento.py
+--importacion` controla el tiempo de importación.
+
+La interfaz gráfica (simulador.py) reexporta estos nombres.
+"""
+import functools
+import heapq
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from itertools import accumulate
+
+def _columna(tipo, valor, n):
+    """Crear un array de n elementos inicializados con valor"""
+    return array(tipo, [valor]) * n
+
+class TablaProcesos:
+    """Carga de trabajo en columnas: llegada, duración e índice de nombre
+    
+    Los nombres se guardan una sola vez en `nombres` y cada fila apunta a su
+    nombre mediante `indices_nombre`. Los tiempos se guardan como enteros
+    ('q') y la tabla pasa a flotantes ('d') si se agrega un valor no entero.
+    
+    `huella` resume el contenido de la tabla y se actualiza en O(1) por fila;
+    junto con la cantidad de filas identifica la carga en CacheResultados.
+    """
+    __slots__ = ('llegadas', 'duraciones', 'indices_nombre', 'nombres', '_indice_por_nombre',
+                 'huella')
+    
+    def __init__(self):
+        self.llegadas = array('q')
+        self.duraciones = array('q')
+        self.indices_nombre = array('q')
+        self.nombres = []
+        self._indice_por_nombre = {}
+        self.huella = 0
+    
+    @property
+    def tipo(self):
+        return self.llegadas.typecode
+    
+    def agregar(self, nombre, tiempo_llegada, duracion):
+        """Agregar una fila y devolver su índice"""
+        if self.tipo == 'q' and not (isinstance(tiempo_llegada, int) and isinstance(duracion, int)):
+            self.llegadas = array('d', self.llegadas)
+            self.duraciones = array('d', self.duraciones)
+        indice_nombre = self._indice_por_nombre.get(nombre)
+        if indice_nombre is None:
+            indice_nombre = len(self.nombres)
+            self._indice_por_nombre[nombre] = indice_nombre
+            self.nombres.append(nombre)
+        self.llegadas.append(tiempo_llegada)
+        self.duraciones.append(duracion)
+        self.indices_nombre.append(indice_nombre)
+        self.huella = hash((self.huella, nombre, tiempo_llegada, duracion))
+        return len(self.llegadas) - 1
+    
+    @classmethod
+    def desde_columnas(cls, llegadas, duraciones, nombres=None):
+        """Crear una tabla a partir de columnas completas
+        
+        Acepta arrays, arrays de NumPy o secuencias. Sin nombres, las filas se
+        llaman P1, P2, ...
+        """
+        tabla = cls()
+        enteros = [getattr(columna, 'typecode', None) == 'q' or
+                   getattr(getattr(columna, 'dtype', None), 'kind', None) in ('i', 'u') or
+                   all(isinstance(v, int) for v in columna)
+                   for columna in (llegadas, duraciones)]
+        tipo = 'q' if all(enteros) else 'd'
+        tabla.llegadas = array(tipo, llegadas)
+        tabla.duraciones = array(tipo, duraciones)
+        if len(tabla.llegadas) != len(tabla.duraciones):
+            raise ValueError("Las columnas de llegada y duración deben tener el mismo largo")
+        if nombres is None:
+            nombres = [f"P{i + 1}" for i in range(len(tabla.llegadas))]
+        for nombre in nombres:
+            indice_nombre = tabla._indice_por_nombre.get(nombre)
+            if indice_nombre is None:
+                indice_nombre = len(tabla.nombres)
+                tabla._indice_por_nombre[nombre] = indice_nombre
+                tabla.nombres.append(nombre)
+            tabla.indices_nombre.append(indice_nombre)
+        if len(tabla.indices_nombre) != len(tabla.llegadas):
+            raise ValueError("Debe haber un nombre por proceso")
+        huella = 0
+        for fila in zip(nombres, tabla.llegadas, tabla.duraciones):
+            huella = hash((huella, *fila))
+        tabla.huella = huella
+        return tabla
+    
+    def nombre(self, indice):
+        return self.nombres[self.indices_nombre[indice]]
+    
+    def __len__(self):
+        return len(self.llegadas)
+    
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError(indice)
+        return Proceso._vista(self, indice)
+    
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield Proceso._vista(self, indice)
+
+class ResultadoEjecucion:
+    """Métricas de una ejecución, en arrays indexados por fila de la tabla
+    
+    Se comporta como la lista de procesos que devolvían los algoritmos: al
+    recorrerlo entrega vistas `Proceso` en el orden de `orden`.
+    """
+    __slots__ = ('tabla', 'orden', 'inicio', 'finalizacion', 'espera', 'respuesta')
+    
+    def __init__(self, tabla, tipo):
+        n = len(tabla)
+        self.tabla = tabla
+        self.orden = array('q')
+        self.inicio = _columna(tipo, 0, n)
+        self.finalizacion = _columna(tipo, 0, n)
+        self.espera = _columna(tipo, 0, n)
+        self.respuesta = _columna(tipo, -1, n)
+    
+    def agregar_filas(self, cantidad):
+        """Extender los arrays para filas nuevas de la tabla"""
+        tipo = self.inicio.typecode
+        self.inicio.extend(_columna(tipo, 0, cantidad))
+        self.finalizacion.extend(_columna(tipo, 0, cantidad))
+        self.espera.extend(_columna(tipo, 0, cantidad))
+        self.respuesta.extend(_columna(tipo, -1, cantidad))
+    
+    @property
+    def filas(self):
+        """Filas de la tabla que cubre el resultado
+        
+        `tabla` es la tabla viva: si después se agregan procesos, tiene más
+        filas que los arrays del resultado. Las primeras `filas` son las suyas.
+        """
+        return len(self.inicio)
+    
+    def __len__(self):
+        return len(self.orden)
+    
+    def __getitem__(self, posicion):
+        return Proceso._vista(self.tabla, self.orden[posicion], self)
+    
+    def __iter__(self):
+        for indice in self.orden:
+            yield Proceso._vista(self.tabla, indice, self)
+
+class Proceso:
+    """Vista liviana sobre una fila de TablaProcesos (y opcionalmente su resultado)"""
+    __slots__ = ('_tabla', '_indice', '_resultado')
+    
+    def __init__(self, nombre, tiempo_llegada, duracion):
+        self._tabla = TablaProcesos()
+        self._indice = self._tabla.agregar(nombre, tiempo_llegada, duracion)
+        self._resultado = None
+    
+    @classmethod
+    def _vista(cls, tabla, indice, resultado=None):
+        proceso = cls.__new__(cls)
+        proceso._tabla = tabla
+        proceso._indice = indice
+        proceso._resultado = resultado
+        return proceso
+    
+    @property
+    def nombre(self):
+        return self._tabla.nombre(self._indice)
+    
+    @property
+    def tiempo_llegada(self):
+        return self._tabla.llegadas[self._indice]
+    
+    @property
+    def duracion(self):
+        return self._tabla.duraciones[self._indice]
+    
+    @property
+    def tiempo_restante(self):
+        if self._resultado is None:
+            return self.duracion
+        return 0
+    
+    @property
+    def tiempo_inicio(self):
+        return 0 if self._resultado is None else self._resultado.inicio[self._indice]
+    
+    @property
+    def tiempo_finalizacion(self):
+        return 0 if self._resultado is None else self._resultado.finalizacion[self._indice]
+    
+    @property
+    def tiempo_espera(self):
+        return 0 if self._resultado is None else self._resultado.espera[self._indice]
+    
+    @property
+    def tiempo_respuesta(self):
+        return -1 if self._resultado is None else self._resultado.respuesta[self._indice]
+    
+    def __str__(self):
+        return f"Proceso {self.nombre}: Llegada={self.tiempo_llegada}, Duración={self.duracion}"
+
+class EjecucionCancelada(Exception):
+    """Se canceló la ejecución mediante ControlEjecucion.cancelar()"""
+
+class ControlEjecucion:
+    """Progreso y cancelación de una ejecución, compartido entre hilos
+    
+    Los algoritmos llaman a reportar() en cada paso; la interfaz lee los
+    atributos desde su propio hilo y puede pedir cancelar().
+    """
+    
+    def __init__(self):
+        self.fase = ''
+        self.total = 0
+        self.tiempo_simulado = 0
+        self.completados = 0
+        self.cancelado = False
+    
+    def iniciar_fase(self, fase, total):
+        self.fase = fase
+        self.total = total
+        self.tiempo_simulado = 0
+        self.completados = 0
+    
+    def reportar(self, tiempo_simulado, completados):
+        self.tiempo_simulado = tiempo_simulado
+        self.completados = completados
+        if self.cancelado:
+            raise EjecucionCancelada()
+    
+    def cancelar(self):
+        self.cancelado = True
+
+def _tamano_resultado(resultado, secuencia):
+    """Estimación en bytes de un resultado y su secuencia"""
+    arrays = (resultado.orden, resultado.inicio, resultado.finalizacion,
+              resultado.espera, resultado.respuesta)
+    tamano = sum(a.itemsize * len(a) for a in arrays)
+    if secuencia:
+        segmento = secuencia[0]
+        tamano += len(secuencia) * (sys.getsizeof(segmento) + sys.getsizeof(segmento['inicio'])
+                                    + sys.getsizeof(segmento['fin']) + 8)
+    return tamano
+
+class CacheResultados:
+    """Cache LRU de resultados acotada por memoria estimada
+    
+    La clave es (huella de la tabla, cantidad de filas, algoritmo, parámetros).
+    `aciertos` y `fallos` permiten comprobar que la cache se está usando.
+    """
+    
+    def __init__(self, capacidad_bytes=256 * 1024 * 1024):
+        self.capacidad_bytes = capacidad_bytes
+        self.bytes_usados = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._entradas = OrderedDict()
+    
+    def obtener(self, clave):
+        entrada = self._entradas.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return entrada[0]
+    
+    def guardar(self, clave, valor):
+        tamano = _tamano_resultado(*valor)
+        if tamano > self.capacidad_bytes:
+            return
+        if clave in self._entradas:
+            self.bytes_usados -= self._entradas.pop(clave)[1]
+        self._entradas[clave] = (valor, tamano)
+        self.bytes_usados += tamano
+        while self.bytes_usados > self.capacidad_bytes:
+            _, (_, tamano_viejo) = self._entradas.popitem(last=False)
+            self.bytes_usados -= tamano_viejo
+            self.desalojos += 1
+    
+    def invalidar(self, huella, n):
+        """Quitar las entradas de una carga (huella, cantidad de filas)"""
+        for clave in [c for c in self._entradas if c[0] == huella and c[1] == n]:
+            self.bytes_usados -= self._entradas.pop(clave)[1]
+    
+    def limpiar(self):
+        self._entradas.clear()
+        self.bytes_usados = 0
+    
+    def __len__(self):
+        return len(self._entradas)
+    
+    def estadisticas(self):
+        return {'entradas': len(self._entradas), 'bytes': self.bytes_usados,
+                'aciertos': self.aciertos, 'fallos': self.fallos, 'desalojos': self.desalojos}
+
+def _congelar(valor):
+    """Listas y tuplas (anidadas) como tuplas, para usarlas en una clave de cache"""
+    if isinstance(valor, (list, tuple)):
+        return tuple(map(_congelar, valor))
+    return valor
+
+def _memorizado(algoritmo):
+    """Decorador: consultar self.cache antes de ejecutar el algoritmo
+    
+    Las secuencias perezosas (generadores) no se guardan: se consumen una vez.
+    Los argumentos lista se comparan como tuplas (mlfq([2, 4]) y mlfq((2, 4))
+    comparten entrada); si alguno sigue sin ser hashable se ejecuta sin cache.
+    Con self.instrumentacion, cada llamada se registra como una ejecución.
+    """
+    def decorador(metodo):
+        def consultar(self, args, kwargs):
+            if 'perezosa' in args or kwargs.get('modo_secuencia') == 'perezosa':
+                return metodo(self, *args, **kwargs)
+            parametros = _congelar(args) + tuple((nombre, _congelar(valor))
+                                                 for nombre, valor in sorted(kwargs.items()))
+            quantum = self.quantum if algoritmo == 'rr' else None
+            clave = (self.procesos.huella, len(self.procesos), algoritmo, quantum, parametros)
+            try:
+                hash(clave)
+            except TypeError:
+                return metodo(self, *args, **kwargs)
+            valor = self.cache.obtener(clave)
+            if valor is None:
+                valor = metodo(self, *args, **kwargs)
+                self.cache.guardar(clave, valor)
+            elif self.instrumentacion is not None:
+                self.instrumentacion.acierto_cache()
+            return valor
+        
+        @functools.wraps(metodo)
+        def envoltura(self, *args, **kwargs):
+            instrumentacion = self.instrumentacion
+            if instrumentacion is None:
+                return consultar(self, args, kwargs)
+            instrumentacion.iniciar(metodo.__name__, self.procesos)
+            try:
+                return consultar(self, args, kwargs)
+            finally:
+                instrumentacion.terminar()
+        return envoltura
+    return decorador
+
+class _PuntoControl:
+    """Estado de la última ejecución de un algoritmo no expropiativo
+    
+    Permite continuar la simulación cuando se agregan procesos a la tabla:
+    sólo se recalcula desde el primer segmento que la llegada nueva puede
+    cambiar. `resultado` y `secuencia` se actualizan en sitio, así que son
+    privados del punto de control: al llamador se le entregan copias.
+    """
+    __slots__ = ('tabla', 'n', 'resultado', 'secuencia', 'orden_llegada',
+                 'lote_admision', 'lotes_reanudacion')
+    
+    def __init__(self, tabla, tipo):
+        self.tabla = tabla
+        self.n = 0
+        self.resultado = ResultadoEjecucion(TablaProcesos(), tipo)
+        self.resultado.tabla = tabla
+        self.secuencia = []
+        self.orden_llegada = array('q')
+        # Sólo SJF: lote en que cada proceso entró a la cola y lote vigente
+        # al inicio de la decisión k (len = segmentos + 1)
+        self.lote_admision = array('q')
+        self.lotes_reanudacion = array('q', [0])
+    
+    def incorporar_nuevos(self):
+        """Ubicar por llegada las filas agregadas desde la última ejecución
+        
+        Devuelve la menor llegada entre las filas nuevas, o None si no hay.
+        """
+        llegadas = self.tabla.llegadas
+        nuevos = range(self.n, len(self.tabla))
+        if not nuevos:
+            return None
+        self.resultado.agregar_filas(len(nuevos))
+        self.lote_admision.extend(_columna('q', -1, len(nuevos)))
+        if len(nuevos) <= 16:
+            for indice in nuevos:
+                posicion = bisect_right(self.orden_llegada, llegadas[indice],
+                                        key=llegadas.__getitem__)
+                self.orden_llegada.insert(posicion, indice)
+        else:
+            # Muchas filas nuevas: ordenar todo de nuevo es más barato
+            self.orden_llegada = array('q', sorted(range(len(self.tabla)),
+                                                   key=llegadas.__getitem__))
+        self.n = len(self.tabla)
+        return min(llegadas[i] for i in nuevos)
+    
+    def entregar(self):
+        """Copias de `resultado` y `secuencia`: la próxima ejecución no cambia lo ya devuelto
+        
+        Copiar los arrays y la lista cuesta poco frente a simular; los
+        segmentos (dicts) se comparten porque nunca se modifican, sólo se
+        quitan de la lista y se agregan otros.
+        """
+        original = self.resultado
+        resultado = ResultadoEjecucion.__new__(ResultadoEjecucion)
+        resultado.tabla = original.tabla
+        resultado.orden = original.orden[:]
+        resultado.inicio = original.inicio[:]
+        resultado.finalizacion = original.finalizacion[:]
+        resultado.espera = original.espera[:]
+        resultado.respuesta = original.respuesta[:]
+        return resultado, self.secuencia.copy()
+
+class PlanificadorProcesos:
+    def __init__(self):
+        self.procesos = TablaProcesos()
+        self.quantum = 3
+        self._puntos_control = {}
+        self.cache = CacheResultados()
+        # ControlEjecucion opcional para informar progreso y permitir cancelar
+        self.control = None
+        # Instrumentacion opcional (instrumentacion.py) que recibe decisiones,
+        # largo de la cola, intervalos ociosos y tiempo por fase
+        self.instrumentacion = None
+        
+    def agregar_proceso(self, proceso):
+        # Las entradas de la carga anterior ya no se van a pedir (la clave
+        # lleva la cantidad de filas): liberar su memoria
+        self.cache.invalidar(self.procesos.huella, len(self.procesos))
+        self.procesos.agregar(proceso.nombre, proceso.tiempo_llegada, proceso.duracion)
+    
+    def limpiar_procesos(self):
+        self.procesos = TablaProcesos()
+        self._puntos_control.clear()
+        self.cache.limpiar()
+    
+    def _punto_control(self, algoritmo):
+        """Punto de control reutilizable para la tabla actual, o uno nuevo"""
+        tabla = self.procesos
+        tipo = self._tipo_resultado()
+        punto = self._puntos_control.get(algoritmo)
+        if (punto is None or punto.tabla is not tabla or punto.n > len(tabla) or
+                punto.resultado.inicio.typecode != tipo):
+            punto = _PuntoControl(tabla, tipo)
+            self._puntos_control[algoritmo] = punto
+        return punto
+    
+    def _reportar(self, algoritmo, tiempo_actual, completados):
+        """Informar progreso; si se cancela, el punto de control queda a medias y se descarta"""
+        try:
+            self.control.reportar(tiempo_actual, completados)
+        except EjecucionCancelada:
+            self._puntos_control.pop(algoritmo, None)
+            raise
+    
+    def _tipo_resultado(self):
+        """Tipo de los arrays de resultado: flotante si la tabla o el quantum lo son"""
+        if self.procesos.tipo == 'd' or not isinstance(self.quantum, int):
+            return 'd'
+        return 'q'
+    
+    @_memorizado('fifo')
+    def fifo(self):
+        """Algoritmo First In First Out
+        
+        Incremental: si desde la última ejecución sólo se agregaron procesos,
+        se conserva el prefijo de la secuencia anterior a la primera llegada
+        nueva y se simula desde ahí.
+        """
+        instr = self.instrumentacion
+        if instr is not None:
+            instr.fase('ordenar')
+        punto = self._punto_control('fifo')
+        menor_llegada = punto.incorporar_nuevos()
+        resultado = punto.resultado
+        secuencia = punto.secuencia
+        resultado.orden = punto.orden_llegada
+        if menor_llegada is None:
+            return punto.entregar()
+        
+        tabla = self.procesos
+        llegadas = tabla.llegadas
+        duraciones = tabla.duraciones
+        # Los procesos que llegaron hasta menor_llegada no cambian de lugar
+        posicion = bisect_left(resultado.orden, menor_llegada, hi=len(secuencia),
+                                key=llegadas.__getitem__)
+        del secuencia[posicion:]
+        tiempo_actual = resultado.finalizacion[resultado.orden[posicion - 1]] if posicion else 0
+        control = self.control
+        if instr is not None:
+            instr.fase('seleccion')
+        
+        for indice in resultado.orden[posicion:]:
+            if control is not None:
+                self._reportar('fifo', tiempo_actual, len(secuencia))
+            if tiempo_actual < llegadas[indice]:
+                if instr is not None:
+                    instr.ocioso(tiempo_actual, llegadas[indice])
+                tiempo_actual = llegadas[indice]
+            if instr is not None:
+                # Listos: llegados hasta ahora y todavía sin ejecutar
+                listos = bisect_right(resultado.orden, tiempo_actual,
+                                      key=llegadas.__getitem__) - len(secuencia)
+                instr.decision(tiempo_actual, indice, listos)
+            
+            fin = tiempo_actual + duraciones[indice]
+            resultado.inicio[indice] = tiempo_actual
+            resultado.finalizacion[indice] = fin
+            resultado.espera[indice] = tiempo_actual - llegadas[indice]
+            resultado.respuesta[indice] = resultado.espera[indice]
+            
+            secuencia.append({
+                'proceso': tabla.nombre(indice),
+                'inicio': tiempo_actual,
+                'fin': fin
+            })
+            
+            tiempo_actual = fin
+        
+        return punto.entregar()
+    
+    @_memorizado('fifo_vectorizado')
+    def fifo_vectorizado(self):
+        """FIFO con NumPy: mismo resultado que fifo() sin recorrer en Python"""
+        import numpy as np
+        tabla = self.procesos
+        tipo = self._tipo_resultado()
+        instr = self.instrumentacion
+        dtype = np.int64 if tabla.tipo == 'q' else np.float64
+        llegadas = np.frombuffer(tabla.llegadas, dtype=dtype)
+        duraciones = np.frombuffer(tabla.duraciones, dtype=dtype)
+        if instr is not None:
+            instr.fase('metricas')
+        inicio, fin, espera, respuesta = fifo_vectorizado(llegadas, duraciones)
+        if instr is not None:
+            instr.fase('ordenar')
+        orden = np.argsort(llegadas, kind='stable')
+        
+        if instr is not None:
+            instr.fase('copia')
+        dtype_resultado = np.int64 if tipo == 'q' else np.float64
+        resultado = ResultadoEjecucion(tabla, tipo)
+        resultado.orden = array('q', orden.astype(np.int64).tobytes())
+        resultado.inicio = array(tipo, inicio.astype(dtype_resultado).tobytes())
+        resultado.finalizacion = array(tipo, fin.astype(dtype_resultado).tobytes())
+        resultado.espera = array(tipo, espera.astype(dtype_resultado).tobytes())
+        resultado.respuesta = array(tipo, respuesta.astype(dtype_resultado).tobytes())
+        
+        if instr is not None:
+            instr.fase('secuencia')
+        secuencia = [
+            {'proceso': tabla.nombre(indice), 'inicio': ini, 'fin': f}
+            for indice, ini, f in zip(orden.tolist(), inicio[orden].tolist(), fin[orden].tolist())
+        ]
+        return resultado, secuencia
+    
+    @_memorizado('sjf')
+    def sjf(self):
+        """Algoritmo Shortest Job First
+        
+        Las llegadas se recorren con un cursor sobre los procesos ordenados por
+        tiempo de llegada y los procesos listos se guardan en un heap ordenado
+        por duración, así que la simulación completa cuesta O(n log n).
+        
+        Incremental: si desde la última ejecución sólo se agregaron procesos,
+        las decisiones tomadas antes de la primera llegada nueva se conservan
+        y se reanuda desde el punto de control siguiente.
+        """
+        instr = self.instrumentacion
+        if instr is not None:
+            instr.fase('ordenar')
+        punto = self._punto_control('sjf')
+        menor_llegada = punto.incorporar_nuevos()
+        resultado = punto.resultado
+        secuencia = punto.secuencia
+        if menor_llegada is None:
+            return punto.entregar()
+        
+        tabla = self.procesos
+        llegadas = tabla.llegadas
+        duraciones = tabla.duraciones
+        orden_llegada = punto.orden_llegada
+        lote_admision = punto.lote_admision
+        lotes_reanudacion = punto.lotes_reanudacion
+        completados = resultado.orden
+        
+        # Las decisiones tomadas antes de menor_llegada no la vieron: se
+        # reanuda en la primera decisión con inicio >= menor_llegada
+        decision = bisect_left(completados, menor_llegada,
+                               key=resultado.inicio.__getitem__)
+        tiempo_actual = resultado.finalizacion[completados[decision - 1]] if decision else 0
+        lote = lotes_reanudacion[decision]
+        # Pendientes en ese momento: admitidos antes pero completados después
+        pendientes = [(duraciones[i], lote_admision[i], i)
+                      for i in completados[decision:] if lote_admision[i] < lote]
+        heapq.heapify(pendientes)
+        siguiente = decision + len(pendientes)
+        del completados[decision:]
+        del secuencia[decision:]
+        del lotes_reanudacion[decision + 1:]
+        control = self.control
+        if instr is not None:
+            instr.fase('seleccion')
+        
+        while len(completados) < len(tabla):
+            if control is not None:
+                self._reportar('sjf', tiempo_actual, len(completados))
+            # Agregar procesos que han llegado; a igual duración gana el que
+            # entró antes a la cola y, dentro del mismo lote, el de menor índice
+            while (siguiente < len(orden_llegada) and 
+                   llegadas[orden_llegada[siguiente]] <= tiempo_actual):
+                indice = orden_llegada[siguiente]
+                lote_admision[indice] = lote
+                heapq.heappush(pendientes, (duraciones[indice], lote, indice))
+                siguiente += 1
+            lote += 1
+            
+            if not pendientes:
+                # Si no hay procesos pendientes, avanzar al siguiente tiempo de llegada
+                if instr is not None:
+                    instr.ocioso(tiempo_actual, llegadas[orden_llegada[siguiente]])
+                tiempo_actual = llegadas[orden_llegada[siguiente]]
+                continue
+            
+            # Seleccionar el proceso con menor duración
+            if instr is not None:
+                instr.decision(tiempo_actual, pendientes[0][2], len(pendientes))
+            duracion, _, indice = heapq.heappop(pendientes)
+            
+            fin = tiempo_actual + duracion
+            resultado.inicio[indice] = tiempo_actual
+            resultado.finalizacion[indice] = fin
+            resultado.espera[indice] = tiempo_actual - llegadas[indice]
+            resultado.respuesta[indice] = resultado.espera[indice]
+            
+            secuencia.append({
+                'proceso': tabla.nombre(indice),
+                'inicio': tiempo_actual,
+                'fin': fin
+            })
+            
+            tiempo_actual = fin
+            completados.append(indice)
+            lotes_reanudacion.append(lote)
+        
+        return punto.entregar()
+    
+    @_memorizado('rr')
+    def round_robin(self, modo_secuencia='completa'):
+        """Algoritmo Round Robin
+        
+        Con secuencia ('completa' o 'compacta') se simula una sola vez con
+        _tramos_round_robin: la cola de listos es un deque y las rondas
+        completas en las que nadie termina ni llega se aplican de una vez; los
+        resultados salen de los fines de proceso del mismo recorrido.
+        
+        'perezosa' no arma la secuencia por adelantado: los resultados se
+        calculan por vueltas (_vueltas_round_robin), con un costo que depende
+        de las llegadas y finalizaciones y no de tiempo_total / quantum, y la
+        secuencia es un generador que se simula recién al recorrerlo.
+        
+        modo_secuencia:
+            'completa'  -> lista con un segmento por quantum (como siempre)
+            'compacta'  -> lista con segmentos consecutivos del mismo proceso unidos
+            'perezosa'  -> generador que produce los segmentos por quantum
+        """
+        if modo_secuencia not in ('completa', 'compacta', 'perezosa'):
+            raise ValueError(f"Modo de secuencia desconocido: {modo_secuencia}")
+        quantum = self.quantum
+        if quantum <= 0:
+            raise ValueError("El quantum debe ser positivo")
+        
+        tabla = self.procesos
+        llegadas = tabla.llegadas
+        duraciones = tabla.duraciones
+        tipo = self._tipo_resultado()
+        instr = self.instrumentacion
+        if instr is not None:
+            instr.fase('copia')
+        resultado = ResultadoEjecucion(tabla, tipo)
+        if instr is not None:
+            instr.fase('ordenar')
+        orden_llegada = sorted(range(len(tabla)), key=llegadas.__getitem__)
+        nombre = tabla.nombre
+        
+        def segmento(indice, inicio, fin):
+            return {'proceso': nombre(indice), 'inicio': inicio, 'fin': fin}
+        
+        def tramos(instr=None):
+            return _tramos_round_robin(zip(orden_llegada, map(llegadas.__getitem__, orden_llegada),
+                                           map(duraciones.__getitem__, orden_llegada)),
+                                       quantum, instr)
+        
+        if instr is not None:
+            instr.fase('seleccion')
+        if modo_secuencia == 'perezosa':
+            self._vueltas_round_robin(resultado, orden_llegada)
+            return resultado, _expandir_tramos(tramos(), segmento)
+        
+        control = self.control
+        completados = resultado.orden
+        finalizacion = resultado.finalizacion
+        espera = resultado.espera
+        respuesta = resultado.respuesta
+        
+        def registrar(tramos):
+            """Guardar los fines de proceso e informar el progreso al paso"""
+            for tramo in tramos:
+                if len(tramo) == 5:
+                    indice, llegada, duracion, fin, primera = tramo
+                    finalizacion[indice] = fin
+                    espera[indice] = fin - llegada - duracion
+                    respuesta[indice] = primera
+                    completados.append(indice)
+                elif control is not None:
+                    control.reportar(tramo[1], len(completados))
+                yield tramo
+        
+        if modo_secuencia == 'compacta':
+            return resultado, list(_compactar_tramos(registrar(tramos(instr)), segmento))
+        return resultado, list(_expandir_tramos(registrar(tramos(instr)), segmento))
+    
+    def _vueltas_round_robin(self, resultado, orden_llegada):
+        """Resultados de Round Robin por vueltas, sin simular cada quantum
+        
+        Mientras un proceso está en la cola recibe un quantum por vuelta, así
+        que la vuelta de su último quantum queda fija al entrar. Un heap
+        ordena esas vueltas finales y el ciclo avanza de una vez hasta la
+        próxima llegada o finalización.
+        """
+        tabla = self.procesos
+        llegadas = tabla.llegadas
+        duraciones = tabla.duraciones
+        quantum = self.quantum
+        instr = self.instrumentacion
+        respuesta = resultado.respuesta
+        completados = resultado.orden
+        # Llegadas en orden, con un centinela que nunca llega
+        proximas = [llegadas[i] for i in orden_llegada]
+        proximas.append(_ULTIMA)
+        siguiente = 0
+        control = self.control
+        
+        # La cola en orden circular: ciclo[posicion] es el próximo en correr
+        # y la vuelta `ronda` termina en el último, así que los que están
+        # antes de `posicion` ya corrieron en esta vuelta
+        ciclo = _Ciclo()
+        largo = 0
+        posicion = 0
+        ronda = 0
+        tiempo_actual = 0
+        despachados = 0
+        # (vuelta del último quantum, etiqueta, índice, largo del último
+        # quantum); la etiqueta ordena el ciclo aunque se inserten procesos
+        # en el medio
+        finales = []
+        sello = 0
+        # (número de despacho, índice) de los que todavía no corrieron: el que
+        # llega queda último en el ciclo y nadie se ubica después de él
+        sin_respuesta = deque()
+        # Llegados durante el quantum de ciclo[posicion]: no estaban en la cola al despacharlo
+        llegados_en_curso = 0
+        
+        while finales or siguiente < len(orden_llegada):
+            if not largo:
+                # Cola vacía: avanzar a la próxima llegada y cargar las simultáneas
+                if tiempo_actual < proximas[siguiente]:
+                    if instr is not None:
+                        instr.ocioso(tiempo_actual, proximas[siguiente])
+                    tiempo_actual = proximas[siguiente]
+                posicion = 0
+                while proximas[siguiente] <= tiempo_actual:
+                    indice = orden_llegada[siguiente]
+                    siguiente += 1
+                    sello += 1
+                    etiqueta = (sello, _ULTIMA)
+                    ciclo.anexar(etiqueta, indice)
+                    sin_respuesta.append((despachados + largo, indice))
+                    largo += 1
+                    heapq.heappush(finales, _final(ronda, etiqueta, indice, duraciones[indice], quantum))
+                continue
+            
+            ronda_final, etiqueta, indice, ultimo_quantum = finales[0]
+            proxima = proximas[siguiente]
+            # Quantums completos que corren antes del último de `indice`; sin
+            # su lugar en el ciclo es una cota inferior, que suele bastar para
+            # ver que la próxima llegada es anterior
+            antes = (ronda_final - ronda) * largo - posicion
+            llega = proxima <= tiempo_actual + antes * quantum
+            if not llega:
+                if largo > 1:
+                    antes += ciclo.posicion(etiqueta)
+                llega = proxima <= tiempo_actual + antes * quantum + ultimo_quantum
+            if llega:
+                # Avanzar hasta el quantum en curso cuando llega el próximo
+                pasos = min(max(int(-(-(proxima - tiempo_actual) // quantum)) - 1, 0), antes)
+            else:
+                pasos = antes
+            
+            if pasos:
+                if instr is not None:
+                    instr.decision(tiempo_actual, ciclo[posicion], largo - llegados_en_curso)
+                    if pasos > 1:
+                        instr.despachos(tiempo_actual + quantum, pasos - 1,
+                                        ciclo[(posicion + 1) % largo],
+                                        ciclo[(posicion + pasos - 1) % largo], largo)
+                llegados_en_curso = 0
+                while sin_respuesta and sin_respuesta[0][0] < despachados + pasos:
+                    turno, primero = sin_respuesta.popleft()
+                    respuesta[primero] = (tiempo_actual + (turno - despachados) * quantum -
+                                          llegadas[primero])
+                despachados += pasos
+                tiempo_actual += pasos * quantum
+                ronda += (posicion + pasos) // largo
+                posicion = (posicion + pasos) % largo
+            if control is not None:
+                control.reportar(tiempo_actual, len(completados))
+            
+            if llega:
+                # El que llega va al final de la cola: justo antes del que está corriendo
+                nuevo = orden_llegada[siguiente]
+                siguiente += 1
+                sello += 1
+                etiqueta = ciclo.etiqueta(posicion)[:-1] + (sello, _ULTIMA)
+                ciclo.insertar(posicion, etiqueta, nuevo)
+                sin_respuesta.append((despachados + largo, nuevo))
+                largo += 1
+                posicion += 1
+                llegados_en_curso += 1
+                heapq.heappush(finales, _final(ronda + 1, etiqueta, nuevo, duraciones[nuevo], quantum))
+                continue
+            
+            # ciclo[posicion] es `indice` y corre su último quantum
+            if instr is not None:
+                instr.decision(tiempo_actual, indice, largo - llegados_en_curso)
+            llegados_en_curso = 0
+            if sin_respuesta and sin_respuesta[0][1] == indice:
+                sin_respuesta.popleft()
+                respuesta[indice] = tiempo_actual - llegadas[indice]
+            despachados += 1
+            heapq.heappop(finales)
+            ciclo.quitar(etiqueta)
+            largo -= 1
+            if posicion == largo:
+                posicion = 0
+                ronda += 1
+            tiempo_actual += ultimo_quantum
+            resultado.finalizacion[indice] = tiempo_actual
+            resultado.espera[indice] = tiempo_actual - llegadas[indice] - duraciones[indice]
+            completados.append(indice)
+    
+    def simular_politica(self, politica):
+        """Ejecutar una política (eventos.Politica) sobre el motor de eventos
+        
+        No usa la cache: la política puede depender de datos que no están en
+        la tabla (por ejemplo, las prioridades).
+        """
+        instr = self.instrumentacion
+        if instr is None:
+            return self._simular_politica(politica)
+        instr.iniciar(type(politica).__name__, self.procesos)
+        try:
+            return self._simular_politica(politica)
+        finally:
+            instr.terminar()
+    
+    def _simular_politica(self, politica):
+        from eventos import simular
+        return simular(self.procesos, politica, self._tipo_resultado(),
+                       self.control, self.instrumentacion)
+    
+    @_memorizado('srtf')
+    def srtf(self):
+        """Shortest Remaining Time First: SJF expropiativo, por eventos"""
+        from eventos import PoliticaSRTF
+        return self._simular_politica(PoliticaSRTF())
+    
+    @_memorizado('mlfq')
+    def mlfq(self, quantums=(2, 4, 8), intervalo_impulso=None):
+        """Multi-Level Feedback Queue con un quantum por nivel, por eventos"""
+        from eventos import PoliticaMLFQ
+        return self._simular_politica(PoliticaMLFQ(tuple(quantums), intervalo_impulso))
+    
+    def prioridad(self, prioridades, envejecimiento=None, expropiativa=True):
+        """Planificación por prioridades (menor = más prioritario) con envejecimiento
+        
+        prioridades: una por fila de la tabla. Sin cache, como simular_politica.
+        """
+        from eventos import PoliticaPrioridad
+        return self.simular_politica(PoliticaPrioridad(prioridades, envejecimiento, expropiativa))
+    
+    def multiprocesador(self, cpus=4, balanceo='global', quantum=None):
+        """Simulación con varias CPUs (ver multiprocesador.py)
+        
+        Devuelve (resultado, secuencia, resumen): los segmentos llevan la
+        clave 'cpu' y el resumen la utilización por CPU, migraciones,
+        throughput y percentiles de latencia. Sin cache.
+        """
+        from multiprocesador import simular_smp
+        tipo = 'd' if self.procesos.tipo == 'd' or not isinstance(quantum, (int, type(None))) else 'q'
+        return simular_smp(self.procesos, cpus, balanceo, quantum, tipo, self.control)
+
+def fifo_vectorizado(llegadas, duraciones):
+    """Kernel FIFO con NumPy sobre arrays de forma (n,) o (lotes, n)
+    
+    Con los procesos ordenados por llegada, el fin del k-ésimo es
+    C[k] + max(0, max_{j<=k}(llegada[j] - C[j-1])), donde C es la suma
+    acumulada de duraciones; todo se calcula con cumsum y maximum.accumulate.
+    El inicio es max(llegada, fin del anterior), como en fifo(): nunca
+    queda antes de la llegada aunque el fin acumule redondeo con floats.
+    Un array 2-D evalúa muchas cargas de trabajo del mismo tamaño a la vez.
+    
+    Devuelve (inicio, fin, espera, respuesta) en el orden de entrada.
+    """
+    import numpy as np
+    llegadas = np.asarray(llegadas)
+    duraciones = np.asarray(duraciones)
+    orden = np.argsort(llegadas, axis=-1, kind='stable')
+    llegadas_ord = np.take_along_axis(llegadas, orden, axis=-1)
+    duraciones_ord = np.take_along_axis(duraciones, orden, axis=-1)
+    
+    acumulado = np.cumsum(duraciones_ord, axis=-1)
+    holgura = np.maximum.accumulate(llegadas_ord - (acumulado - duraciones_ord), axis=-1)
+    fin_ord = acumulado + np.maximum(holgura, 0)
+    # El primero arranca desde t=0, como tiempo_actual en fifo()
+    fin_anterior = np.zeros_like(fin_ord)
+    fin_anterior[..., 1:] = fin_ord[..., :-1]
+    inicio_ord = np.maximum(llegadas_ord, fin_anterior)
+    
+    inicio = np.empty_like(inicio_ord)
+    fin = np.empty_like(fin_ord)
+    np.put_along_axis(inicio, orden, inicio_ord, axis=-1)
+    np.put_along_axis(fin, orden, fin_ord, axis=-1)
+    espera = inicio - llegadas
+    return inicio, fin, espera, espera.copy()
+
+# Cierra las etiquetas del ciclo de Round Robin: (a, b, _ULTIMA) queda justo
+# después de las etiquetas que empiezan con (a, b, ...) y antes de las mayores
+_ULTIMA = float('inf')
+
+def _final(ronda, etiqueta, indice, duracion, quantum):
+    """Entrada del heap de Round Robin para un proceso que corre desde `ronda`"""
+    vueltas = max(1, int(-(-duracion // quantum)))
+    return ronda + vueltas - 1, etiqueta, indice, duracion - (vueltas - 1) * quantum
+
+class _Ciclo:
+    """Cola circular de Round Robin ordenada por etiqueta, guardada en bloques
+    
+    Ubicar una etiqueta, obtener el k-ésimo, insertar y borrar recorren la
+    lista de bloques y un bloque con operaciones en C (bisect, sum,
+    list.insert), en lugar de desplazar o buscar en una sola lista de n.
+    Los bloques tienen a lo sumo 2 * CARGA elementos, así que cada operación
+    cuesta O(n / CARGA + CARGA): sigue siendo lineal en n, pero con una
+    constante mil veces menor para las colas de hasta millones de procesos.
+    Round Robin sólo inserta y borra en la posición del que está corriendo.
+    """
+    __slots__ = ('etiquetas', 'elementos', 'maximos')
+    
+    CARGA = 1000
+    
+    def __init__(self):
+        self.etiquetas = []
+        self.elementos = []
+        self.maximos = []
+    
+    def __len__(self):
+        return sum(map(len, self.elementos))
+    
+    def posicion(self, etiqueta):
+        """Lugar en el ciclo de una etiqueta presente"""
+        bloque = bisect_left(self.maximos, etiqueta)
+        if not bloque:
+            return bisect_left(self.etiquetas[0], etiqueta)
+        return sum(map(len, self.elementos[:bloque])) + bisect_left(self.etiquetas[bloque], etiqueta)
+    
+    def _buscar(self, posicion):
+        if len(self.maximos) == 1:
+            return 0, posicion
+        acumulados = list(accumulate(map(len, self.elementos)))
+        bloque = bisect_right(acumulados, posicion)
+        return bloque, posicion - (acumulados[bloque - 1] if bloque else 0)
+    
+    def __getitem__(self, posicion):
+        bloque, lugar = self._buscar(posicion)
+        return self.elementos[bloque][lugar]
+    
+    def etiqueta(self, posicion):
+        bloque, lugar = self._buscar(posicion)
+        return self.etiquetas[bloque][lugar]
+    
+    def anexar(self, etiqueta, elemento):
+        """Agregar al final; la etiqueta debe ser mayor que todas"""
+        if not self.maximos or len(self.etiquetas[-1]) >= self.CARGA:
+            self.etiquetas.append([])
+            self.elementos.append([])
+            self.maximos.append(etiqueta)
+        self.etiquetas[-1].append(etiqueta)
+        self.elementos[-1].append(elemento)
+        self.maximos[-1] = etiqueta
+    
+    def insertar(self, posicion, etiqueta, elemento):
+        """Insertar en `posicion`; la etiqueta debe respetar el orden"""
+        bloque, lugar = self._buscar(posicion)
+        etiquetas = self.etiquetas[bloque]
+        elementos = self.elementos[bloque]
+        etiquetas.insert(lugar, etiqueta)
+        elementos.insert(lugar, elemento)
+        self.maximos[bloque] = etiquetas[-1]
+        if len(etiquetas) > 2 * self.CARGA:
+            # Partir el bloque en dos mitades
+            self.etiquetas.insert(bloque + 1, etiquetas[self.CARGA:])
+            self.elementos.insert(bloque + 1, elementos[self.CARGA:])
+            del etiquetas[self.CARGA:]
+            del elementos[self.CARGA:]
+            self.maximos[bloque:bloque + 1] = [etiquetas[-1], self.etiquetas[bloque + 1][-1]]
+    
+    def quitar(self, etiqueta):
+        bloque = bisect_left(self.maximos, etiqueta)
+        etiquetas = self.etiquetas[bloque]
+        lugar = bisect_left(etiquetas, etiqueta)
+        del etiquetas[lugar]
+        del self.elementos[bloque][lugar]
+        if etiquetas:
+            self.maximos[bloque] = etiquetas[-1]
+        else:
+            del self.etiquetas[bloque], self.elementos[bloque], self.maximos[bloque]
+
+# Campos de un proceso en la cola de _tramos_round_robin
+_CLAVE, _LLEGADA, _DURACION, _RESTANTE, _RESPUESTA = range(5)
+
+def _tramos_round_robin(procesos, quantum, instr=None):
+    """Round Robin en flujo sobre (clave, llegada, duracion) ordenados por llegada
+    
+    Genera en orden de tiempo (clave, inicio, fin) por cada quantum,
+    (claves, inicio, rondas, quantum) por las rondas completas en las que
+    nadie termina ni llega, y (clave, llegada, duracion, fin, respuesta)
+    cuando un proceso termina. Sólo guarda la cola de listos; da la
+    secuencia y los resultados de PlanificadorProcesos.round_robin y los
+    eventos de flujo.round_robin. Con `instr` (una Instrumentacion) informa
+    cada despacho y cada hueco ocioso, con las claves como índices.
+    """
+    procesos = iter(procesos)
+    proximo = next(procesos, None)
+    cola = deque()
+    tiempo_actual = 0
+    pasos_ronda = 0
+    while True:
+        while proximo is not None and proximo[1] <= tiempo_actual:
+            cola.append([proximo[0], proximo[1], proximo[2], proximo[2], -1])
+            proximo = next(procesos, None)
+        
+        if not cola:
+            if proximo is None:
+                return
+            if instr is not None and tiempo_actual < proximo[1]:
+                instr.ocioso(tiempo_actual, proximo[1])
+            tiempo_actual = proximo[1]
+            pasos_ronda = 0
+            continue
+        
+        if pasos_ronda == 0:
+            rondas = _rondas_sin_eventos(cola, tiempo_actual, quantum,
+                                         None if proximo is None else proximo[1])
+            if rondas > 0:
+                if instr is not None:
+                    instr.despachos(tiempo_actual, rondas * len(cola), cola[0][_CLAVE],
+                                    cola[-1][_CLAVE], len(cola))
+                for posicion, registro in enumerate(cola):
+                    if registro[_RESPUESTA] == -1:
+                        registro[_RESPUESTA] = tiempo_actual + posicion * quantum - registro[_LLEGADA]
+                    registro[_RESTANTE] -= rondas * quantum
+                yield tuple(r[_CLAVE] for r in cola), tiempo_actual, rondas, quantum
+                tiempo_actual += rondas * len(cola) * quantum
+            pasos_ronda = len(cola)
+        
+        if instr is not None:
+            instr.decision(tiempo_actual, cola[0][_CLAVE], len(cola))
+        registro = cola.popleft()
+        pasos_ronda -= 1
+        if registro[_RESPUESTA] == -1:
+            registro[_RESPUESTA] = tiempo_actual - registro[_LLEGADA]
+        tiempo_ejecucion = min(quantum, registro[_RESTANTE])
+        inicio = tiempo_actual
+        tiempo_actual += tiempo_ejecucion
+        registro[_RESTANTE] -= tiempo_ejecucion
+        yield registro[_CLAVE], inicio, tiempo_actual
+        
+        while proximo is not None and proximo[1] <= tiempo_actual:
+            cola.append([proximo[0], proximo[1], proximo[2], proximo[2], -1])
+            proximo = next(procesos, None)
+        if registro[_RESTANTE] > 0:
+            cola.append(registro)
+        else:
+            yield (registro[_CLAVE], registro[_LLEGADA], registro[_DURACION], tiempo_actual,
+                   registro[_RESPUESTA])
+
+def _rondas_sin_eventos(cola, tiempo_actual, quantum, proxima_llegada):
+    """Rondas completas sobre la cola en las que nadie termina ni llega"""
+    rondas = None
+    if proxima_llegada is not None:
+        # Mayor m tal que el fin de la ronda m sea anterior a la próxima llegada
+        hueco = proxima_llegada - tiempo_actual
+        rondas = -(-hueco // (len(cola) * quantum)) - 1
+        if rondas <= 0:
+            return 0
+    restante_minimo = min(r[_RESTANTE] for r in cola)
+    # Mayor m tal que restante_minimo - m * quantum > 0
+    rondas_sin_fin = -(-restante_minimo // quantum) - 1
+    if rondas is None or rondas_sin_fin < rondas:
+        rondas = rondas_sin_fin
+    return max(0, int(rondas))
+
+def _segmento(proceso, inicio, fin):
+    return {'proceso': proceso, 'inicio': inicio, 'fin': fin}
+
+def _expandir_tramos(tramos, segmento=_segmento, terminado=None):
+    """Generar un segmento por quantum a partir de los tramos de Round Robin
+    
+    Los tramos de fin de proceso se descartan, o se convierten con
+    `terminado` si se indica.
+    """
+    for tramo in tramos:
+        if len(tramo) == 3:
+            yield segmento(*tramo)
+        elif len(tramo) == 4:
+            claves, inicio, rondas, quantum = tramo
+            for _ in range(rondas):
+                for clave in claves:
+                    yield segmento(clave, inicio, inicio + quantum)
+                    inicio += quantum
+        elif terminado is not None:
+            yield terminado(*tramo)
+
+def _compactar_tramos(tramos, segmento=_segmento, terminado=None):
+    """Generar segmentos uniendo los consecutivos del mismo proceso"""
+    actual = None
+    for tramo in tramos:
+        if len(tramo) == 5:
+            if terminado is not None:
+                if actual is not None:
+                    yield actual
+                    actual = None
+                yield terminado(*tramo)
+            continue
+        if len(tramo) == 4 and len(tramo[0]) == 1:
+            # Un solo proceso en cola: todas sus rondas forman un segmento
+            claves, inicio, rondas, quantum = tramo
+            segmentos = [segmento(claves[0], inicio, inicio + rondas * quantum)]
+        else:
+            segmentos = _expandir_tramos([tramo], segmento)
+        for seg in segmentos:
+            if actual is not None and actual['proceso'] == seg['proceso'] and actual['fin'] == seg['inicio']:
+                actual['fin'] = seg['fin']
+            else:
+                if actual is not None:
+                    yield actual
+                actual = seg
+    if actual is not None:
+        yield actual
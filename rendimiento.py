@@ -0,0 +1,308 @@
+"""Suite de rendimiento de los planificadores
+
+Mide fifo, sjf y round_robin sobre cargas de 10 a 10⁶ procesos, con
+distribuciones realistas y adversas, y reporta tiempo, procesos/s,
+segmentos/s y memoria pico. Los resultados se escriben en JSON; con
+--linea-base se comparan contra una corrida guardada y el programa termina
+con código 1 si alguna medición empeora más allá de la tolerancia.
+
+Cargas:
+    poisson      llegadas exponenciales (media 4), duraciones exponenciales (media 3)
+    simultanea   todos llegan en 0, duraciones uniformes 1..20
+    rafagas      ráfagas enormes (100..1000) con quantum 1, sistema sobrecargado
+
+Round Robin se ejecuta con secuencia perezosa: se mide la planificación y
+los segmentos se cuentan como la suma de ceil(duración / quantum), que es
+el largo de la secuencia completa. Como ninguno se generó, no hay
+segmentos/s (se informa '-'); --modo-rr completa o compacta mide además el
+costo de armar la lista y sí los informa.
+
+Cada (algoritmo, carga) avanza por los tamaños mientras la predicción de la
+curva de escalado (tiempo anterior extrapolado con la pendiente log-log
+observada) no supere --presupuesto segundos; los tamaños restantes se
+registran como omitidos.
+
+--importacion mide en cambio cuánto tarda un intérprete nuevo en importar
+el núcleo (planificador.py) y falla si supera el presupuesto o si arrastra
+tkinter, matplotlib o NumPy: los procesos de corta vida pagan ese costo en
+cada arranque.
+
+Ejemplo:
+    python rendimiento.py --salida base.json
+    python rendimiento.py --linea-base base.json --tolerancia 1.3
+    python rendimiento.py --importacion
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from montecarlo import generar_carga
+from planificador import PlanificadorProcesos
+
+ALGORITMOS = ('fifo', 'sjf', 'rr')
+TAMANOS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+# Segundos máximos para importar el núcleo en un intérprete nuevo
+PRESUPUESTO_IMPORTACION = 0.05
+# Módulos que el núcleo no debe cargar al importarse
+MODULOS_PESADOS = ('tkinter', 'matplotlib', 'numpy')
+
+# nombre -> (tiempo entre llegadas, duración, quantum)
+CARGAS = {
+    'poisson': (('exponencial', 4), ('exponencial', 3), 3),
+    'simultanea': (('constante', 0), ('uniforme', 1, 20), 3),
+    'rafagas': (('exponencial', 50), ('uniforme', 100, 1000), 1),
+}
+
+def _ejecutar(tabla, algoritmo, quantum, modo_rr):
+    """Una corrida con un planificador nuevo (sin cache ni puntos de control)"""
+    planificador = PlanificadorProcesos()
+    planificador.procesos = tabla
+    if algoritmo == 'fifo':
+        return planificador.fifo()
+    if algoritmo == 'sjf':
+        return planificador.sjf()
+    planificador.quantum = quantum
+    return planificador.round_robin(modo_rr)
+
+def _segmentos(tabla, algoritmo, quantum, secuencia):
+    if algoritmo == 'rr' and not isinstance(secuencia, list):
+        return sum(-(-duracion // quantum) for duracion in tabla.duraciones)
+    return len(secuencia)
+
+def medir(tabla, algoritmo, quantum=3, repeticiones=3, modo_rr='perezosa', memoria=True):
+    """Medir una celda: mejor tiempo de `repeticiones` y memoria pico
+
+    Como timeit, el recolector de basura se apaga durante la medición. Si una
+    corrida tarda más de un segundo no se repite. La memoria se mide en una
+    corrida aparte con tracemalloc, que distorsiona el tiempo.
+    """
+    tiempos = []
+    habilitado = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            _, secuencia = _ejecutar(tabla, algoritmo, quantum, modo_rr)
+            tiempos.append(time.perf_counter() - inicio)
+            if tiempos[-1] > 1:
+                break
+    finally:
+        if habilitado:
+            gc.enable()
+    segmentos = _segmentos(tabla, algoritmo, quantum, secuencia)
+    # Una secuencia perezosa no se recorrió: el tiempo medido no produjo segmentos
+    generados = isinstance(secuencia, list)
+    del secuencia
+
+    memoria_pico = None
+    if memoria:
+        tracemalloc.start()
+        try:
+            _ejecutar(tabla, algoritmo, quantum, modo_rr)
+            memoria_pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    segundos = min(tiempos)
+    return {
+        'segundos': segundos,
+        'procesos_por_segundo': len(tabla) / segundos if segundos else None,
+        'segmentos': segmentos,
+        'segmentos_por_segundo': segmentos / segundos if segundos and generados else None,
+        'memoria_pico': memoria_pico,
+    }
+
+def ejecutar_suite(algoritmos=ALGORITMOS, cargas=tuple(CARGAS), tamanos=TAMANOS, semilla=0,
+                   repeticiones=3, presupuesto=30.0, modo_rr='perezosa', memoria=True,
+                   informar=None):
+    """Recorrer algoritmo x carga x tamaño y devolver una fila por medición
+
+    Cada fila tiene algoritmo, carga, procesos, quantum, las métricas de
+    medir() y 'pendiente': el exponente de escalado respecto del tamaño
+    anterior (1 = lineal). Las filas omitidas por presupuesto llevan
+    'omitido': True y ninguna métrica.
+    """
+    for algoritmo in algoritmos:
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+    for carga in cargas:
+        if carga not in CARGAS:
+            raise ValueError(f"Carga desconocida: {carga}")
+    tamanos = sorted(tamanos)
+
+    filas = []
+    for carga in cargas:
+        entre_llegadas, duracion, quantum = CARGAS[carga]
+        # La misma tabla para todos los algoritmos de cada tamaño
+        tablas = {}
+        for algoritmo in algoritmos:
+            anterior = None
+            pendiente = 1.0
+            for n in tamanos:
+                fila = {'algoritmo': algoritmo, 'carga': carga, 'procesos': n,
+                        'quantum': quantum if algoritmo == 'rr' else None}
+                if anterior is not None:
+                    prediccion = anterior['segundos'] * (n / anterior['procesos']) ** max(1.0, pendiente)
+                    if prediccion > presupuesto:
+                        fila['omitido'] = True
+                        filas.append(fila)
+                        if informar is not None:
+                            informar(fila)
+                        continue
+                if n not in tablas:
+                    tablas[n] = generar_carga(random.Random(f"{semilla}/{carga}/{n}"), n,
+                                              entre_llegadas, duracion)
+                fila.update(medir(tablas[n], algoritmo, quantum, repeticiones, modo_rr, memoria))
+                if anterior is not None and anterior['segundos'] > 0 and fila['segundos'] > 0:
+                    pendiente = (math.log(fila['segundos'] / anterior['segundos']) /
+                                 math.log(n / anterior['procesos']))
+                    fila['pendiente'] = pendiente
+                else:
+                    fila['pendiente'] = None
+                filas.append(fila)
+                anterior = fila
+                if informar is not None:
+                    informar(fila)
+    return filas
+
+def comparar(filas, linea_base, tolerancia=1.5, minimo=0.001, memoria_minima=2**20):
+    """Regresiones respecto de una corrida anterior
+
+    Una medición regresa si su tiempo o su memoria pico superan `tolerancia`
+    veces los de la línea base. Los tiempos de base menores a `minimo`
+    segundos y las memorias menores a `memoria_minima` bytes no se
+    comparan: son puro ruido. Un caso medido en la línea base que ahora se
+    omite por presupuesto también es una regresión.
+
+    Devuelve una lista de textos, vacía si no hay regresiones.
+    """
+    base = {(f['algoritmo'], f['carga'], f['procesos']): f
+            for f in linea_base['resultados'] if not f.get('omitido')}
+    regresiones = []
+    for fila in filas:
+        anterior = base.get((fila['algoritmo'], fila['carga'], fila['procesos']))
+        if anterior is None:
+            continue
+        celda = f"{fila['algoritmo']}/{fila['carga']}/{fila['procesos']}"
+        if fila.get('omitido'):
+            regresiones.append(f"{celda}: {anterior['segundos']:.4f}s -> omitido (presupuesto)")
+            continue
+        if (anterior['segundos'] >= minimo and
+                fila['segundos'] > anterior['segundos'] * tolerancia):
+            regresiones.append(f"{celda}: {anterior['segundos']:.4f}s -> {fila['segundos']:.4f}s")
+        if ((anterior.get('memoria_pico') or 0) >= memoria_minima and fila.get('memoria_pico') and
+                fila['memoria_pico'] > anterior['memoria_pico'] * tolerancia):
+            regresiones.append(f"{celda}: memoria {anterior['memoria_pico']} -> "
+                               f"{fila['memoria_pico']} bytes")
+    return regresiones
+
+def medir_importacion(modulo='planificador', repeticiones=5):
+    """Tiempo de importar `modulo` en un intérprete nuevo (mejor de `repeticiones`)
+
+    Se usa -X importtime, que cuenta sólo la importación y no el arranque
+    del intérprete. Devuelve los segundos y cuáles de MODULOS_PESADOS
+    quedaron cargados.
+    """
+    codigo = f"import sys, {modulo}; print(*[m for m in {MODULOS_PESADOS!r} if m in sys.modules])"
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    mejor = None
+    for _ in range(repeticiones):
+        proceso = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo], cwd=directorio,
+                                 capture_output=True, text=True, check=True)
+        # Líneas "import time: propio | acumulado | módulo"; el módulo pedido
+        # es el único de primer nivel con ese nombre
+        for linea in proceso.stderr.splitlines():
+            partes = linea.split('|')
+            if len(partes) == 3 and partes[2] == f" {modulo}":
+                microsegundos = int(partes[1])
+                if mejor is None or microsegundos < mejor:
+                    mejor = microsegundos
+    return {'modulo': modulo, 'segundos': mejor / 1e6, 'cargados': proceso.stdout.split()}
+
+def _imprimir_fila(fila):
+    if fila.get('omitido'):
+        print(f"{fila['algoritmo']:<5} {fila['carga']:<11} {fila['procesos']:>9}  omitido (presupuesto)")
+        return
+    memoria = f"{fila['memoria_pico'] / 2**20:>9.1f}" if fila['memoria_pico'] is not None else f"{'-':>9}"
+    pendiente = f"{fila['pendiente']:>6.2f}" if fila['pendiente'] is not None else f"{'-':>6}"
+    por_segundo = fila['segmentos_por_segundo']
+    segmentos = f"{por_segundo:>12.0f}" if por_segundo is not None else f"{'-':>12}"
+    print(f"{fila['algoritmo']:<5} {fila['carga']:<11} {fila['procesos']:>9} "
+          f"{fila['segundos']:>10.4f} {fila['procesos_por_segundo']:>12.0f} "
+          f"{segmentos} {memoria} {pendiente}", flush=True)
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Suite de rendimiento de los planificadores")
+    parser.add_argument('--algoritmos', nargs='+', choices=ALGORITMOS, default=list(ALGORITMOS))
+    parser.add_argument('--cargas', nargs='+', choices=list(CARGAS), default=list(CARGAS))
+    parser.add_argument('--tamanos', nargs='+', type=int, default=list(TAMANOS))
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--presupuesto', type=float, default=30.0,
+                        help="segundos máximos previstos por medición")
+    parser.add_argument('--modo-rr', choices=('perezosa', 'compacta', 'completa'), default='perezosa')
+    parser.add_argument('--sin-memoria', action='store_true', help="no medir la memoria pico")
+    parser.add_argument('--salida', help="archivo JSON con los resultados")
+    parser.add_argument('--linea-base', help="JSON de una corrida anterior para detectar regresiones")
+    parser.add_argument('--tolerancia', type=float, default=1.5,
+                        help="factor máximo respecto de la línea base")
+    parser.add_argument('--importacion', action='store_true',
+                        help="medir sólo el tiempo de importación del núcleo")
+    parser.add_argument('--presupuesto-importacion', type=float, default=PRESUPUESTO_IMPORTACION,
+                        help="segundos máximos para importar el núcleo")
+    args = parser.parse_args(argumentos)
+
+    if args.importacion:
+        medicion = medir_importacion(repeticiones=args.repeticiones)
+        print(f"import {medicion['modulo']}: {medicion['segundos'] * 1e3:.1f} ms "
+              f"(presupuesto {args.presupuesto_importacion * 1e3:.0f} ms)")
+        fallas = []
+        if medicion['segundos'] > args.presupuesto_importacion:
+            fallas.append("supera el presupuesto")
+        if medicion['cargados']:
+            fallas.append(f"carga {', '.join(medicion['cargados'])}")
+        for falla in fallas:
+            print(f"  {falla}", file=sys.stderr)
+        return 1 if fallas else 0
+
+    print(f"{'Alg.':<5} {'Carga':<11} {'Procesos':>9} {'Segundos':>10} {'Proc/s':>12} "
+          f"{'Seg/s':>12} {'MiB pico':>9} {'Pend.':>6}")
+    filas = ejecutar_suite(args.algoritmos, args.cargas, args.tamanos, args.semilla,
+                           args.repeticiones, args.presupuesto, args.modo_rr,
+                           not args.sin_memoria, informar=_imprimir_fila)
+
+    informe = {
+        'version': 1,
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'parametros': {'semilla': args.semilla, 'repeticiones': args.repeticiones,
+                       'modo_rr': args.modo_rr},
+        'resultados': filas,
+    }
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(informe, archivo, indent=2)
+
+    if args.linea_base:
+        with open(args.linea_base, encoding='utf-8') as archivo:
+            regresiones = comparar(filas, json.load(archivo), args.tolerancia)
+        if regresiones:
+            print(f"\n{len(regresiones)} regresiones (tolerancia x{args.tolerancia}):", file=sys.stderr)
+            for regresion in regresiones:
+                print(f"  {regresion}", file=sys.stderr)
+            return 1
+        print(f"\nSin regresiones respecto de {args.linea_base}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,493 @@
+"""Servicio local de planificación: JSON-RPC 2.0 sobre un socket Unix o TCP local
+
+Un proceso que queda corriendo con los módulos importados y los
+planificadores calientes (con su cache de resultados), para que otras
+herramientas consulten planificaciones en milisegundos en lugar de pagar el
+arranque del intérprete en cada llamada.
+
+Protocolo: un objeto JSON-RPC por línea, en ambos sentidos. Cada conexión
+puede enviar varias solicitudes sin esperar las respuestas; éstas llegan a
+medida que terminan, con el mismo id.
+
+Métodos:
+    planificar        algoritmo ('fifo', 'sjf', 'rr', 'srtf', 'mlfq', 'smp'),
+                      procesos (lista de {nombre, llegada, duracion} o columnas
+                      {llegadas, duraciones, nombres}) o carga (id de
+                      registrar_carga), quantum (lista de quantums para mlfq),
+                      cpus, balanceo, secuencia, compactar, detalle.
+                      Devuelve las métricas de metricas.py y, si se piden, la
+                      secuencia y las métricas por proceso.
+    registrar_carga   procesos -> {'carga': id}, para no reenviar cargas grandes
+    estado            contadores del servicio
+
+Las solicitudes chicas (hasta --limite-lote procesos) se resuelven en un
+hilo que conserva los planificadores. Si el hilo está libre, una solicitud
+sale enseguida; mientras trabaja, las que llegan se juntan y salen como un
+lote (hasta --lote-maximo) al terminar el anterior, y las repetidas dentro
+del lote se calculan una vez. Así la latencia sin carga es la de una
+solicitud y con carga se amortiza el paso entre hilos. Las grandes van a un
+pool de procesos, que también conserva sus planificadores. El bucle de
+eventos sólo lee, despacha y escribe.
+
+Ejemplo:
+    python servicio.py --socket /tmp/planificador.sock &
+    cliente = Cliente('/tmp/planificador.sock')
+    cliente.llamar('planificar', algoritmo='rr', quantum=4,
+                   procesos=[{'nombre': 'A', 'llegada': 0, 'duracion': 5}])['metricas']
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import signal
+import socket
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from metricas import calcular_metricas
+from planificador import PlanificadorProcesos, TablaProcesos
+
+ALGORITMOS = ('fifo', 'sjf', 'rr', 'srtf', 'mlfq', 'smp')
+# Planificadores (con su cache) que conserva cada proceso, por carga
+MAX_PLANIFICADORES = 16
+# Cargas registradas con registrar_carga
+MAX_CARGAS = 32
+
+# Códigos de error de JSON-RPC 2.0
+ERROR_JSON = -32700
+SOLICITUD_INVALIDA = -32600
+METODO_DESCONOCIDO = -32601
+PARAMETROS_INVALIDOS = -32602
+ERROR_INTERNO = -32603
+
+_planificadores = OrderedDict()
+
+def _planificador_para(tabla):
+    """Planificador caliente para la carga (LRU por huella y tamaño)"""
+    clave = (tabla.huella, len(tabla))
+    planificador = _planificadores.get(clave)
+    if planificador is None:
+        planificador = PlanificadorProcesos()
+        planificador.procesos = tabla
+        _planificadores[clave] = planificador
+        if len(_planificadores) > MAX_PLANIFICADORES:
+            _planificadores.popitem(last=False)
+    else:
+        _planificadores.move_to_end(clave)
+    return planificador
+
+def _calentar():
+    """Importar de antemano lo que usan los algoritmos (en cada proceso del pool)"""
+    import eventos
+    import multiprocesador
+    return os.getpid()
+
+def ejecutar(tabla, peticion):
+    """Resolver una petición normalizada por leer_peticion(); devuelve un dict JSON"""
+    planificador = _planificador_para(tabla)
+    algoritmo = peticion['algoritmo']
+    quantum = peticion['quantum']
+    planificador.quantum = quantum if algoritmo in ('rr', 'smp') else 3
+    metricas = None
+    if algoritmo == 'fifo':
+        resultado, secuencia = planificador.fifo()
+    elif algoritmo == 'sjf':
+        resultado, secuencia = planificador.sjf()
+    elif algoritmo == 'rr':
+        if peticion['compactar']:
+            modo = 'compacta'
+        else:
+            # Sin secuencia pedida no se arma la lista
+            modo = 'completa' if peticion['secuencia'] else 'perezosa'
+        resultado, secuencia = planificador.round_robin(modo)
+    elif algoritmo == 'srtf':
+        resultado, secuencia = planificador.srtf()
+    elif algoritmo == 'mlfq':
+        resultado, secuencia = planificador.mlfq(quantum)
+    else:
+        resultado, secuencia, metricas = planificador.multiprocesador(
+            peticion['cpus'], peticion['balanceo'], quantum)
+
+    respuesta = {'algoritmo': algoritmo,
+                 'metricas': metricas if metricas is not None else calcular_metricas(resultado, secuencia)}
+    if peticion['secuencia']:
+        respuesta['secuencia'] = list(secuencia)
+    if peticion['detalle']:
+        tabla = resultado.tabla
+        respuesta['procesos'] = {
+            'nombres': [tabla.nombre(indice) for indice in range(resultado.filas)],
+            'finalizacion': resultado.finalizacion.tolist(),
+            'espera': resultado.espera.tolist(),
+            'respuesta': resultado.respuesta.tolist(),
+            'orden': resultado.orden.tolist(),
+        }
+    return respuesta
+
+def ejecutar_lote(trabajos):
+    """Resolver varias (tabla, peticion); las iguales se calculan una sola vez
+
+    Devuelve un ('ok', respuesta) o ('error', excepción) por trabajo.
+    """
+    hechos = {}
+    salida = []
+    for tabla, peticion in trabajos:
+        clave = (tabla.huella, len(tabla), tuple(sorted(peticion.items())))
+        if clave not in hechos:
+            try:
+                hechos[clave] = ('ok', ejecutar(tabla, peticion))
+            except Exception as error:
+                hechos[clave] = ('error', error)
+        salida.append(hechos[clave])
+    return salida
+
+def _numero(valor):
+    # bool es subclase de int: true en el JSON no es un tiempo; json acepta NaN e Infinity
+    return (isinstance(valor, (int, float)) and not isinstance(valor, bool) and
+            math.isfinite(valor))
+
+def _positivo(valor):
+    return _numero(valor) and valor > 0
+
+def _validar_tiempos(numero, llegada, duracion):
+    if not _numero(llegada) or not _numero(duracion):
+        raise ValueError(f"Proceso {numero}: los tiempos deben ser números")
+    if llegada < 0 or duracion <= 0:
+        raise ValueError(f"Proceso {numero}: los tiempos deben ser positivos")
+
+def leer_carga(procesos):
+    """TablaProcesos a partir de registros {nombre, llegada, duracion} o de columnas
+
+    Las dos formas se validan igual: tiempos numéricos (no booleanos ni
+    textos), llegadas no negativas y duraciones positivas.
+    """
+    if isinstance(procesos, dict):
+        try:
+            llegadas, duraciones = procesos['llegadas'], procesos['duraciones']
+        except KeyError as error:
+            raise ValueError(f"Falta la columna {error}") from None
+        nombres = procesos.get('nombres')
+        if not isinstance(llegadas, list) or not isinstance(duraciones, list):
+            raise ValueError("llegadas y duraciones deben ser listas de números")
+        if nombres is not None:
+            if not isinstance(nombres, list):
+                raise ValueError("nombres debe ser una lista")
+            nombres = list(map(str, nombres))
+        for numero, (llegada, duracion) in enumerate(zip(llegadas, duraciones), start=1):
+            _validar_tiempos(numero, llegada, duracion)
+        tabla = TablaProcesos.desde_columnas(llegadas, duraciones, nombres)
+    elif isinstance(procesos, list):
+        nombres, llegadas, duraciones = [], [], []
+        for numero, proceso in enumerate(procesos, start=1):
+            try:
+                nombre, llegada, duracion = proceso['nombre'], proceso['llegada'], proceso['duracion']
+            except (KeyError, TypeError):
+                raise ValueError(f"Proceso {numero}: se esperaba {{nombre, llegada, duracion}}") from None
+            _validar_tiempos(numero, llegada, duracion)
+            nombres.append(str(nombre))
+            llegadas.append(llegada)
+            duraciones.append(duracion)
+        tabla = TablaProcesos.desde_columnas(llegadas, duraciones, nombres)
+    else:
+        raise ValueError("procesos debe ser una lista de procesos o un objeto de columnas")
+    if len(tabla) == 0:
+        raise ValueError("La carga no tiene procesos")
+    return tabla
+
+def leer_peticion(params):
+    """Validar y completar los parámetros de planificar (sin la carga)"""
+    algoritmo = params.get('algoritmo')
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+    quantum = params.get('quantum')
+    if algoritmo == 'mlfq':
+        if quantum is None:
+            quantum = (2, 4, 8)
+        # Un número suelto (o un texto, que también es iterable) no es una lista de quantums
+        if not isinstance(quantum, (list, tuple)) or not quantum or not all(map(_positivo, quantum)):
+            raise ValueError("quantum de mlfq: una lista de valores positivos")
+        quantum = tuple(quantum)
+    elif algoritmo in ('rr', 'smp'):
+        # smp sin quantum: FIFO en cada CPU
+        if quantum is None and algoritmo == 'rr':
+            quantum = 3
+        if quantum is not None and not _positivo(quantum):
+            raise ValueError("El quantum debe ser un número positivo")
+    else:
+        quantum = None
+    cpus = params.get('cpus', 4)
+    if algoritmo == 'smp' and (not isinstance(cpus, int) or cpus < 1):
+        raise ValueError("cpus debe ser un entero positivo")
+    return {
+        'algoritmo': algoritmo,
+        'quantum': quantum,
+        'cpus': cpus if algoritmo == 'smp' else None,
+        'balanceo': params.get('balanceo', 'global') if algoritmo == 'smp' else None,
+        'secuencia': bool(params.get('secuencia', False)),
+        'compactar': bool(params.get('compactar', False)) and algoritmo == 'rr',
+        'detalle': bool(params.get('detalle', False)),
+    }
+
+class ErrorRPC(Exception):
+    """Error JSON-RPC con su código: el servicio lo envía y Cliente lo levanta"""
+
+    def __init__(self, codigo, mensaje):
+        super().__init__(mensaje)
+        self.codigo = codigo
+
+class Servicio:
+    """Servidor asyncio con lotes para las solicitudes chicas y un pool para las grandes
+
+    procesos: tamaño del pool (por defecto, la cantidad de CPUs).
+    """
+
+    def __init__(self, procesos=None, lote_maximo=64, limite_lote=5000):
+        self.lote_maximo = lote_maximo
+        self.limite_lote = limite_lote
+        self.procesos = procesos or os.cpu_count() or 1
+        self.cargas = OrderedDict()
+        self.contadores = {'solicitudes': 0, 'errores': 0, 'lotes': 0, 'en_lote': 0, 'en_pool': 0}
+        self._pendientes = []
+        # Hay un lote corriendo en el hilo
+        self._ocupado = False
+        self._hilo = None
+        self._pool = None
+        self._servidor = None
+
+    async def iniciar(self, ruta=None, puerto=None, host='127.0.0.1'):
+        """Abrir el socket (Unix en `ruta` o TCP en host:puerto) y calentar el pool"""
+        loop = asyncio.get_running_loop()
+        self._hilo = ThreadPoolExecutor(max_workers=1, thread_name_prefix='lotes')
+        self._pool = ProcessPoolExecutor(max_workers=self.procesos)
+        await asyncio.gather(loop.run_in_executor(self._hilo, _calentar),
+                             *(loop.run_in_executor(self._pool, _calentar) for _ in range(self.procesos)))
+        if ruta is not None:
+            if os.path.exists(ruta):
+                os.unlink(ruta)
+            self._servidor = await asyncio.start_unix_server(self._conexion, path=ruta,
+                                                             limit=2**30)
+        else:
+            self._servidor = await asyncio.start_server(self._conexion, host, puerto, limit=2**30)
+        return self._servidor
+
+    async def cerrar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        if self._hilo is not None:
+            self._hilo.shutdown()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    async def _conexion(self, lector, escritor):
+        bloqueo = asyncio.Lock()
+        tareas = set()
+        try:
+            while linea := await lector.readline():
+                if not linea.strip():
+                    continue
+                # Cada solicitud en su tarea: las respuestas salen al terminar, no en orden
+                tarea = asyncio.create_task(self._responder(linea, escritor, bloqueo))
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+            if tareas:
+                await asyncio.gather(*tareas)
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, linea, escritor, bloqueo):
+        identificador = None
+        try:
+            try:
+                solicitud = json.loads(linea)
+            except ValueError:
+                raise ErrorRPC(ERROR_JSON, "JSON inválido") from None
+            if not isinstance(solicitud, dict) or not isinstance(solicitud.get('method'), str):
+                raise ErrorRPC(SOLICITUD_INVALIDA, "Se esperaba un objeto con 'method'")
+            identificador = solicitud.get('id')
+            params = solicitud.get('params', {})
+            if not isinstance(params, dict):
+                raise ErrorRPC(PARAMETROS_INVALIDOS, "params debe ser un objeto")
+            respuesta = {'jsonrpc': '2.0', 'id': identificador,
+                         'result': await self.atender(solicitud['method'], params)}
+        except ErrorRPC as error:
+            self.contadores['errores'] += 1
+            respuesta = {'jsonrpc': '2.0', 'id': identificador,
+                         'error': {'code': error.codigo, 'message': str(error)}}
+        except Exception as error:
+            self.contadores['errores'] += 1
+            respuesta = {'jsonrpc': '2.0', 'id': identificador,
+                         'error': {'code': ERROR_INTERNO, 'message': f"{type(error).__name__}: {error}"}}
+        async with bloqueo:
+            escritor.write(json.dumps(respuesta).encode('utf-8') + b'\n')
+            await escritor.drain()
+
+    async def atender(self, metodo, params):
+        """Resolver un método; los errores de parámetros se informan como ErrorRPC"""
+        self.contadores['solicitudes'] += 1
+        try:
+            if metodo == 'planificar':
+                return await self.planificar(params)
+            if metodo == 'registrar_carga':
+                return self.registrar_carga(params)
+            if metodo == 'estado':
+                return self.estado()
+        except ValueError as error:
+            raise ErrorRPC(PARAMETROS_INVALIDOS, str(error)) from None
+        raise ErrorRPC(METODO_DESCONOCIDO, f"Método desconocido: {metodo}")
+
+    def _carga(self, params):
+        if 'carga' in params:
+            tabla = self.cargas.get(params['carga'])
+            if tabla is None:
+                raise ValueError(f"Carga desconocida: {params['carga']}")
+            self.cargas.move_to_end(params['carga'])
+            return tabla
+        if 'procesos' not in params:
+            raise ValueError("Falta procesos o carga")
+        return leer_carga(params['procesos'])
+
+    def registrar_carga(self, params):
+        tabla = self._carga(params)
+        identificador = f"{tabla.huella & 0xFFFFFFFFFFFFFFFF:016x}-{len(tabla)}"
+        self.cargas[identificador] = tabla
+        self.cargas.move_to_end(identificador)
+        if len(self.cargas) > MAX_CARGAS:
+            self.cargas.popitem(last=False)
+        return {'carga': identificador, 'procesos': len(tabla)}
+
+    async def planificar(self, params):
+        tabla = self._carga(params)
+        peticion = leer_peticion(params)
+        loop = asyncio.get_running_loop()
+        if len(tabla) > self.limite_lote:
+            self.contadores['en_pool'] += 1
+            return await loop.run_in_executor(self._pool, ejecutar, tabla, peticion)
+
+        self.contadores['en_lote'] += 1
+        futuro = loop.create_future()
+        self._pendientes.append((tabla, peticion, futuro))
+        self._despachar_lote()
+        estado, valor = await futuro
+        if estado == 'error':
+            raise valor
+        return valor
+
+    def _despachar_lote(self):
+        """Enviar al hilo las solicitudes pendientes, si no hay otro lote corriendo"""
+        if self._ocupado or not self._pendientes:
+            return
+        lote = self._pendientes[:self.lote_maximo]
+        del self._pendientes[:self.lote_maximo]
+        self._ocupado = True
+        self.contadores['lotes'] += 1
+        loop = asyncio.get_running_loop()
+        tarea = loop.run_in_executor(self._hilo, ejecutar_lote,
+                                     [(tabla, peticion) for tabla, peticion, _ in lote])
+
+        def entregar(tarea):
+            self._ocupado = False
+            error = tarea.exception()
+            for posicion, (_, _, futuro) in enumerate(lote):
+                if futuro.done():
+                    continue
+                if error is not None:
+                    futuro.set_exception(error)
+                else:
+                    futuro.set_result(tarea.result()[posicion])
+            # Lo que llegó mientras tanto forma el lote siguiente
+            self._despachar_lote()
+
+        tarea.add_done_callback(entregar)
+
+    def estado(self):
+        return dict(self.contadores, cargas=len(self.cargas), procesos_pool=self.procesos,
+                    pid=os.getpid())
+
+class Cliente:
+    """Cliente bloqueante y mínimo para scripts: una solicitud a la vez
+
+    Para varias solicitudes en paralelo, abrir varios clientes o enviar
+    varias líneas por el mismo socket y emparejar las respuestas por id.
+    """
+
+    def __init__(self, ruta=None, puerto=None, host='127.0.0.1'):
+        if ruta is not None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(ruta)
+        else:
+            self._socket = socket.create_connection((host, puerto))
+        self._archivo = self._socket.makefile('rb')
+        self._siguiente = 0
+
+    def llamar(self, metodo, **params):
+        self._siguiente += 1
+        solicitud = {'jsonrpc': '2.0', 'id': self._siguiente, 'method': metodo, 'params': params}
+        self._socket.sendall(json.dumps(solicitud).encode('utf-8') + b'\n')
+        respuesta = json.loads(self._archivo.readline())
+        if 'error' in respuesta:
+            raise ErrorRPC(respuesta['error']['code'], respuesta['error']['message'])
+        return respuesta['result']
+
+    def cerrar(self):
+        self._archivo.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+async def servir(ruta=None, puerto=None, **opciones):
+    servicio = Servicio(**opciones)
+    servidor = await servicio.iniciar(ruta, puerto)
+    direccion = ruta if ruta is not None else f"127.0.0.1:{puerto}"
+    print(f"Servicio de planificación en {direccion} ({servicio.procesos} procesos en el pool)",
+          file=sys.stderr, flush=True)
+    # SIGTERM cierra el servidor como Ctrl+C: sin esto el proceso muere sin
+    # cerrar el pool y sus procesos quedan huérfanos
+    detenido = []
+
+    def detener():
+        detenido.append(True)
+        servidor.close()
+
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, detener)
+    except (NotImplementedError, AttributeError):
+        # Windows: no hay manejadores de señales en el loop
+        pass
+    try:
+        await servidor.serve_forever()
+    except asyncio.CancelledError:
+        if not detenido:
+            raise
+    finally:
+        await servicio.cerrar()
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Servicio local de planificación (JSON-RPC)")
+    destino = parser.add_mutually_exclusive_group()
+    destino.add_argument('--socket', default=None, help="ruta del socket Unix")
+    destino.add_argument('--puerto', type=int, help="puerto TCP en 127.0.0.1")
+    parser.add_argument('--procesos', type=int, default=None, help="procesos del pool para cargas grandes")
+    parser.add_argument('--lote-maximo', type=int, default=64)
+    parser.add_argument('--limite-lote', type=int, default=5000,
+                        help="procesos máximos de una carga que va en lote")
+    args = parser.parse_args(argumentos)
+    if args.socket is None and args.puerto is None:
+        args.socket = '/tmp/planificador.sock'
+    try:
+        asyncio.run(servir(args.socket, args.puerto, procesos=args.procesos,
+                           lote_maximo=args.lote_maximo,
+                           limite_lote=args.limite_lote))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,165 +1,236 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.patches as patches
-from collections import defaultdict
+from tkinter import ttk, filedialog, messagebox, scrolledtext
+from array import array
+import functools
+import queue
 import random
-import copy
+import re
+import sys
+import threading
+import unicodedata
+import numpy as np
 
-class Proceso:
-    def __init__(self, nombre, tiempo_llegada, duracion):
-        self.nombre = nombre
-        self.tiempo_llegada = tiempo_llegada
-        self.duracion = duracion
-        self.tiempo_restante = duracion
-        self.tiempo_inicio = 0
-        self.tiempo_finalizacion = 0
-        self.tiempo_espera = 0
-        self.tiempo_respuesta = -1
-    
-    def __str__(self):
-        return f"Proceso {self.nombre}: Llegada={self.tiempo_llegada}, Duración={self.duracion}"
+# El núcleo vive en planificador.py (sin tkinter ni matplotlib); se reexporta
+# para quienes importan los algoritmos desde simulador. matplotlib se carga
+# recién en el primer dibujar_gantt.
+from metricas import calcular_metricas
+from planificador import (CacheResultados, ControlEjecucion, EjecucionCancelada,
+                          PlanificadorProcesos, Proceso, ResultadoEjecucion, TablaProcesos,
+                          fifo_vectorizado)
 
-class PlanificadorProcesos:
-    def __init__(self):
-        self.procesos = []
-        self.quantum = 3
-        
-    def agregar_proceso(self, proceso):
-        self.procesos.append(proceso)
-    
-    def limpiar_procesos(self):
-        self.procesos = []
-    
-    def fifo(self):
-        """Algoritmo First In First Out"""
-        procesos = sorted(copy.deepcopy(self.procesos), key=lambda x: x.tiempo_llegada)
-        tiempo_actual = 0
-        secuencia = []
-        
-        for proceso in procesos:
-            if tiempo_actual < proceso.tiempo_llegada:
-                tiempo_actual = proceso.tiempo_llegada
-            
-            proceso.tiempo_inicio = tiempo_actual
-            proceso.tiempo_finalizacion = tiempo_actual + proceso.duracion
-            proceso.tiempo_espera = proceso.tiempo_inicio - proceso.tiempo_llegada
-            proceso.tiempo_respuesta = proceso.tiempo_espera
-            
-            secuencia.append({
-                'proceso': proceso.nombre,
-                'inicio': tiempo_actual,
-                'fin': proceso.tiempo_finalizacion
-            })
-            
-            tiempo_actual = proceso.tiempo_finalizacion
-        
-        return procesos, secuencia
-    
-    def sjf(self):
-        """Algoritmo Shortest Job First"""
-        procesos = copy.deepcopy(self.procesos)
-        tiempo_actual = 0
-        secuencia = []
-        completados = []
-        pendientes = []
-        
-        while len(completados) < len(procesos):
-            # Agregar procesos que han llegado
-            for proceso in procesos:
-                if (proceso.tiempo_llegada <= tiempo_actual and 
-                    proceso not in completados and 
-                    proceso not in pendientes):
-                    pendientes.append(proceso)
-            
-            if not pendientes:
-                # Si no hay procesos pendientes, avanzar al siguiente tiempo de llegada
-                siguiente_llegada = min([p.tiempo_llegada for p in procesos if p not in completados])
-                tiempo_actual = siguiente_llegada
-                continue
-            
-            # Seleccionar el proceso con menor duración
-            proceso_actual = min(pendientes, key=lambda x: x.duracion)
-            pendientes.remove(proceso_actual)
-            
-            proceso_actual.tiempo_inicio = tiempo_actual
-            proceso_actual.tiempo_finalizacion = tiempo_actual + proceso_actual.duracion
-            proceso_actual.tiempo_espera = proceso_actual.tiempo_inicio - proceso_actual.tiempo_llegada
-            proceso_actual.tiempo_respuesta = proceso_actual.tiempo_espera
-            
-            secuencia.append({
-                'proceso': proceso_actual.nombre,
-                'inicio': tiempo_actual,
-                'fin': proceso_actual.tiempo_finalizacion
-            })
-            
-            tiempo_actual = proceso_actual.tiempo_finalizacion
-            completados.append(proceso_actual)
-        
-        return completados, secuencia
-    
-    def round_robin(self):
-        """Algoritmo Round Robin"""
-        procesos = copy.deepcopy(self.procesos)
-        tiempo_actual = 0
-        secuencia = []
-        cola = []
-        completados = []
-        procesos_ordenados = sorted(procesos, key=lambda x: x.tiempo_llegada)
-        indice_proceso = 0
-        
-        while len(completados) < len(procesos):
-            # Agregar procesos que han llegado a la cola
-            while (indice_proceso < len(procesos_ordenados) and 
-                   procesos_ordenados[indice_proceso].tiempo_llegada <= tiempo_actual):
-                cola.append(procesos_ordenados[indice_proceso])
-                indice_proceso += 1
-            
-            if not cola:
-                # Si no hay procesos en cola, avanzar al siguiente tiempo de llegada
-                if indice_proceso < len(procesos_ordenados):
-                    tiempo_actual = procesos_ordenados[indice_proceso].tiempo_llegada
-                continue
-            
-            proceso_actual = cola.pop(0)
-            
-            # Establecer tiempo de respuesta si es la primera vez que se ejecuta
-            if proceso_actual.tiempo_respuesta == -1:
-                proceso_actual.tiempo_respuesta = tiempo_actual - proceso_actual.tiempo_llegada
-            
-            # Determinar tiempo de ejecución
-            tiempo_ejecucion = min(self.quantum, proceso_actual.tiempo_restante)
-            tiempo_inicio_segmento = tiempo_actual
-            tiempo_actual += tiempo_ejecucion
-            proceso_actual.tiempo_restante -= tiempo_ejecucion
-            
-            secuencia.append({
-                'proceso': proceso_actual.nombre,
-                'inicio': tiempo_inicio_segmento,
-                'fin': tiempo_actual
-            })
-            
-            # Agregar nuevos procesos que han llegado durante la ejecución
-            while (indice_proceso < len(procesos_ordenados) and 
-                   procesos_ordenados[indice_proceso].tiempo_llegada <= tiempo_actual):
-                cola.append(procesos_ordenados[indice_proceso])
-                indice_proceso += 1
-            
-            if proceso_actual.tiempo_restante > 0:
-                # El proceso no ha terminado, volver a la cola
-                cola.append(proceso_actual)
+class _ColumnaNombres:
+    """Columna perezosa con el nombre de cada fila (opcionalmente permutada)"""
+    
+    def __init__(self, tabla, orden=None):
+        self.tabla = tabla
+        self.orden = orden
+    
+    def __len__(self):
+        return len(self.tabla) if self.orden is None else len(self.orden)
+    
+    def __getitem__(self, k):
+        return self.tabla.nombre(k if self.orden is None else self.orden[k])
+
+class _ColumnaClave:
+    """Columna perezosa con una clave de cada segmento de la secuencia"""
+    
+    def __init__(self, secuencia, clave):
+        self.secuencia = secuencia
+        self.clave = clave
+    
+    def __len__(self):
+        return len(self.secuencia)
+    
+    def __getitem__(self, k):
+        return self.secuencia[k][self.clave]
+
+def _normalizar(texto):
+    """Minúsculas y sin acentos, para comparar nombres de columnas"""
+    return ''.join(c for c in unicodedata.normalize('NFD', texto.lower())
+                   if unicodedata.category(c) != 'Mn')
+
+class VistaVirtual:
+    """Treeview paginado: sólo existen como ítems las filas visibles
+    
+    Los datos son columnas (secuencias indexables del mismo largo, que
+    pueden crecer); al desplazarse se reemplazan los valores de los pocos
+    ítems visibles. Ordenar y filtrar trabajan sobre una permutación de
+    índices, sin tocar los datos.
+    """
+    
+    def __init__(self, padre, encabezados, alto=10, ancho=80):
+        self.frame = ttk.Frame(padre)
+        self.encabezados = encabezados
+        self.alto = alto
+        self.tree = ttk.Treeview(self.frame, columns=list(range(len(encabezados))),
+                                 show='headings', height=alto, selectmode='browse')
+        for columna, encabezado in enumerate(encabezados):
+            self.tree.heading(columna, text=encabezado,
+                              command=lambda c=columna: self.ordenar(c))
+            self.tree.column(columna, width=ancho, anchor=tk.W if columna == 0 else tk.E)
+        self.scroll = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._desplazar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        for evento in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(evento, self._rueda)
+        
+        self.columnas = []
+        self.indices = None
+        self.inicio = 0
+        self._items = []
+        self._orden_columna = None
+        self._filtro = None
+        # Filas de datos que ya cubre la permutación (las que se agreguen después no)
+        self._filas = 0
+    
+    def pack(self, **opciones):
+        self.frame.pack(**opciones)
+    
+    def set_datos(self, columnas):
+        """Mostrar nuevas columnas desde el principio, sin orden ni filtro"""
+        self.columnas = columnas
+        self.indices = None
+        self.inicio = 0
+        self._orden_columna = None
+        self._filtro = None
+        self._refrescar()
+    
+    def actualizar(self):
+        """Volver a leer el largo de las columnas (por ejemplo tras agregar filas)
+        
+        Si la vista estaba al final, sigue mostrando las últimas filas. Con
+        un orden o un filtro aplicados, las filas nuevas se suman a la
+        permutación y se vuelve a ordenar.
+        """
+        if self.indices is None:
+            if self.inicio + self.alto >= len(self) - 1:
+                self.inicio = max(0, len(self) - self.alto)
+        else:
+            total = len(self.columnas[0])
+            if total > self._filas:
+                nuevos = np.arange(self._filas, total, dtype=np.int64)
+                if self._filtro is not None:
+                    nuevos = self._coinciden(self._filtro, nuevos)
+                indices = np.concatenate([self.indices, nuevos])
+                if self._orden_columna is not None:
+                    columna, descendente = self._orden_columna
+                    indices = self._ordenados(indices, columna, descendente)
+                self.indices = indices
+                self._filas = total
+        self._refrescar()
+    
+    def __len__(self):
+        if self.indices is not None:
+            return len(self.indices)
+        return len(self.columnas[0]) if self.columnas else 0
+    
+    def _fila(self, k):
+        indice = k if self.indices is None else self.indices[k]
+        return [_formatear(columna[indice]) for columna in self.columnas]
+    
+    def _refrescar(self):
+        n = len(self)
+        self.inicio = max(0, min(self.inicio, n - self.alto))
+        visibles = range(self.inicio, min(n, self.inicio + self.alto))
+        while len(self._items) > len(visibles):
+            self.tree.delete(self._items.pop())
+        for posicion, k in enumerate(visibles):
+            if posicion < len(self._items):
+                self.tree.item(self._items[posicion], values=self._fila(k))
             else:
-                # El proceso ha terminado
-                proceso_actual.tiempo_finalizacion = tiempo_actual
-                proceso_actual.tiempo_espera = (proceso_actual.tiempo_finalizacion - 
-                                               proceso_actual.tiempo_llegada - 
-                                               proceso_actual.duracion)
-                completados.append(proceso_actual)
-        
-        return completados, secuencia
+                self._items.append(self.tree.insert('', tk.END, values=self._fila(k)))
+        if n:
+            self.scroll.set(self.inicio / n, min(1.0, (self.inicio + self.alto) / n))
+        else:
+            self.scroll.set(0.0, 1.0)
+    
+    def _desplazar(self, accion, cantidad, unidad=None):
+        if accion == 'moveto':
+            self.inicio = int(float(cantidad) * len(self))
+        elif accion == 'scroll':
+            paso = self.alto if unidad == 'pages' else 1
+            self.inicio += int(cantidad) * paso
+        self._refrescar()
+    
+    def _rueda(self, evento):
+        if evento.num == 4 or getattr(evento, 'delta', 0) > 0:
+            self._desplazar('scroll', -3)
+        else:
+            self._desplazar('scroll', 3)
+        return 'break'
+    
+    def _indices_actuales(self):
+        if self.indices is not None:
+            return self.indices
+        return np.arange(len(self))
+    
+    def ordenar(self, columna):
+        """Ordenar por una columna; un segundo clic invierte el orden"""
+        if not self.columnas:
+            return
+        descendente = self._orden_columna == (columna, False)
+        if self.indices is None:
+            self._filas = len(self.columnas[0])
+        self.indices = self._ordenados(self._indices_actuales(), columna, descendente)
+        self._orden_columna = (columna, descendente)
+        self.inicio = 0
+        self._refrescar()
+    
+    def _ordenados(self, indices, columna, descendente):
+        datos = self.columnas[columna]
+        if isinstance(datos, (array, np.ndarray)):
+            valores = np.array(datos)[:len(self.columnas[0])]
+            indices = indices[np.argsort(valores[indices], kind='stable')]
+        else:
+            indices = np.array(sorted(indices.tolist(), key=datos.__getitem__), dtype=np.int64)
+        return indices[::-1] if descendente else indices
+    
+    def filtrar(self, texto):
+        """Filtrar filas
+        
+        'columna op valor' (por ejemplo 'espera > 10', op en <, <=, >, >=, =)
+        compara una columna numérica; cualquier otro texto filtra por
+        coincidencia en la primera columna. Un texto vacío quita el filtro.
+        """
+        texto = texto.strip()
+        self._orden_columna = None
+        self.inicio = 0
+        if not texto or not self.columnas:
+            self.indices = None
+            self._filtro = None
+            self._refrescar()
+            return
+        
+        self._filas = len(self.columnas[0])
+        self.indices = self._coinciden(texto, np.arange(self._filas, dtype=np.int64))
+        self._filtro = texto
+        self._refrescar()
+    
+    def _coinciden(self, texto, indices):
+        """Los índices de `indices` cuyas filas pasan el filtro `texto`"""
+        condicion = re.fullmatch(r'(\w+)\s*(<=|>=|<|>|=)\s*(-?[\d.]+)', _normalizar(texto))
+        nombres = [_normalizar(e) for e in self.encabezados]
+        if condicion and condicion.group(1) in nombres:
+            columna = self.columnas[nombres.index(condicion.group(1))]
+            valores = np.array(columna)[:len(self.columnas[0])]
+            operacion = {'<': np.less, '<=': np.less_equal, '>': np.greater,
+                         '>=': np.greater_equal, '=': np.equal}[condicion.group(2)]
+            return indices[operacion(valores[indices], float(condicion.group(3)))]
+        primera = self.columnas[0]
+        return np.array([k for k in indices.tolist() if texto in str(primera[k])], dtype=np.int64)
+
+def _formatear(valor):
+    """Texto de una celda: los flotantes con dos decimales"""
+    if isinstance(valor, (float, np.floating)) and valor != int(valor):
+        return f"{valor:.2f}"
+    return valor
 
 class InterfazSimulador:
+    # Barras dibujadas como máximo en el Gantt, sin importar el tamaño de la traza
+    MAX_BARRAS_GANTT = 4000
+    # Cada cuánto se revisa el progreso de la simulación en segundo plano
+    INTERVALO_PROGRESO_MS = 100
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Simulador de Planificador de Procesos - Jesús Adrián Salas Estrada - Sistemas Operativos")
@@ -168,6 +239,10 @@ class InterfazSimulador:
         
         self.planificador = PlanificadorProcesos()
         self.colores_procesos = {}
+        # Simulación en segundo plano: (hilo, control, cola de resultado, al_terminar)
+        self._simulacion = None
+        # Última ejecución mostrada, para guardarla como traza
+        self._ultima_ejecucion = None
         
         self.crear_interfaz()
         self.cargar_ejemplo()
@@ -215,23 +290,23 @@ class InterfazSimulador:
         botones_frame = ttk.Frame(entrada_frame)
         botones_frame.grid(row=4, column=0, columnspan=2, pady=10)
         
-        ttk.Button(botones_frame, text="Agregar Proceso", 
-                  command=self.agregar_proceso).pack(side=tk.LEFT, padx=5)
-        ttk.Button(botones_frame, text="Limpiar Todo", 
-                  command=self.limpiar_todo).pack(side=tk.LEFT, padx=5)
-        ttk.Button(botones_frame, text="Cargar Ejemplo", 
-                  command=self.cargar_ejemplo).pack(side=tk.LEFT, padx=5)
+        # Botones que se deshabilitan mientras corre una simulación
+        self.botones_accion = []
+        
+        for texto, comando in (("Agregar Proceso", self.agregar_proceso),
+                               ("Limpiar Todo", self.limpiar_todo),
+                               ("Cargar Ejemplo", self.cargar_ejemplo)):
+            boton = ttk.Button(botones_frame, text=texto, command=comando)
+            boton.pack(side=tk.LEFT, padx=5)
+            self.botones_accion.append(boton)
         
         # Lista de procesos
         lista_frame = ttk.LabelFrame(entrada_frame, text="Procesos Ingresados", padding="5")
         lista_frame.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
         
-        self.lista_procesos = tk.Listbox(lista_frame, height=6)
-        scrollbar = ttk.Scrollbar(lista_frame, orient=tk.VERTICAL, command=self.lista_procesos.yview)
-        self.lista_procesos.configure(yscrollcommand=scrollbar.set)
-        
-        self.lista_procesos.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.lista_procesos = VistaVirtual(lista_frame, ["Nombre", "Llegada", "Duración"],
+                                           alto=6, ancho=90)
+        self.lista_procesos.pack(fill=tk.BOTH, expand=True)
         
         # Frame de control y resultados
         control_frame = ttk.LabelFrame(main_frame, text="Control y Algoritmos", padding="10")
@@ -241,26 +316,92 @@ class InterfazSimulador:
         algoritmos_frame = ttk.Frame(control_frame)
         algoritmos_frame.pack(fill=tk.X, pady=5)
         
-        ttk.Button(algoritmos_frame, text="Ejecutar FIFO", 
-                  command=lambda: self.ejecutar_algoritmo('FIFO')).pack(side=tk.LEFT, padx=5)
-        ttk.Button(algoritmos_frame, text="Ejecutar SJF", 
-                  command=lambda: self.ejecutar_algoritmo('SJF')).pack(side=tk.LEFT, padx=5)
-        ttk.Button(algoritmos_frame, text="Ejecutar Round Robin", 
-                  command=lambda: self.ejecutar_algoritmo('RR')).pack(side=tk.LEFT, padx=5)
-        ttk.Button(algoritmos_frame, text="Comparar Todos", 
-                  command=self.comparar_algoritmos).pack(side=tk.LEFT, padx=5)
-        
-        # Área de resultados
-        self.resultado_text = scrolledtext.ScrolledText(control_frame, height=15, width=50)
-        self.resultado_text.pack(fill=tk.BOTH, expand=True, pady=10)
+        for texto, comando in (("Ejecutar FIFO", lambda: self.ejecutar_algoritmo('FIFO')),
+                               ("Ejecutar SJF", lambda: self.ejecutar_algoritmo('SJF')),
+                               ("Ejecutar Round Robin", lambda: self.ejecutar_algoritmo('RR')),
+                               ("Ejecutar SRTF", lambda: self.ejecutar_algoritmo('SRTF')),
+                               ("Ejecutar MLFQ", lambda: self.ejecutar_algoritmo('MLFQ')),
+                               ("Comparar Todos", self.comparar_algoritmos)):
+            boton = ttk.Button(algoritmos_frame, text=texto, command=comando)
+            boton.pack(side=tk.LEFT, padx=5)
+            self.botones_accion.append(boton)
+        
+        # Varias CPUs: cantidad y balanceo (usa el quantum de Round Robin)
+        smp_frame = ttk.Frame(control_frame)
+        smp_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(smp_frame, text="CPUs:").pack(side=tk.LEFT, padx=5)
+        self.cpus_entry = ttk.Entry(smp_frame, width=5)
+        self.cpus_entry.insert(0, "4")
+        self.cpus_entry.pack(side=tk.LEFT)
+        ttk.Label(smp_frame, text="Balanceo:").pack(side=tk.LEFT, padx=5)
+        self.balanceo_combo = ttk.Combobox(smp_frame, values=('global', 'robo', 'afinidad'),
+                                           width=10, state='readonly')
+        self.balanceo_combo.set('global')
+        self.balanceo_combo.pack(side=tk.LEFT)
+        boton = ttk.Button(smp_frame, text="Ejecutar Multi-CPU", command=self.ejecutar_multiprocesador)
+        boton.pack(side=tk.LEFT, padx=5)
+        self.botones_accion.append(boton)
+        
+        # Trazas binarias (trazas.py): guardar la última ejecución o abrir una
+        trazas_frame = ttk.Frame(control_frame)
+        trazas_frame.pack(fill=tk.X, pady=5)
+        for texto, comando in (("Guardar Traza", self.guardar_traza),
+                               ("Abrir Traza", self.abrir_traza)):
+            boton = ttk.Button(trazas_frame, text=texto, command=comando)
+            boton.pack(side=tk.LEFT, padx=5)
+            self.botones_accion.append(boton)
+        
+        # Progreso de la simulación en curso
+        progreso_frame = ttk.Frame(control_frame)
+        progreso_frame.pack(fill=tk.X, pady=5)
+        
+        self.progreso_barra = ttk.Progressbar(progreso_frame, mode='determinate', maximum=1.0)
+        self.progreso_barra.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.cancelar_boton = ttk.Button(progreso_frame, text="Cancelar", state=tk.DISABLED,
+                                         command=self.cancelar_simulacion)
+        self.cancelar_boton.pack(side=tk.LEFT, padx=5)
+        self.progreso_label = ttk.Label(control_frame, text="")
+        self.progreso_label.pack(fill=tk.X, padx=5)
+        
+        # Área de resultados: resumen arriba, tablas paginadas abajo
+        self.resultado_text = scrolledtext.ScrolledText(control_frame, height=7, width=50)
+        self.resultado_text.pack(fill=tk.X, pady=(10, 5))
+        
+        filtro_frame = ttk.Frame(control_frame)
+        filtro_frame.pack(fill=tk.X)
+        ttk.Label(filtro_frame, text="Filtro (ej. espera > 10 o P1):").pack(side=tk.LEFT, padx=5)
+        self.filtro_entry = ttk.Entry(filtro_frame, width=25)
+        self.filtro_entry.pack(side=tk.LEFT, padx=5)
+        self.filtro_entry.bind('<Return>', lambda evento: self.filtrar_metricas())
+        ttk.Button(filtro_frame, text="Filtrar", 
+                  command=self.filtrar_metricas).pack(side=tk.LEFT, padx=5)
+        
+        resultados_notebook = ttk.Notebook(control_frame)
+        resultados_notebook.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.vista_metricas = VistaVirtual(resultados_notebook, 
+            ["Proceso", "Llegada", "Duración", "Finalización", "Espera", "Respuesta"], alto=8)
+        self.vista_secuencia = VistaVirtual(resultados_notebook, ["Proceso", "Inicio", "Fin"], alto=8)
+        resultados_notebook.add(self.vista_metricas.frame, text="Métricas por proceso")
+        resultados_notebook.add(self.vista_secuencia.frame, text="Secuencia de ejecución")
         
         # Frame para gráficos
         grafico_frame = ttk.LabelFrame(main_frame, text="Diagrama de Gantt", padding="10")
         grafico_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
         
-        # Canvas para matplotlib
+        # El canvas de matplotlib se crea en el primer dibujar_gantt
+        self._grafico_frame = grafico_frame
+        self.fig = self.ax = self.canvas = None
+        self._gantt = None
+    
+    def _crear_grafico(self):
+        """Importar matplotlib y armar la figura con su barra de zoom (una sola vez)"""
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        
         self.fig, self.ax = plt.subplots(figsize=(12, 6))
-        self.canvas = FigureCanvasTkAgg(self.fig, grafico_frame)
+        self.canvas = FigureCanvasTkAgg(self.fig, self._grafico_frame)
+        # Barra de zoom y desplazamiento
+        NavigationToolbar2Tk(self.canvas, self._grafico_frame).update()
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
     
     def agregar_proceso(self):
@@ -298,10 +439,15 @@ class InterfazSimulador:
     def limpiar_todo(self):
         self.planificador.limpiar_procesos()
         self.colores_procesos.clear()
+        self._ultima_ejecucion = None
         self.actualizar_lista_procesos()
         self.resultado_text.delete(1.0, tk.END)
-        self.ax.clear()
-        self.canvas.draw()
+        self.vista_metricas.set_datos([])
+        self.vista_secuencia.set_datos([])
+        self._gantt = None
+        if self.ax is not None:
+            self.ax.clear()
+            self.canvas.draw()
     
     def cargar_ejemplo(self):
         """Cargar procesos de ejemplo para demostración"""
@@ -322,10 +468,13 @@ class InterfazSimulador:
         self.actualizar_lista_procesos()
     
     def actualizar_lista_procesos(self):
-        self.lista_procesos.delete(0, tk.END)
-        for proceso in self.planificador.procesos:
-            self.lista_procesos.insert(tk.END, 
-                f"{proceso.nombre}: Llegada={proceso.tiempo_llegada}, Duración={proceso.duracion}")
+        # Las columnas son los arrays de la tabla: agregar un proceso sólo
+        # cambia su largo, y la vista repinta las filas visibles
+        tabla = self.planificador.procesos
+        if self.lista_procesos.columnas and self.lista_procesos.columnas[1] is tabla.llegadas:
+            self.lista_procesos.actualizar()
+        else:
+            self.lista_procesos.set_datos([_ColumnaNombres(tabla), tabla.llegadas, tabla.duraciones])
     
     def ejecutar_algoritmo(self, algoritmo):
         if not self.planificador.procesos:
@@ -338,105 +487,397 @@ class InterfazSimulador:
             self.planificador.quantum = 3
         
         if algoritmo == 'FIFO':
-            procesos, secuencia = self.planificador.fifo()
+            metodo = self.planificador.fifo
             titulo = "First In First Out (FIFO)"
         elif algoritmo == 'SJF':
-            procesos, secuencia = self.planificador.sjf()
+            metodo = self.planificador.sjf
             titulo = "Shortest Job First (SJF)"
         elif algoritmo == 'RR':
-            procesos, secuencia = self.planificador.round_robin()
+            metodo = self.planificador.round_robin
             titulo = "Round Robin"
+        elif algoritmo == 'SRTF':
+            metodo = self.planificador.srtf
+            titulo = "Shortest Remaining Time First (SRTF)"
+        elif algoritmo == 'MLFQ':
+            # Quantums crecientes a partir del ingresado: q, 2q, 4q
+            quantum = self.planificador.quantum
+            metodo = functools.partial(self.planificador.mlfq, (quantum, 2 * quantum, 4 * quantum))
+            titulo = "Multi-Level Feedback Queue (MLFQ)"
+        
+        n_procesos = len(self.planificador.procesos)
+        
+        def trabajo(control):
+            control.iniciar_fase(titulo, n_procesos)
+            return metodo()
+        
+        def al_terminar(resultado):
+            procesos, secuencia = resultado
+            self.mostrar_resultados(procesos, secuencia, titulo)
+            self.dibujar_gantt(secuencia, titulo)
+            self._ultima_ejecucion = (procesos, secuencia, titulo, algoritmo,
+                                      self.planificador.quantum, {})
+        
+        self.iniciar_simulacion(trabajo, al_terminar)
+    
+    def ejecutar_multiprocesador(self):
+        if not self.planificador.procesos:
+            messagebox.showwarning("Advertencia", "No hay procesos para planificar")
+            return
         
-        self.mostrar_resultados(procesos, secuencia, titulo)
-        self.dibujar_gantt(secuencia, titulo)
+        try:
+            cpus = int(self.cpus_entry.get())
+            if cpus < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "La cantidad de CPUs debe ser un entero positivo")
+            return
+        try:
+            quantum = int(self.quantum_entry.get())
+        except ValueError:
+            quantum = 3
+        balanceo = self.balanceo_combo.get()
+        titulo = f"Round Robin en {cpus} CPUs ({balanceo})"
+        n_procesos = len(self.planificador.procesos)
+        
+        def trabajo(control):
+            control.iniciar_fase(titulo, n_procesos)
+            return self.planificador.multiprocesador(cpus, balanceo, quantum)
+        
+        def al_terminar(resultado):
+            procesos, secuencia, resumen = resultado
+            # El resumen ya trae las métricas de metricas.py, calculadas con todas las CPUs
+            self.mostrar_resultados(procesos, secuencia, titulo, resumen)
+            texto = f"\nCPUs: {resumen['cpus']}    Migraciones: {resumen['migraciones']}\n"
+            texto += "Utilización por CPU:\n"
+            for cpu, utilizacion in enumerate(resumen['utilizacion_por_cpu']):
+                texto += f"  CPU {cpu}: {utilizacion:.1%}\n"
+            self.resultado_text.insert(tk.END, texto)
+            self.dibujar_gantt(secuencia, titulo, por_cpu=True)
+            self._ultima_ejecucion = (procesos, secuencia, titulo, 'SMP', quantum,
+                                      {'cpus': cpus, 'balanceo': balanceo, 'por_cpu': True})
+        
+        self.iniciar_simulacion(trabajo, al_terminar)
     
-    def mostrar_resultados(self, procesos, secuencia, algoritmo):
-        self.resultado_text.delete(1.0, tk.END)
+    def guardar_traza(self):
+        if self._ultima_ejecucion is None:
+            messagebox.showwarning("Advertencia", "No hay una ejecución para guardar")
+            return
+        ruta = filedialog.asksaveasfilename(defaultextension='.traza',
+                                            filetypes=[("Trazas", "*.traza")])
+        if not ruta:
+            return
+        from trazas import guardar_traza
+        procesos, secuencia, titulo, algoritmo, quantum, metadatos = self._ultima_ejecucion
+        try:
+            guardar_traza(ruta, procesos.tabla, procesos, secuencia, algoritmo=algoritmo,
+                          quantum=quantum, titulo=titulo, **metadatos)
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Error", f"No se pudo guardar la traza: {error}")
+    
+    def abrir_traza(self):
+        """Mostrar una traza guardada sin volver a simular; su carga reemplaza a la actual"""
+        ruta = filedialog.askopenfilename(filetypes=[("Trazas", "*.traza"), ("Todos", "*")])
+        if not ruta:
+            return
+        from trazas import cargar_traza
+        try:
+            traza = cargar_traza(ruta)
+            procesos = traza.resultado()
+            secuencia = traza.secuencia()
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Error", f"No se pudo abrir la traza: {error}")
+            return
+        metadatos = dict(traza.encabezado['metadatos'])
+        titulo = metadatos.pop('titulo', None) or str(traza.algoritmo)
         
-        resultado = f"=== RESULTADOS DEL ALGORITMO {algoritmo} ===\n\n"
+        self.limpiar_todo()
+        self.planificador.procesos = procesos.tabla
+        if traza.quantum is not None:
+            self.planificador.quantum = traza.quantum
+        self.actualizar_lista_procesos()
+        self.mostrar_resultados(procesos, secuencia, titulo,
+                                calcular_metricas(procesos, secuencia, metadatos.get('cpus', 1)))
+        self.dibujar_gantt(secuencia, titulo, por_cpu=metadatos.get('por_cpu', False))
+        self._ultima_ejecucion = (procesos, secuencia, titulo, traza.algoritmo, traza.quantum, metadatos)
+    
+    def iniciar_simulacion(self, trabajo, al_terminar):
+        """Ejecutar trabajo(control) en un hilo y entregar su resultado a al_terminar
         
-        if algoritmo == "Round Robin":
-            resultado += f"Quantum utilizado: {self.planificador.quantum}\n\n"
+        El hilo sólo calcula; el progreso se lee desde el hilo de Tk con
+        root.after, y al_terminar también corre en el hilo de Tk.
+        """
+        if self._simulacion is not None:
+            return
         
-        resultado += "SECUENCIA DE EJECUCIÓN:\n"
-        for seg in secuencia:
-            resultado += f"{seg['proceso']}: {seg['inicio']} -> {seg['fin']}\n"
+        control = ControlEjecucion()
+        self.planificador.control = control
+        resultado = queue.Queue(maxsize=1)
+        
+        def ejecutar():
+            try:
+                resultado.put(('ok', trabajo(control)))
+            except EjecucionCancelada:
+                resultado.put(('cancelada', None))
+            except Exception as error:
+                resultado.put(('error', error))
+        
+        hilo = threading.Thread(target=ejecutar, daemon=True)
+        self._simulacion = (hilo, control, resultado, al_terminar)
+        for boton in self.botones_accion:
+            boton.configure(state=tk.DISABLED)
+        self.cancelar_boton.configure(state=tk.NORMAL)
+        hilo.start()
+        self.root.after(self.INTERVALO_PROGRESO_MS, self._revisar_simulacion)
+    
+    def _revisar_simulacion(self):
+        hilo, control, resultado, al_terminar = self._simulacion
+        if control.total:
+            self.progreso_barra['value'] = min(1.0, control.completados / control.total)
+        self.progreso_label.configure(
+            text=f"{control.fase}: tiempo simulado {control.tiempo_simulado}, "
+                 f"{control.completados}/{control.total} procesos completados")
         
-        resultado += "\nMÉTRICAS POR PROCESO:\n"
-        resultado += f"{'Proceso':<10} {'Llegada':<8} {'Duración':<9} {'Finalización':<12} {'Espera':<8} {'Respuesta':<10}\n"
-        resultado += "-" * 70 + "\n"
+        try:
+            estado, valor = resultado.get_nowait()
+        except queue.Empty:
+            self.root.after(self.INTERVALO_PROGRESO_MS, self._revisar_simulacion)
+            return
         
-        tiempo_total_espera = 0
-        tiempo_total_respuesta = 0
+        self._simulacion = None
+        self.planificador.control = None
+        for boton in self.botones_accion:
+            boton.configure(state=tk.NORMAL)
+        self.cancelar_boton.configure(state=tk.DISABLED)
+        self.progreso_barra['value'] = 0
+        
+        if estado == 'ok':
+            self.progreso_label.configure(text="")
+            al_terminar(valor)
+        elif estado == 'cancelada':
+            self.progreso_label.configure(text="Simulación cancelada")
+        else:
+            self.progreso_label.configure(text="")
+            messagebox.showerror("Error", f"La simulación falló: {valor}")
+    
+    def cancelar_simulacion(self):
+        if self._simulacion is not None:
+            self._simulacion[1].cancelar()
+    
+    def mostrar_resultados(self, procesos, secuencia, algoritmo, metricas=None):
+        """Mostrar el resumen y las tablas; metricas: de calcular_metricas, si ya se calcularon"""
+        self.resultado_text.delete(1.0, tk.END)
         
-        for proceso in procesos:
-            tiempo_total_espera += proceso.tiempo_espera
-            tiempo_total_respuesta += proceso.tiempo_respuesta
-            resultado += f"{proceso.nombre:<10} {proceso.tiempo_llegada:<8} {proceso.duracion:<9} {proceso.tiempo_finalizacion:<12} {proceso.tiempo_espera:<8} {proceso.tiempo_respuesta:<10}\n"
+        # El resumen se calcula aparte (en una pasada con NumPy) y se muestra antes que las tablas
+        tabla = procesos.tabla
+        if metricas is None:
+            metricas = calcular_metricas(procesos, secuencia)
         
-        # Calcular promedios
-        n_procesos = len(procesos)
-        tiempo_promedio_espera = tiempo_total_espera / n_procesos
-        tiempo_promedio_respuesta = tiempo_total_respuesta / n_procesos
+        resultado = f"=== RESULTADOS DEL ALGORITMO {algoritmo} ===\n\n"
         
-        resultado += f"\nRESUMEN:\n"
-        resultado += f"Tiempo promedio de espera: {tiempo_promedio_espera:.2f}\n"
-        resultado += f"Tiempo promedio de respuesta: {tiempo_promedio_respuesta:.2f}\n"
-        resultado += f"Tiempo total de finalización: {max(seg['fin'] for seg in secuencia)}\n"
+        if algoritmo == "Round Robin":
+            resultado += f"Quantum utilizado: {self.planificador.quantum}\n\n"
+        
+        resultado += f"RESUMEN:\n"
+        resultado += f"Procesos: {metricas['procesos']}    Segmentos: {metricas['segmentos']}    "
+        resultado += f"Cambios de contexto: {metricas['cambios_contexto']}\n"
+        for nombre in ('espera', 'respuesta', 'retorno'):
+            resultado += f"Tiempo promedio de {nombre}: {metricas[f'{nombre}_promedio']:.2f}    "
+            resultado += f"p50/p95/p99: {metricas[f'{nombre}_p50']:.2f} / {metricas[f'{nombre}_p95']:.2f} / "
+            resultado += f"{metricas[f'{nombre}_p99']:.2f}\n"
+        resultado += f"Tiempo total de finalización: {metricas['tiempo_total']}\n"
+        resultado += f"Throughput: {metricas['throughput']:.3f} procesos por unidad de tiempo\n"
+        resultado += f"Utilización de CPU: {metricas['utilizacion']:.1%}    "
+        resultado += f"Tiempo ocioso: {_formatear(metricas['tiempo_ocioso'])}\n"
         
         self.resultado_text.insert(tk.END, resultado)
+        
+        # Métricas por proceso y secuencia: sólo se arman las filas visibles
+        orden = np.array(procesos.orden, dtype=np.int64)
+        self.vista_metricas.set_datos([
+            _ColumnaNombres(tabla, orden),
+            np.array(tabla.llegadas)[orden],
+            np.array(tabla.duraciones)[orden],
+            np.array(procesos.finalizacion)[orden],
+            np.array(procesos.espera)[orden],
+            np.array(procesos.respuesta)[orden],
+        ])
+        self.vista_secuencia.set_datos([_ColumnaClave(secuencia, 'proceso'),
+                                        _ColumnaClave(secuencia, 'inicio'),
+                                        _ColumnaClave(secuencia, 'fin')])
+    
+    def filtrar_metricas(self):
+        self.vista_metricas.filtrar(self.filtro_entry.get())
     
-    def dibujar_gantt(self, secuencia, titulo):
+    def dibujar_gantt(self, secuencia, titulo, por_cpu=False):
+        """Dibujar el diagrama de Gantt
+        
+        Todas las barras van en una sola PolyCollection. Los segmentos se
+        guardan en arrays ordenados por (fila, inicio) y _actualizar_gantt
+        arma las barras visibles cada vez que cambian los límites (zoom o
+        desplazamiento), uniendo los segmentos que no alcanzan a ocupar
+        unos píxeles. Las etiquetas sólo se muestran donde caben.
+        
+        Con por_cpu, cada fila es una CPU (clave 'cpu' de los segmentos) y
+        el color de cada barra identifica al proceso.
+        """
+        if self.ax is None:
+            self._crear_grafico()
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection, PolyCollection
+        from matplotlib.colors import to_rgba_array
+        from matplotlib.ticker import FuncFormatter, MaxNLocator
+        
         self.ax.clear()
+        self._gantt = None
         self.ax.set_title(f"Diagrama de Gantt - {titulo}", fontsize=14, fontweight='bold')
         self.ax.set_xlabel("Tiempo")
-        self.ax.set_ylabel("Procesos")
-        
-        # Obtener lista única de procesos
-        procesos_unicos = list(set(seg['proceso'] for seg in secuencia))
-        procesos_unicos.sort()
+        self.ax.set_ylabel("CPUs" if por_cpu else "Procesos")
+        if not secuencia:
+            self.canvas.draw()
+            return
         
-        # Dibujar barras para cada segmento
-        for i, seg in enumerate(secuencia):
-            proceso = seg['proceso']
-            inicio = seg['inicio']
-            duracion = seg['fin'] - seg['inicio']
-            
-            # Encontrar posición Y del proceso
-            y_pos = procesos_unicos.index(proceso)
-            
-            # Obtener color del proceso
-            color = self.colores_procesos.get(proceso, '#3498db')
-            
-            # Dibujar rectángulo
-            rect = patches.Rectangle((inicio, y_pos), duracion, 0.8, 
-                                   linewidth=1, edgecolor='black', 
-                                   facecolor=color, alpha=0.8)
-            self.ax.add_patch(rect)
-            
-            # Agregar texto con el nombre del proceso
-            self.ax.text(inicio + duracion/2, y_pos + 0.4, proceso, 
-                        ha='center', va='center', fontweight='bold', fontsize=9)
+        # Las trazas guardadas (trazas.SecuenciaTraza) ya traen las columnas
+        columnas = getattr(secuencia, 'columnas', None)
+        if columnas is not None:
+            procesos_unicos, claves, cpus, inicios, fines = columnas()
+        else:
+            # Obtener lista única de procesos y su índice, una sola vez
+            nombres = [seg['proceso'] for seg in secuencia]
+            procesos_unicos = sorted(set(nombres))
+            clave_de = {nombre: clave for clave, nombre in enumerate(procesos_unicos)}
             
-            # Agregar tiempo en la parte inferior
-            self.ax.text(inicio + duracion/2, y_pos + 0.1, f"{duracion}", 
-                        ha='center', va='center', fontsize=8)
+            claves = np.fromiter((clave_de[nombre] for nombre in nombres), dtype=np.int64,
+                                 count=len(nombres))
+            cpus = (np.fromiter((seg['cpu'] for seg in secuencia), dtype=np.int64, count=len(nombres))
+                    if por_cpu else None)
+            inicios = np.fromiter((seg['inicio'] for seg in secuencia), dtype=np.float64, count=len(nombres))
+            fines = np.fromiter((seg['fin'] for seg in secuencia), dtype=np.float64, count=len(nombres))
+        if por_cpu:
+            filas = cpus
+            etiquetas = [f"CPU {cpu}" for cpu in range(int(filas.max()) + 1)]
+        else:
+            filas = claves
+            etiquetas = procesos_unicos
+        orden = np.lexsort((inicios, filas))
+        colores = to_rgba_array([self.colores_procesos.get(nombre, '#3498db')
+                                 for nombre in procesos_unicos], alpha=0.8)
+        
+        self._gantt = {
+            'procesos': procesos_unicos,
+            'filas': filas[orden],
+            'claves': claves[orden],
+            'inicios': inicios[orden],
+            'fines': fines[orden],
+            'colores': colores,
+            'barras': PolyCollection([], edgecolors='black'),
+            'textos': [],
+        }
+        self.ax.add_collection(self._gantt['barras'])
         
         # Configurar ejes
-        self.ax.set_yticks(range(len(procesos_unicos)))
-        self.ax.set_yticklabels(procesos_unicos)
-        self.ax.set_xlim(0, max(seg['fin'] for seg in secuencia))
-        self.ax.set_ylim(-0.5, len(procesos_unicos) - 0.5)
-        
-        # Agregar líneas de tiempo
-        tiempo_max = max(seg['fin'] for seg in secuencia)
-        for t in range(0, tiempo_max + 1):
-            self.ax.axvline(x=t, color='gray', linestyle='--', alpha=0.3)
-        
+        if len(etiquetas) <= 40:
+            self.ax.set_yticks(range(len(etiquetas)))
+            self.ax.set_yticklabels(etiquetas)
+        else:
+            self.ax.yaxis.set_major_locator(MaxNLocator(nbins=20, integer=True))
+            self.ax.yaxis.set_major_formatter(FuncFormatter(
+                lambda y, _: etiquetas[int(y)] if 0 <= y < len(etiquetas) else ''))
+        tiempo_max = self._gantt['fines'].max()
+        self.ax.set_xlim(0, tiempo_max)
+        self.ax.set_ylim(-0.5, len(etiquetas) - 0.5)
+        
+        # Líneas de tiempo: una sola colección con a lo sumo ~50 líneas en
+        # pasos enteros, recalculadas junto con las barras
+        self._gantt['lineas'] = LineCollection([], colors='gray', linestyles='--', alpha=0.3,
+                                               transform=self.ax.get_xaxis_transform())
+        self.ax.add_collection(self._gantt['lineas'])
         self.ax.grid(True, alpha=0.3)
         plt.tight_layout()
+        
+        self._actualizar_gantt()
+        self.ax.callbacks.connect('xlim_changed', self._actualizar_gantt)
+        self.ax.callbacks.connect('ylim_changed', self._actualizar_gantt)
         self.canvas.draw()
     
+    def _actualizar_gantt(self, ax=None):
+        """Rearmar las barras y etiquetas visibles con el nivel de detalle de la vista"""
+        gantt = self._gantt
+        if gantt is None:
+            return
+        from matplotlib.ticker import MaxNLocator
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        unidad_px = max(x1 - x0, 1e-12) / max(self.ax.bbox.width, 1.0)
+        
+        filas, claves = gantt['filas'], gantt['claves']
+        inicios, fines = gantt['inicios'], gantt['fines']
+        visibles = (fines >= x0) & (inicios <= x1) & (filas >= y0 - 1) & (filas <= y1)
+        filas_por_px = (y1 - y0) / max(self.ax.bbox.height, 1.0)
+        if filas_por_px > 1:
+            # Más filas que píxeles: se dibuja una de cada `paso`
+            visibles &= filas % int(np.ceil(filas_por_px)) == 0
+        filas, claves = filas[visibles], claves[visibles]
+        inicios, fines = inicios[visibles], fines[visibles]
+        
+        # Unir segmentos consecutivos de la misma fila que miden menos de
+        # 3 píxeles y están separados por menos de 1 píxel; si aun así quedan
+        # demasiadas barras se duplica la tolerancia hasta entrar en el límite
+        misma_fila = filas[1:] == filas[:-1]
+        hueco = inicios[1:] - fines[:-1]
+        tolerancia = unidad_px
+        while True:
+            chico = (fines - inicios) < 3 * tolerancia
+            nuevo = np.ones(len(filas), dtype=bool)
+            nuevo[1:] = ~misma_fila | (hueco > tolerancia) | ~chico[1:] | ~chico[:-1]
+            grupos = np.flatnonzero(nuevo)
+            if len(grupos) <= self.MAX_BARRAS_GANTT or tolerancia > (x1 - x0):
+                break
+            tolerancia *= 2
+        if len(grupos):
+            barra_inicio = inicios[grupos]
+            barra_fin = np.maximum.reduceat(fines, grupos)
+            barra_fila = filas[grupos].astype(np.float64)
+        else:
+            barra_inicio = barra_fin = barra_fila = np.empty(0)
+        segmentos_por_barra = np.diff(np.append(grupos, len(filas)))
+        
+        vertices = np.stack([
+            np.column_stack([barra_inicio, barra_fila]),
+            np.column_stack([barra_inicio, barra_fila + 0.8]),
+            np.column_stack([barra_fin, barra_fila + 0.8]),
+            np.column_stack([barra_fin, barra_fila]),
+        ], axis=1)
+        barras = gantt['barras']
+        barras.set_verts(vertices)
+        barras.set_facecolor(gantt['colores'][claves[grupos]] if len(grupos) else 'none')
+        ancho_px = (barra_fin - barra_inicio) / unidad_px
+        barras.set_linewidths(np.where(ancho_px >= 3, 1.0, 0.0))
+        
+        # Etiquetas sólo en barras de un segmento con espacio suficiente
+        for texto in gantt['textos']:
+            texto.remove()
+        gantt['textos'] = []
+        con_texto = np.flatnonzero((segmentos_por_barra == 1) & (ancho_px >= 30))
+        if len(con_texto) <= 300:
+            for barra in con_texto:
+                inicio, fin = barra_inicio[barra], barra_fin[barra]
+                y_pos = barra_fila[barra]
+                duracion = fin - inicio
+                if duracion == int(duracion):
+                    duracion = int(duracion)
+                gantt['textos'].append(self.ax.text(
+                    inicio + duracion/2, y_pos + 0.4, gantt['procesos'][claves[grupos[barra]]],
+                    ha='center', va='center', fontweight='bold', fontsize=9, clip_on=True))
+                gantt['textos'].append(self.ax.text(
+                    inicio + duracion/2, y_pos + 0.1, f"{duracion:.4g}",
+                    ha='center', va='center', fontsize=8, clip_on=True))
+        
+        tiempos = MaxNLocator(nbins=50, integer=True, steps=[1, 2, 5, 10]).tick_values(x0, x1)
+        gantt['lineas'].set_segments([[(t, 0), (t, 1)] for t in tiempos if x0 <= t <= x1])
+        
+        if ax is not None:
+            self.canvas.draw_idle()
+    
     def comparar_algoritmos(self):
         if not self.planificador.procesos:
             messagebox.showwarning("Advertencia", "No hay procesos para planificar")
@@ -447,30 +888,44 @@ class InterfazSimulador:
         except ValueError:
             self.planificador.quantum = 3
         
-        # Ejecutar todos los algoritmos
-        procesos_fifo, secuencia_fifo = self.planificador.fifo()
-        procesos_sjf, secuencia_sjf = self.planificador.sjf()
-        procesos_rr, secuencia_rr = self.planificador.round_robin()
+        n_procesos = len(self.planificador.procesos)
         
-        # Calcular métricas
-        def calcular_metricas(procesos):
-            tiempo_espera = sum(p.tiempo_espera for p in procesos) / len(procesos)
-            tiempo_respuesta = sum(p.tiempo_respuesta for p in procesos) / len(procesos)
-            return tiempo_espera, tiempo_respuesta
+        # Ejecutar todos los algoritmos en segundo plano
+        def trabajo(control):
+            resultados = []
+            for fase, metodo in (("FIFO", self.planificador.fifo),
+                                 ("SJF", self.planificador.sjf),
+                                 ("Round Robin", self.planificador.round_robin)):
+                control.iniciar_fase(fase, n_procesos)
+                resultados.append(metodo())
+            return resultados
         
-        espera_fifo, respuesta_fifo = calcular_metricas(procesos_fifo)
-        espera_sjf, respuesta_sjf = calcular_metricas(procesos_sjf)
-        espera_rr, respuesta_rr = calcular_metricas(procesos_rr)
+        self.iniciar_simulacion(trabajo, self.mostrar_comparacion)
+    
+    def mostrar_comparacion(self, resultados):
+        (procesos_fifo, secuencia_fifo), (procesos_sjf, secuencia_sjf), (procesos_rr, secuencia_rr) = resultados
+        self.vista_metricas.set_datos([])
+        self.vista_secuencia.set_datos([])
+        
+        # Calcular métricas
+        metricas_fifo = calcular_metricas(procesos_fifo, secuencia_fifo)
+        metricas_sjf = calcular_metricas(procesos_sjf, secuencia_sjf)
+        metricas_rr = calcular_metricas(procesos_rr, secuencia_rr)
+        espera_fifo, respuesta_fifo = metricas_fifo['espera_promedio'], metricas_fifo['respuesta_promedio']
+        espera_sjf, respuesta_sjf = metricas_sjf['espera_promedio'], metricas_sjf['respuesta_promedio']
+        espera_rr, respuesta_rr = metricas_rr['espera_promedio'], metricas_rr['respuesta_promedio']
         
         # Mostrar comparación
         self.resultado_text.delete(1.0, tk.END)
         
         resultado = "=== COMPARACIÓN DE ALGORITMOS ===\n\n"
-        resultado += f"{'Algoritmo':<15} {'T. Espera Prom.':<18} {'T. Respuesta Prom.':<20}\n"
-        resultado += "-" * 55 + "\n"
-        resultado += f"{'FIFO':<15} {espera_fifo:<18.2f} {respuesta_fifo:<20.2f}\n"
-        resultado += f"{'SJF':<15} {espera_sjf:<18.2f} {respuesta_sjf:<20.2f}\n"
-        resultado += f"{'Round Robin':<15} {espera_rr:<18.2f} {respuesta_rr:<20.2f}\n"
+        resultado += f"{'Algoritmo':<15} {'T. Espera Prom.':<18} {'T. Respuesta Prom.':<20} "
+        resultado += f"{'Retorno p95':<13} {'Cambios ctx.':<12}\n"
+        resultado += "-" * 81 + "\n"
+        for nombre, metricas in (("FIFO", metricas_fifo), ("SJF", metricas_sjf), ("Round Robin", metricas_rr)):
+            resultado += f"{nombre:<15} {metricas['espera_promedio']:<18.2f} "
+            resultado += f"{metricas['respuesta_promedio']:<20.2f} {metricas['retorno_p95']:<13.2f} "
+            resultado += f"{metricas['cambios_contexto']:<12}\n"
         
         # Determinar el mejor algoritmo
         resultado += "\nANÁLISIS:\n"
@@ -494,6 +949,11 @@ class InterfazSimulador:
         self.dibujar_gantt(secuencia_sjf, "SJF (Comparación)")
 
 def main():
+    if len(sys.argv) > 1:
+        # Con argumentos se usa el modo consola, sin abrir la ventana
+        from flujo import main_consola
+        sys.exit(main_consola(sys.argv[1:]))
+    
     root = tk.Tk()
     app = InterfazSimulador(root)
     root.mainloop()
@@ -0,0 +1,126 @@
+"""Pruebas diferenciales del motor de eventos (eventos.py)
+
+Las políticas FIFO, SJF y Round Robin deben coincidir segmento a segmento
+con los algoritmos de PlanificadorProcesos, y SRTF con una simulación de a
+una unidad de tiempo.
+
+Uso:
+    python -m pytest -q test_eventos.py
+"""
+import random
+
+import pytest
+
+from eventos import ColaIndexada, PoliticaFIFO, PoliticaRoundRobin, PoliticaSJF, simular
+from planificador import PlanificadorProcesos, TablaProcesos
+
+def _carga(rng, n, hasta, duracion_maxima):
+    llegadas = [rng.randint(0, hasta) for _ in range(n)]
+    duraciones = [rng.randint(1, duracion_maxima) for _ in range(n)]
+    return TablaProcesos.desde_columnas(llegadas, duraciones)
+
+def _planificador(tabla, quantum=3):
+    planificador = PlanificadorProcesos()
+    planificador.procesos = tabla
+    planificador.quantum = quantum
+    return planificador
+
+def _iguales(obtenido, esperado):
+    (resultado, secuencia), (resultado_esperado, secuencia_esperada) = obtenido, esperado
+    assert list(resultado.orden) == list(resultado_esperado.orden)
+    for campo in ('finalizacion', 'espera', 'respuesta'):
+        assert list(getattr(resultado, campo)) == list(getattr(resultado_esperado, campo)), campo
+    assert list(secuencia) == list(secuencia_esperada)
+
+def _srtf_paso_a_paso(llegadas, duraciones):
+    """SRTF de a una unidad: el que corre sigue salvo que otro tenga estrictamente menos"""
+    n = len(llegadas)
+    restante = list(duraciones)
+    finalizacion, respuesta = [None] * n, [-1] * n
+    segmentos = []
+    tiempo, actual = 0, None
+    while None in finalizacion:
+        listos = [i for i in range(n) if llegadas[i] <= tiempo and finalizacion[i] is None]
+        if not listos:
+            tiempo += 1
+            continue
+        elegido = min(listos, key=lambda i: (restante[i], llegadas[i], i))
+        if actual is not None and not restante[elegido] < restante[actual]:
+            elegido = actual
+        if respuesta[elegido] == -1:
+            respuesta[elegido] = tiempo - llegadas[elegido]
+        if segmentos and segmentos[-1][0] == elegido and segmentos[-1][2] == tiempo:
+            segmentos[-1][2] = tiempo + 1
+        else:
+            segmentos.append([elegido, tiempo, tiempo + 1])
+        restante[elegido] -= 1
+        tiempo += 1
+        actual = elegido
+        if restante[elegido] == 0:
+            finalizacion[elegido] = tiempo
+            actual = None
+    return finalizacion, respuesta, segmentos
+
+@pytest.mark.parametrize('semilla', range(60))
+def test_politicas_iguales_a_los_algoritmos(semilla):
+    rng = random.Random(semilla)
+    tabla = _carga(rng, rng.randint(1, 40), rng.choice([0, 10, 60]), rng.randint(1, 12))
+    planificador = _planificador(tabla, rng.randint(1, 4))
+    _iguales(simular(tabla, PoliticaFIFO()), planificador.fifo())
+    _iguales(simular(tabla, PoliticaSJF()), planificador.sjf())
+    _iguales(simular(tabla, PoliticaRoundRobin(planificador.quantum)), planificador.round_robin())
+    # Con un solo nivel nadie expropia: MLFQ es Round Robin
+    _iguales(planificador.mlfq((planificador.quantum,)), planificador.round_robin())
+
+@pytest.mark.parametrize('semilla', range(60))
+def test_srtf_igual_al_paso_a_paso(semilla):
+    rng = random.Random(semilla)
+    tabla = _carga(rng, rng.randint(1, 30), 50, 10)
+    llegadas, duraciones = list(tabla.llegadas), list(tabla.duraciones)
+    finalizacion, respuesta, segmentos = _srtf_paso_a_paso(llegadas, duraciones)
+    resultado, secuencia = _planificador(tabla).srtf()
+
+    assert list(resultado.finalizacion) == finalizacion
+    assert list(resultado.respuesta) == respuesta
+    # El motor corta un segmento en cada expropiación: unir los consecutivos
+    unidos = []
+    for segmento in secuencia:
+        if unidos and unidos[-1][0] == segmento['proceso'] and unidos[-1][2] == segmento['inicio']:
+            unidos[-1][2] = segmento['fin']
+        else:
+            unidos.append([segmento['proceso'], segmento['inicio'], segmento['fin']])
+    assert unidos == [[tabla.nombre(i), inicio, fin] for i, inicio, fin in segmentos]
+
+@pytest.mark.parametrize('impulso', [None, 7])
+def test_mlfq_conserva_el_trabajo(impulso):
+    rng = random.Random(impulso)
+    for _ in range(30):
+        tabla = _carga(rng, rng.randint(1, 30), 40, 10)
+        resultado, secuencia = _planificador(tabla).mlfq((1, 2, 4), impulso)
+        assert sum(s['fin'] - s['inicio'] for s in secuencia) == sum(tabla.duraciones)
+        assert all(a['fin'] <= b['inicio'] for a, b in zip(secuencia, secuencia[1:]))
+        for i in range(len(tabla)):
+            esperada = resultado.finalizacion[i] - tabla.llegadas[i] - tabla.duraciones[i]
+            assert resultado.espera[i] == esperada >= 0
+
+def test_cola_indexada_igual_a_un_dict():
+    rng = random.Random(3)
+    cola = ColaIndexada()
+    referencia = {}
+    for _ in range(5000):
+        operacion = rng.random()
+        indice = rng.randrange(50)
+        if operacion < 0.5:
+            clave = (rng.randint(0, 20), indice)
+            cola.insertar(indice, clave)
+            referencia[indice] = clave
+        elif operacion < 0.7 and indice in referencia:
+            cola.quitar(indice)
+            del referencia[indice]
+        elif operacion >= 0.7:
+            esperado = min(referencia, key=referencia.get) if referencia else None
+            assert cola.minimo() == esperado
+            assert cola.extraer() == esperado
+            referencia.pop(esperado, None)
+        assert len(cola) == len(referencia)
+        assert all(i in cola for i in referencia)
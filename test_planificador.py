@@ -0,0 +1,212 @@
+"""Pruebas diferenciales de planificador.py: paso a paso, incremental y cache
+
+Uso:
+    python -m pytest -q test_planificador.py
+"""
+import random
+from collections import deque
+
+import pytest
+
+import planificador
+from planificador import PlanificadorProcesos, Proceso, TablaProcesos, _Ciclo
+
+def _carga(semilla, n, separacion, duracion_maxima, flotante=False):
+    rng = random.Random(semilla)
+    llegadas, duraciones, tiempo = [], [], 0
+    for _ in range(n):
+        if flotante:
+            # Múltiplos de 1/8: las sumas son exactas y no hay ruido de redondeo
+            tiempo += rng.randint(0, separacion * 8) / 8
+            duraciones.append(rng.randint(1, duracion_maxima * 8) / 8)
+        else:
+            tiempo += rng.randint(0, separacion)
+            duraciones.append(rng.randint(1, duracion_maxima))
+        llegadas.append(tiempo)
+    orden = list(range(n))
+    rng.shuffle(orden)
+    return TablaProcesos.desde_columnas([llegadas[i] for i in orden], [duraciones[i] for i in orden])
+
+def _round_robin_paso_a_paso(tabla, quantum):
+    """Round Robin de a un quantum, sin avances rápidos"""
+    n = len(tabla)
+    llegadas, duraciones = tabla.llegadas, tabla.duraciones
+    orden_llegada = sorted(range(n), key=llegadas.__getitem__)
+    restante = list(duraciones)
+    finalizacion, respuesta = [0] * n, [-1] * n
+    secuencia = []
+    cola = deque()
+    siguiente, tiempo, terminados = 0, 0, 0
+    while terminados < n:
+        while siguiente < n and llegadas[orden_llegada[siguiente]] <= tiempo:
+            cola.append(orden_llegada[siguiente])
+            siguiente += 1
+        if not cola:
+            tiempo = llegadas[orden_llegada[siguiente]]
+            continue
+        indice = cola.popleft()
+        if respuesta[indice] == -1:
+            respuesta[indice] = tiempo - llegadas[indice]
+        corrido = min(quantum, restante[indice])
+        secuencia.append((tabla.nombre(indice), tiempo, tiempo + corrido))
+        tiempo += corrido
+        restante[indice] -= corrido
+        while siguiente < n and llegadas[orden_llegada[siguiente]] <= tiempo:
+            cola.append(orden_llegada[siguiente])
+            siguiente += 1
+        if restante[indice] > 0:
+            cola.append(indice)
+        else:
+            finalizacion[indice] = tiempo
+            terminados += 1
+    return finalizacion, respuesta, secuencia
+
+CASOS = [(semilla, n, separacion, duracion, quantum, flotante)
+         for semilla, (n, separacion, duracion, quantum, flotante) in enumerate([
+             (1, 0, 5, 2, False), (30, 0, 20, 3, False), (60, 2, 15, 4, False),
+             (80, 10, 6, 2, False), (120, 1, 40, 1, False), (150, 5, 120, 10, False),
+             (200, 0, 9, 50, False), (40, 3, 12, 1.5, True), (90, 1, 30, 0.25, True),
+             (300, 1, 60, 2, False)])]
+
+@pytest.mark.parametrize('semilla, n, separacion, duracion, quantum, flotante', CASOS)
+@pytest.mark.parametrize('modo', ['perezosa', 'completa', 'compacta'])
+def test_round_robin_igual_al_paso_a_paso(semilla, n, separacion, duracion, quantum, flotante, modo):
+    tabla = _carga(semilla, n, separacion, duracion, flotante)
+    finalizacion, respuesta, secuencia = _round_robin_paso_a_paso(tabla, quantum)
+    planificador_rr = PlanificadorProcesos()
+    planificador_rr.procesos = tabla
+    planificador_rr.quantum = quantum
+    resultado, obtenida = planificador_rr.round_robin(modo)
+
+    assert list(resultado.finalizacion) == finalizacion
+    assert list(resultado.respuesta) == respuesta
+    assert list(resultado.espera) == [finalizacion[i] - tabla.llegadas[i] - tabla.duraciones[i]
+                                      for i in range(n)]
+    assert sorted(resultado.orden) == list(range(n))
+    obtenida = [(s['proceso'], s['inicio'], s['fin']) for s in obtenida]
+    if modo == 'compacta':
+        unida = []
+        for nombre, inicio, fin in secuencia:
+            if unida and unida[-1][0] == nombre and unida[-1][2] == inicio:
+                unida[-1] = (nombre, unida[-1][1], fin)
+            else:
+                unida.append((nombre, inicio, fin))
+        secuencia = unida
+    assert obtenida == secuencia
+
+def test_round_robin_por_vueltas_con_bloques_chicos(monkeypatch):
+    # Bloques de 2 elementos: inserciones y borrados cruzan bloques todo el tiempo
+    monkeypatch.setattr(_Ciclo, 'CARGA', 2)
+    for semilla in range(40):
+        tabla = _carga(semilla, 60, semilla % 4, 25)
+        finalizacion, respuesta, _ = _round_robin_paso_a_paso(tabla, 3)
+        planificador_rr = PlanificadorProcesos()
+        planificador_rr.procesos = tabla
+        planificador_rr.quantum = 3
+        resultado, _ = planificador_rr.round_robin('perezosa')
+        assert list(resultado.finalizacion) == finalizacion
+        assert list(resultado.respuesta) == respuesta
+
+@pytest.mark.parametrize('carga', [1, 3, 1000])
+def test_ciclo_igual_a_una_lista(monkeypatch, carga):
+    monkeypatch.setattr(_Ciclo, 'CARGA', carga)
+    rng = random.Random(carga)
+    ciclo = _Ciclo()
+    referencia = []
+    sello = 0
+    for _ in range(3000):
+        operacion = rng.random()
+        sello += 1
+        if not referencia or operacion < 0.3:
+            etiqueta = (sello, planificador._ULTIMA)
+            ciclo.anexar(etiqueta, sello)
+            referencia.append((etiqueta, sello))
+        elif operacion < 0.7:
+            # Como Round Robin: delante de la posición, con una etiqueta que queda entre medio
+            posicion = rng.randrange(len(referencia))
+            etiqueta = ciclo.etiqueta(posicion)[:-1] + (sello, planificador._ULTIMA)
+            ciclo.insertar(posicion, etiqueta, sello)
+            referencia.insert(posicion, (etiqueta, sello))
+        else:
+            etiqueta, _ = referencia.pop(rng.randrange(len(referencia)))
+            ciclo.quitar(etiqueta)
+        assert len(ciclo) == len(referencia)
+        if referencia:
+            posicion = rng.randrange(len(referencia))
+            etiqueta, elemento = referencia[posicion]
+            assert ciclo[posicion] == elemento
+            assert ciclo.etiqueta(posicion) == etiqueta
+            assert ciclo.posicion(etiqueta) == posicion
+    assert [ciclo[i] for i in range(len(referencia))] == [e for _, e in referencia]
+
+def test_quantum_no_positivo():
+    planificador_rr = PlanificadorProcesos()
+    planificador_rr.procesos = TablaProcesos.desde_columnas([0], [5])
+    for quantum in (0, -1):
+        planificador_rr.quantum = quantum
+        with pytest.raises(ValueError):
+            planificador_rr.round_robin()
+
+def test_cancelar_durante_la_secuencia():
+    class Control(planificador.ControlEjecucion):
+        reportes = 0
+
+        def reportar(self, tiempo_simulado, completados):
+            self.reportes += 1
+            if self.reportes == 50:
+                self.cancelar()
+            super().reportar(tiempo_simulado, completados)
+
+    planificador_rr = PlanificadorProcesos()
+    planificador_rr.procesos = _carga(7, 200, 0, 40)
+    planificador_rr.quantum = 1
+    planificador_rr.control = Control()
+    with pytest.raises(planificador.EjecucionCancelada):
+        planificador_rr.round_robin()
+    assert len(planificador_rr.cache) == 0
+
+@pytest.mark.parametrize('algoritmo', ['fifo', 'sjf'])
+def test_incremental_igual_a_ejecutar_de_nuevo(algoritmo):
+    rng = random.Random(algoritmo)
+    planificador_inc = PlanificadorProcesos()
+    for k in range(40):
+        planificador_inc.agregar_proceso(Proceso(f"P{k}", rng.randint(0, 80), rng.randint(1, 9)))
+    resultado, secuencia = getattr(planificador_inc, algoritmo)()
+    foto = (list(resultado.orden), list(resultado.finalizacion), list(resultado.espera),
+            [dict(s) for s in secuencia])
+
+    for tanda in range(15):
+        for k in range(rng.choice([1, 1, 3, 20])):
+            planificador_inc.agregar_proceso(
+                Proceso(f"N{tanda}_{k}", rng.randint(0, 120), rng.randint(1, 9)))
+        obtenido = getattr(planificador_inc, algoritmo)()
+        tabla = planificador_inc.procesos
+        nuevo = PlanificadorProcesos()
+        nuevo.procesos = TablaProcesos.desde_columnas(
+            list(tabla.llegadas), list(tabla.duraciones), [tabla.nombre(i) for i in range(len(tabla))])
+        esperado = getattr(nuevo, algoritmo)()
+        for campo in ('orden', 'inicio', 'finalizacion', 'espera', 'respuesta'):
+            assert list(getattr(obtenido[0], campo)) == list(getattr(esperado[0], campo)), campo
+        assert obtenido[1] == esperado[1]
+
+    # Lo entregado antes no cambia al continuar la simulación
+    assert (list(resultado.orden), list(resultado.finalizacion), list(resultado.espera),
+            secuencia) == foto
+
+def test_cache_acierta_y_se_invalida_al_agregar():
+    planificador_cache = PlanificadorProcesos()
+    planificador_cache.procesos = _carga(11, 50, 2, 10)
+    primero = planificador_cache.round_robin()
+    assert planificador_cache.round_robin() is primero
+    assert planificador_cache.cache.aciertos == 1
+
+    # Listas y tuplas comparten la entrada
+    assert planificador_cache.mlfq([1, 2]) is planificador_cache.mlfq((1, 2))
+    # El quantum es parte de la clave
+    planificador_cache.quantum = 5
+    assert planificador_cache.round_robin() is not primero
+
+    planificador_cache.agregar_proceso(Proceso('extra', 0, 3))
+    resultado, secuencia = planificador_cache.round_robin()
+    assert resultado.filas == 51
+    assert 'extra' in {s['proceso'] for s in secuencia}
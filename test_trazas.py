@@ -0,0 +1,83 @@
+"""Pruebas de ida y vuelta del formato de trazas (trazas.py)
+
+Uso:
+    python -m pytest -q test_trazas.py
+"""
+import random
+
+import pytest
+
+from planificador import PlanificadorProcesos, Proceso, TablaProcesos
+from trazas import cargar_traza, comparar_trazas, guardar_traza
+
+def _planificador(semilla, n, flotante=False):
+    rng = random.Random(semilla)
+    llegadas = [rng.randint(0, 40) for _ in range(n)]
+    duraciones = [rng.randint(1, 12) for _ in range(n)]
+    if flotante:
+        llegadas = [x / 4 for x in llegadas]
+        duraciones = [x / 4 for x in duraciones]
+    planificador = PlanificadorProcesos()
+    # Nombres repetidos y no ASCII: la tabla de nombres se comparte
+    planificador.procesos = TablaProcesos.desde_columnas(
+        llegadas, duraciones, [rng.choice(['P1', 'P2', 'ñandú', f"Q{k}"]) for k in range(n)])
+    return planificador
+
+def _resultados_iguales(a, b):
+    for campo in ('orden', 'inicio', 'finalizacion', 'espera', 'respuesta'):
+        assert list(getattr(a, campo)) == list(getattr(b, campo)), campo
+
+@pytest.mark.parametrize('flotante', [False, True])
+@pytest.mark.parametrize('algoritmo', ['fifo', 'sjf', 'round_robin', 'srtf'])
+def test_ida_y_vuelta(tmp_path, algoritmo, flotante):
+    planificador = _planificador(len(algoritmo), 60, flotante)
+    tabla = planificador.procesos
+    resultado, secuencia = getattr(planificador, algoritmo)()
+    ruta = tmp_path / 'carga.traza'
+    guardar_traza(ruta, tabla, resultado, secuencia, algoritmo=algoritmo,
+                  quantum=planificador.quantum, semilla=7)
+
+    traza = cargar_traza(ruta)
+    assert traza.algoritmo == algoritmo and traza.quantum == planificador.quantum
+    assert traza.encabezado['metadatos'] == {'semilla': 7}
+    cargada = traza.tabla()
+    assert list(cargada.llegadas) == list(tabla.llegadas)
+    assert list(cargada.duraciones) == list(tabla.duraciones)
+    assert [cargada.nombre(i) for i in range(len(cargada))] == [tabla.nombre(i) for i in range(len(tabla))]
+    _resultados_iguales(traza.resultado(), resultado)
+    assert list(traza.secuencia()) == secuencia
+    assert traza.secuencia()[-1] == secuencia[-1]
+    assert comparar_trazas(traza, traza)['primer_segmento_distinto'] is None
+
+def test_secuencia_perezosa(tmp_path):
+    planificador = _planificador(3, 80)
+    completa = planificador.round_robin()[1]
+    resultado, perezosa = planificador.round_robin('perezosa')
+    guardar_traza(tmp_path / 'rr.traza', planificador.procesos, resultado, perezosa)
+    assert list(cargar_traza(tmp_path / 'rr.traza').secuencia()) == completa
+
+def test_tabla_que_crecio_despues(tmp_path):
+    planificador = _planificador(5, 30)
+    resultado, secuencia = planificador.fifo()
+    planificador.agregar_proceso(Proceso('tarde', 3, 4))
+    guardar_traza(tmp_path / 'fifo.traza', planificador.procesos, resultado, secuencia)
+
+    traza = cargar_traza(tmp_path / 'fifo.traza')
+    assert traza.encabezado['procesos'] == len(traza.procesos) == 30
+    assert len(traza.metricas) == 30
+    _resultados_iguales(traza.resultado(), resultado)
+    assert list(traza.secuencia()) == secuencia
+
+def test_sin_resultado_ni_secuencia(tmp_path):
+    tabla = TablaProcesos()
+    guardar_traza(tmp_path / 'vacia.traza', tabla)
+    traza = cargar_traza(tmp_path / 'vacia.traza')
+    assert len(traza.procesos) == 0 and traza.metricas is None and traza.segmentos is None
+    with pytest.raises(ValueError):
+        traza.resultado()
+
+def test_archivo_que_no_es_traza(tmp_path):
+    ruta = tmp_path / 'otra.bin'
+    ruta.write_bytes(b'no es una traza')
+    with pytest.raises(ValueError):
+        cargar_traza(ruta)
@@ -0,0 +1,304 @@
+"""Formato binario de trazas: carga de trabajo, métricas y secuencia
+
+Un archivo .traza guarda cada parte como un array de NumPy (estructurado o
+simple) en una sección alineada, seguida de un encabezado JSON al final:
+
+    b'TRAZA001' | secciones... | encabezado JSON | largo (uint64) | b'TRAZA001'
+
+Secciones:
+    procesos   llegada, duracion, nombre (índice en la tabla de nombres)
+    metricas   inicio, finalizacion, espera, respuesta (si hay resultado)
+    orden      orden de finalización
+    segmentos  proceso, inicio, fin, cpu (-1 con una sola CPU)
+    nombres    texto UTF-8 de los nombres, uno tras otro
+    limites    desplazamiento de cada nombre dentro de `nombres`
+
+Los nombres se guardan una sola vez (como en TablaProcesos) y los segmentos
+apuntan a ellos por índice, así que cada segmento ocupa 28 bytes en vez de
+un dict. El encabezado va al final para poder escribir una secuencia
+perezosa en bloques sin conocer su largo.
+
+cargar_traza() abre las secciones con np.memmap: nada se lee del disco
+hasta que se accede a los datos, y una traza más grande que la RAM puede
+dibujarse, compararse o analizarse por partes.
+
+Ejemplo:
+    resultado, secuencia = planificador.round_robin()
+    guardar_traza('rr.traza', planificador.procesos, resultado, secuencia,
+                  algoritmo='rr', quantum=planificador.quantum)
+    traza = cargar_traza('rr.traza')
+    traza.segmentos['fin'].max(), traza.encabezado['quantum']
+"""
+import json
+import struct
+from array import array
+
+import numpy as np
+
+from planificador import ResultadoEjecucion, TablaProcesos
+
+MAGIA = b'TRAZA001'
+VERSION = 1
+ALINEACION = 64
+# Segmentos convertidos a array por bloque al escribir
+BLOQUE_SEGMENTOS = 65536
+
+def _tipo_tiempo(codigo):
+    return np.dtype('<i8') if codigo == 'q' else np.dtype('<f8')
+
+def _dtype_procesos(tiempo):
+    return np.dtype([('llegada', tiempo), ('duracion', tiempo), ('nombre', '<i4')])
+
+def _dtype_metricas(tiempo):
+    return np.dtype([('inicio', tiempo), ('finalizacion', tiempo),
+                     ('espera', tiempo), ('respuesta', tiempo)])
+
+def _dtype_segmentos(tiempo):
+    return np.dtype([('proceso', '<i4'), ('inicio', tiempo), ('fin', tiempo), ('cpu', '<i4')])
+
+class _Escritor:
+    """Escribe secciones alineadas y recuerda dónde quedó cada una"""
+
+    def __init__(self, archivo):
+        self.archivo = archivo
+        self.secciones = {}
+        archivo.write(MAGIA)
+
+    def _alinear(self):
+        relleno = -self.archivo.tell() % ALINEACION
+        self.archivo.write(b'\0' * relleno)
+
+    def seccion(self, nombre, datos):
+        self._alinear()
+        datos = np.ascontiguousarray(datos)
+        self.secciones[nombre] = {'desplazamiento': self.archivo.tell(),
+                                  'dtype': datos.dtype.descr, 'largo': len(datos)}
+        self.archivo.write(datos.tobytes())
+
+    def seccion_en_bloques(self, nombre, dtype, bloques):
+        self._alinear()
+        inicio = self.archivo.tell()
+        largo = 0
+        for bloque in bloques:
+            self.archivo.write(bloque.tobytes())
+            largo += len(bloque)
+        self.secciones[nombre] = {'desplazamiento': inicio, 'dtype': dtype.descr, 'largo': largo}
+
+    def cerrar(self, encabezado):
+        encabezado['secciones'] = self.secciones
+        texto = json.dumps(encabezado).encode('utf-8')
+        self.archivo.write(texto)
+        self.archivo.write(struct.pack('<Q', len(texto)))
+        self.archivo.write(MAGIA)
+
+def _dtype(descr):
+    """dtype a partir del `descr` guardado en el encabezado (JSON: listas)"""
+    campos = [tuple(campo) for campo in descr]
+    if len(campos) == 1 and campos[0][0] == '':
+        return np.dtype(campos[0][1])
+    return np.dtype(campos)
+
+def _bloques_segmentos(secuencia, dtype, indice_nombre):
+    """Convertir los dicts de la secuencia en arrays de BLOQUE_SEGMENTOS filas"""
+    filas = []
+    for segmento in secuencia:
+        filas.append((indice_nombre[segmento['proceso']], segmento['inicio'], segmento['fin'],
+                      segmento.get('cpu', -1)))
+        if len(filas) == BLOQUE_SEGMENTOS:
+            yield np.array(filas, dtype=dtype)
+            filas = []
+    if filas:
+        yield np.array(filas, dtype=dtype)
+
+def guardar_traza(ruta, tabla, resultado=None, secuencia=None, algoritmo=None, quantum=None,
+                  **metadatos):
+    """Guardar una carga y, si se dan, sus métricas y su secuencia
+
+    secuencia puede ser una lista o un generador (por ejemplo la secuencia
+    perezosa de Round Robin): se consume una sola vez, por bloques. Con
+    resultado se guardan sólo las filas que cubre (resultado.filas), aunque
+    la tabla haya crecido después de la ejecución.
+    metadatos: valores JSON extra para el encabezado (semilla, cpus, ...).
+    """
+    tipo_tabla = _tipo_tiempo(tabla.tipo)
+    tipo_resultado = _tipo_tiempo(resultado.inicio.typecode) if resultado is not None else tipo_tabla
+    n = resultado.filas if resultado is not None else len(tabla)
+
+    procesos = np.empty(n, dtype=_dtype_procesos(tipo_tabla))
+    procesos['llegada'] = np.frombuffer(tabla.llegadas, dtype=tipo_tabla)[:n] if n else []
+    procesos['duracion'] = np.frombuffer(tabla.duraciones, dtype=tipo_tabla)[:n] if n else []
+    procesos['nombre'] = np.frombuffer(tabla.indices_nombre, dtype='<i8')[:n] if n else []
+
+    codificados = [nombre.encode('utf-8') for nombre in tabla.nombres]
+    limites = np.zeros(len(codificados) + 1, dtype='<i8')
+    np.cumsum([len(c) for c in codificados], out=limites[1:])
+
+    with open(ruta, 'wb') as archivo:
+        escritor = _Escritor(archivo)
+        escritor.seccion('procesos', procesos)
+        escritor.seccion('nombres', np.frombuffer(b''.join(codificados), dtype=np.uint8))
+        escritor.seccion('limites', limites)
+        if resultado is not None:
+            metricas = np.empty(n, dtype=_dtype_metricas(tipo_resultado))
+            for campo in metricas.dtype.names:
+                columna = resultado.finalizacion if campo == 'finalizacion' else getattr(resultado, campo)
+                metricas[campo] = np.frombuffer(columna, dtype=tipo_resultado) if n else []
+            escritor.seccion('metricas', metricas)
+            escritor.seccion('orden', np.frombuffer(resultado.orden, dtype='<i8'))
+        if secuencia is not None:
+            dtype = _dtype_segmentos(tipo_resultado)
+            indice_nombre = {nombre: i for i, nombre in enumerate(tabla.nombres)}
+            escritor.seccion_en_bloques('segmentos', dtype,
+                                        _bloques_segmentos(secuencia, dtype, indice_nombre))
+        escritor.cerrar({'version': VERSION, 'procesos': n, 'algoritmo': algoritmo,
+                         'quantum': quantum, 'metadatos': metadatos})
+
+class SecuenciaTraza:
+    """Secuencia de una traza que arma los dicts {'proceso', 'inicio', 'fin'} a pedido
+
+    Se puede indexar, recortar y recorrer como la lista que devuelven los
+    algoritmos, sin materializar los segmentos.
+    """
+
+    def __init__(self, traza, segmentos):
+        self.traza = traza
+        self.segmentos = segmentos
+
+    def __len__(self):
+        return len(self.segmentos)
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return SecuenciaTraza(self.traza, self.segmentos[posicion])
+        segmento = self.segmentos[posicion]
+        resultado = {'proceso': self.traza.nombre_de(int(segmento['proceso'])),
+                     'inicio': segmento['inicio'].item(), 'fin': segmento['fin'].item()}
+        if segmento['cpu'] >= 0:
+            resultado['cpu'] = int(segmento['cpu'])
+        return resultado
+
+    def __iter__(self):
+        for posicion in range(len(self)):
+            yield self[posicion]
+
+    def columnas(self):
+        """(nombres ordenados, clave de cada segmento en esos nombres, cpu, inicio, fin)
+
+        Es lo que necesita el diagrama de Gantt, calculado sobre los arrays
+        sin armar un dict por segmento.
+        """
+        presentes = np.unique(self.segmentos['proceso'])
+        nombres = [self.traza.nombre_de(int(i)) for i in presentes]
+        orden = sorted(range(len(nombres)), key=nombres.__getitem__)
+        # Índice de nombre -> posición entre los nombres ordenados
+        clave = np.empty(len(presentes), dtype=np.int64)
+        clave[orden] = np.arange(len(orden))
+        claves = clave[np.searchsorted(presentes, self.segmentos['proceso'])]
+        return ([nombres[i] for i in orden], claves, self.segmentos['cpu'].astype(np.int64),
+                self.segmentos['inicio'].astype(np.float64), self.segmentos['fin'].astype(np.float64))
+
+class Traza:
+    """Traza abierta con cargar_traza(); las secciones son arrays de solo lectura"""
+
+    def __init__(self, ruta, encabezado, secciones):
+        self.ruta = ruta
+        self.encabezado = encabezado
+        self.procesos = secciones['procesos']
+        self.metricas = secciones.get('metricas')
+        self.orden = secciones.get('orden')
+        self.segmentos = secciones.get('segmentos')
+        self._nombres = secciones['nombres']
+        self._limites = secciones['limites']
+
+    @property
+    def algoritmo(self):
+        return self.encabezado['algoritmo']
+
+    @property
+    def quantum(self):
+        return self.encabezado['quantum']
+
+    def nombre_de(self, indice_nombre):
+        """Nombre número `indice_nombre` de la tabla de nombres"""
+        inicio, fin = self._limites[indice_nombre], self._limites[indice_nombre + 1]
+        return self._nombres[inicio:fin].tobytes().decode('utf-8')
+
+    def nombres(self):
+        return [self.nombre_de(i) for i in range(len(self._limites) - 1)]
+
+    def tabla(self):
+        """TablaProcesos con la carga (copiada a memoria) para volver a simular"""
+        nombres = self.nombres()
+        indices = self.procesos['nombre']
+        return TablaProcesos.desde_columnas(self.procesos['llegada'].tolist(),
+                                            self.procesos['duracion'].tolist(),
+                                            [nombres[i] for i in indices.tolist()])
+
+    def resultado(self, tabla=None):
+        """ResultadoEjecucion con las métricas guardadas (copiadas a memoria)"""
+        if self.metricas is None:
+            raise ValueError("La traza no tiene métricas")
+        tabla = tabla if tabla is not None else self.tabla()
+        tipo = 'q' if self.metricas.dtype['inicio'].kind == 'i' else 'd'
+        resultado = ResultadoEjecucion(tabla, tipo)
+        for campo in self.metricas.dtype.names:
+            setattr(resultado, campo, array(tipo, np.ascontiguousarray(self.metricas[campo]).tobytes()))
+        resultado.orden = array('q', np.ascontiguousarray(self.orden).tobytes())
+        return resultado
+
+    def secuencia(self):
+        """Secuencia perezosa (SecuenciaTraza) sobre los segmentos mapeados"""
+        if self.segmentos is None:
+            raise ValueError("La traza no tiene secuencia")
+        return SecuenciaTraza(self, self.segmentos)
+
+def cargar_traza(ruta):
+    """Abrir una traza sin leerla: cada sección es un np.memmap de solo lectura"""
+    with open(ruta, 'rb') as archivo:
+        if archivo.read(len(MAGIA)) != MAGIA:
+            raise ValueError(f"{ruta} no es una traza")
+        archivo.seek(-(8 + len(MAGIA)), 2)
+        largo, = struct.unpack('<Q', archivo.read(8))
+        if archivo.read(len(MAGIA)) != MAGIA:
+            raise ValueError(f"{ruta}: traza incompleta")
+        archivo.seek(-(8 + len(MAGIA) + largo), 2)
+        encabezado = json.loads(archivo.read(largo).decode('utf-8'))
+    if encabezado.get('version') != VERSION:
+        raise ValueError(f"{ruta}: versión de traza no soportada: {encabezado.get('version')}")
+
+    secciones = {}
+    for nombre, seccion in encabezado['secciones'].items():
+        dtype = _dtype(seccion['dtype'])
+        if seccion['largo'] == 0:
+            secciones[nombre] = np.empty(0, dtype=dtype)
+        else:
+            secciones[nombre] = np.memmap(ruta, dtype=dtype, mode='r',
+                                          offset=seccion['desplazamiento'], shape=(seccion['largo'],))
+    return Traza(ruta, encabezado, secciones)
+
+def comparar_trazas(a, b):
+    """Diferencias entre dos trazas de la misma carga
+
+    Devuelve el primer segmento en que divergen (None si las secuencias son
+    iguales), cuántos procesos terminan en otro momento y la diferencia
+    de espera y respuesta promedio (b - a).
+    """
+    if len(a.procesos) != len(b.procesos):
+        raise ValueError("Las trazas tienen distinta cantidad de procesos")
+    diferencias = {'primer_segmento_distinto': None}
+    if a.segmentos is not None and b.segmentos is not None:
+        comunes = min(len(a.segmentos), len(b.segmentos))
+        distintos = np.flatnonzero(
+            (a.segmentos['proceso'][:comunes] != b.segmentos['proceso'][:comunes]) |
+            (a.segmentos['inicio'][:comunes] != b.segmentos['inicio'][:comunes]) |
+            (a.segmentos['fin'][:comunes] != b.segmentos['fin'][:comunes]))
+        if len(distintos):
+            diferencias['primer_segmento_distinto'] = int(distintos[0])
+        elif len(a.segmentos) != len(b.segmentos):
+            diferencias['primer_segmento_distinto'] = comunes
+    if a.metricas is not None and b.metricas is not None:
+        diferencias['procesos_con_otro_fin'] = int(np.count_nonzero(
+            a.metricas['finalizacion'] != b.metricas['finalizacion']))
+        for campo in ('espera', 'respuesta'):
+            diferencias[f'{campo}_promedio'] = float(b.metricas[campo].mean() - a.metricas[campo].mean())
+    return diferencias